@@ -0,0 +1,68 @@
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+
+class UserCache:
+    """Versioned cache of the users (and profiles) that JWT requests authenticate as
+
+    Each entry carries the user's version stamp at the time it was loaded,
+    and is only served while the stamp is unchanged. Saving the user or the
+    profile bumps the stamp once the transaction commits, so a stale copy is
+    never served after a write is visible; ``TIMEOUT`` bounds how long an
+    entry can be served after a change made without signals (``update()``).
+    """
+    key_prefix = "au"
+
+    @property
+    def options(self):
+        return getattr(settings, "AUTH_USER_CACHE", {})
+
+    @property
+    def enabled(self):
+        return self.options.get("ENABLED", True)
+
+    @property
+    def cache(self):
+        return caches[self.options.get("ALIAS", "default")]
+
+    @property
+    def timeout(self):
+        return self.options.get("TIMEOUT", 60)
+
+    def get(self, user_id):
+        """The active or inactive user with this id, or None when there is none"""
+        if not self.enabled:
+            return self.load(user_id)
+
+        version_key, entry_key = f"{self.key_prefix}:v:{user_id}", f"{self.key_prefix}:u:{user_id}"
+        found = self.cache.get_many([version_key, entry_key])
+        version, entry = found.get(version_key), found.get(entry_key)
+        if entry is not None and version is not None and entry["version"] == version:
+            return entry["user"]
+
+        if version is None:
+            version = time.time_ns()
+            if not self.cache.add(version_key, version, timeout=None):
+                version = self.cache.get(version_key, version)
+        # Loaded after reading the stamp: a concurrent bump makes this entry unreadable
+        user = self.load(user_id)
+        if user is not None:
+            self.cache.set(entry_key, {"version": version, "user": user}, timeout=self.timeout)
+        return user
+
+    def load(self, user_id):
+        users = get_user_model().objects.all()
+        if self.options.get("PROFILE", True):
+            users = users.select_related("profile")
+        return users.filter(**{jwt_settings.USER_ID_FIELD: user_id}).first()
+
+    def invalidate(self, user_id):
+        """Stop serving the cached copy of this user once the transaction commits"""
+        transaction.on_commit(lambda: self.cache.set(f"{self.key_prefix}:v:{user_id}", time.time_ns(), timeout=None))
+
+
+user_cache = UserCache()
@@ -0,0 +1,25 @@
+from django.contrib.auth.models import User
+from django.db import connections, models
+from django.db.models.functions import Upper
+
+
+def ensure_index(using, model, index):
+    """Create an index on a table this project has no migrations for, unless it exists"""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+    if index.name not in constraints:
+        with connection.schema_editor() as editor:
+            editor.add_index(model, index)
+
+
+def ensure_directory_indexes(using):
+    """Index users for the directory's keyset pages and case-insensitive username prefixes"""
+    ensure_index(using, User, models.Index(fields=["-date_joined", "-id"], name="user_directory_joined_idx"))
+    if connections[using].vendor == "postgresql":
+        from django.contrib.postgres.indexes import OpClass
+
+        # Matches the UPPER(username::text) LIKE 'X%' that istartswith compiles to
+        ensure_index(
+            using, User, models.Index(OpClass(Upper("username"), name="text_pattern_ops"), name="user_username_upper_idx")
+        )
@@ -0,0 +1,102 @@
+import atexit
+import logging
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """Write-behind buffer that coalesces ``last_login`` updates
+
+    A user's ``last_login`` is only moved forward when the stored value is
+    older than ``LAST_LOGIN_UPDATE_INTERVAL`` seconds, and pending values are
+    written together every ``LAST_LOGIN_FLUSH_INTERVAL`` seconds with one
+    ``bulk_update``, which bypasses the user save signals.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker = None
+        atexit.register(self.shutdown)
+
+    @property
+    def update_interval(self):
+        return getattr(settings, "LAST_LOGIN_UPDATE_INTERVAL", 300)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, "LAST_LOGIN_FLUSH_INTERVAL", 5)
+
+    def record(self, user):
+        """Note a login; returns False when the stored ``last_login`` is recent enough"""
+        now = timezone.now()
+        if user.last_login is not None and now - user.last_login < timedelta(seconds=self.update_interval):
+            return False
+
+        user.last_login = now
+        if self.flush_interval <= 0:
+            self._write({user.pk: now})
+            return True
+
+        with self._lock:
+            self._pending[user.pk] = now
+        self._ensure_worker()
+        return True
+
+    def flush(self):
+        """Write buffered logins to the database, returning how many users were updated"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return 0
+
+        try:
+            self._write(pending)
+        except Exception:
+            logger.exception("Failed to flush %d buffered last_login updates", len(pending))
+            with self._lock:
+                for user_id, logged_in_at in pending.items():
+                    self._pending.setdefault(user_id, logged_in_at)
+            return 0
+
+        return len(pending)
+
+    def _write(self, pending):
+        User = get_user_model()
+        users = [User(pk=user_id, last_login=logged_in_at) for user_id, logged_in_at in pending.items()]
+        User.objects.bulk_update(users, ["last_login"], batch_size=500)
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._run, name="last-login-flush", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+            close_old_connections()
+
+    def shutdown(self):
+        """Stop the flush worker and write whatever is still buffered"""
+        self._stop.set()
+        worker = self._worker
+        if worker is not None and worker.is_alive() and worker is not threading.current_thread():
+            worker.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+
+last_login_buffer = LastLoginBuffer()
@@ -0,0 +1,128 @@
+import json
+import math
+import time
+from pathlib import Path
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from accounts.logins import last_login_buffer
+from accounts.models import UserProfile
+
+PASSWORD = "Bench-pass-0!"
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def is_write(sql):
+    return sql.lstrip().upper().startswith(WRITE_PREFIXES)
+
+
+class Command(BaseCommand):
+    help = "Measure login and token refresh throughput with the queries and row writes each one costs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50, help="Distinct users logging in")
+        parser.add_argument("--logins", type=int, default=500, help="Logins (and refreshes) to measure")
+        parser.add_argument("--report", help="Write the JSON report to this path")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            usernames = self.seed(options["users"])
+            results = {
+                "login": self.measure(options["logins"], self.login(usernames)),
+                "refresh": self.measure(options["logins"], self.refresh(usernames[0])),
+            }
+            # Coalesced writes land after the requests; charge them to the logins
+            with CaptureQueriesContext(connection) as captured:
+                last_login_buffer.flush()
+            results["login"]["deferred_writes"] = sum(is_write(query["sql"]) for query in captured)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<8} {result['rps']:>8.1f} req/s  p50 {result['p50_ms']:>6.2f}ms  "
+                f"p95 {result['p95_ms']:>6.2f}ms  {result['queries_per_request']:.2f} queries  "
+                f"{result['writes_per_request']:.2f} writes per request"
+                + (f"  (+{result['deferred_writes']} deferred)" if "deferred_writes" in result else "")
+            )
+        if options["report"]:
+            Path(options["report"]).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        self.stdout.write(self.style.SUCCESS(f"✓ Benchmarked {options['logins']} logins and refreshes"))
+
+    def seed(self, count):
+        # Hash once: the benchmark measures the endpoint, not the password hasher setup
+        password = make_password(PASSWORD)
+        users = User.objects.bulk_create(
+            User(username=f"login_{i}", email=f"login_{i}@example.com", password=password) for i in range(count)
+        )
+        UserProfile.objects.bulk_create(UserProfile(user=user) for user in users)
+        return [user.username for user in users]
+
+    def login(self, usernames):
+        client = Client()
+
+        def request(i):
+            return client.post(
+                "/api/token/", {"username": usernames[i % len(usernames)], "password": PASSWORD},
+                content_type="application/json", secure=True,
+            )
+
+        return request
+
+    def refresh(self, username):
+        client = Client()
+        response = client.post(
+            "/api/token/", {"username": username, "password": PASSWORD}, content_type="application/json", secure=True
+        )
+        state = {"refresh": response.json()["refresh"]}
+
+        def request(i):
+            # Follow the rotation chain, as a client holding one session would
+            response = client.post(
+                "/api/token/refresh/", {"refresh": state["refresh"]}, content_type="application/json", secure=True
+            )
+            state["refresh"] = response.json().get("refresh", state["refresh"])
+            return response
+
+        return request
+
+    def measure(self, count, request):
+        request(0)
+        timings, queries, writes, statuses = [], 0, 0, set()
+        started = time.perf_counter()
+        for i in range(1, count + 1):
+            with CaptureQueriesContext(connection) as captured:
+                begin = time.perf_counter()
+                response = request(i)
+                timings.append((time.perf_counter() - begin) * 1000)
+            queries += len(captured)
+            writes += sum(is_write(query["sql"]) for query in captured)
+            statuses.add(response.status_code)
+        elapsed = time.perf_counter() - started
+        return {
+            "requests": count,
+            "rps": round(count / elapsed, 1),
+            "p50_ms": round(percentile(timings, 50), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+            "queries_per_request": round(queries / count, 2),
+            "writes_per_request": round(writes / count, 2),
+            "status": sorted(statuses),
+        }
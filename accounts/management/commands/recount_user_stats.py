@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from accounts.stats import recount_user_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored per-user statistics on profiles and repair any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Profiles checked per batch")
+
+    def handle(self, *args, **options):
+        checked, repaired = recount_user_stats(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✓ Checked {checked} profiles, repaired {repaired}"))
@@ -1,7 +1,13 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_migrate, post_save, post_delete
 from django.dispatch import receiver
+from blog_api.images import image_pipeline
+from .cache import user_cache
+from .indexes import ensure_directory_indexes
+from .tokens import ensure_expiry_index
 
 
 class UserProfile(models.Model):
@@ -14,10 +20,56 @@ class UserProfile(models.Model):
     birth_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    articles_count = models.PositiveIntegerField(default=0, editable=False)
+    published_articles_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    likes_received = models.PositiveIntegerField(default=0, editable=False)
+    
+    # Maintained by the article, comment and like receivers; see adjust_stats()
+    STAT_FIELDS = ("articles_count", "published_articles_count", "comments_count", "likes_received")
     
     def __str__(self):
         return f"{self.user.username}'s profile"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_values = instance.field_values()
+        return instance
+    
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # Never write back stats that were loaded before a concurrent adjust_stats()
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.STAT_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        self._saved_values = self.field_values()
+    
+    def field_values(self):
+        """Loaded field values, with files reduced to their names"""
+        return {
+            field.attname: getattr(self.__dict__[field.attname], "name", self.__dict__[field.attname])
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+    
+    def has_changes(self):
+        """Whether any field differs from what was last loaded or saved"""
+        return self._state.adding or getattr(self, "_saved_values", None) != self.field_values()
+    
+    @classmethod
+    def adjust_stats(cls, user_id, **deltas):
+        """Atomically add deltas to the stored statistics of a user and drop their cached copy"""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if deltas:
+            cls.objects.filter(user_id=user_id).update(
+                **{field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()}
+            )
+            # update() sends no post_save; without this /api/me/ serves stale stats
+            user_cache.invalidate(user_id)
+    
     class Meta:
         ordering = ["-created_at"]
 
@@ -31,6 +83,51 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
-    """Save profile when user is saved"""
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
\ No newline at end of file
+    """Save the profile along with its user when it was loaded and changed"""
+    profile = User.profile.related.get_cached_value(instance, None)
+    if profile is not None and profile.has_changes():
+        profile.save()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Stop authenticating from the cached copy once a user is saved, deactivated or deleted"""
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+def render_avatar(sender, instance, **kwargs):
+    """Resize a newly uploaded avatar in the background and forget the one it replaced"""
+    saved = getattr(instance, "_saved_values", {}).get("avatar")
+    if instance.avatar.name != saved:
+        image_pipeline.forget(saved)
+        if instance.avatar:
+            image_pipeline.schedule(instance.avatar.name)
+
+
+@receiver(post_delete, sender=UserProfile)
+def forget_avatar(sender, instance, **kwargs):
+    """Stop serving renditions of a deleted profile's avatar"""
+    image_pipeline.forget(instance.avatar.name)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    """Cached users carry their profile, so profile writes invalidate them too"""
+    user_cache.invalidate(instance.user_id)
+
+
+@receiver(post_migrate)
+def index_token_expiry(sender, using, **kwargs):
+    """Add the expiry index that blacklist pruning relies on"""
+    if sender.label == "token_blacklist":
+        ensure_expiry_index(using)
+
+
+@receiver(post_migrate)
+def index_user_directory(sender, using, **kwargs):
+    """Add the indexes the user directory pages and searches on"""
+    if sender.label == "auth":
+        ensure_directory_indexes(using)
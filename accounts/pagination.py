@@ -0,0 +1,11 @@
+from rest_framework.pagination import CursorPagination
+from articles.pagination import OptInCursorPagination
+
+
+class UserCursorPagination(CursorPagination):
+    """Keyset pagination over (date_joined, id)"""
+    ordering = ("-date_joined", "-id")
+
+
+class UserDirectoryPagination(OptInCursorPagination):
+    cursor_class = UserCursorPagination
@@ -1,37 +1,42 @@
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenObtainSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from blog_api.images import RenditionsField
+from .logins import last_login_buffer
 from .models import UserProfile
+from .tokens import blacklist_once, token_pruner
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
     """Serializer for user profile"""
+    avatar_renditions = RenditionsField(source="avatar")
+    
     class Meta:
         model = UserProfile
-        fields = ["bio", "avatar", "website", "location", "birth_date", "created_at", "updated_at"]
+        fields = ["bio", "avatar", "avatar_renditions", "website", "location", "birth_date", "created_at", "updated_at"]
         read_only_fields = ["created_at", "updated_at"]
 
 
 class UserSerializer(serializers.ModelSerializer):
-    """Serializer for user details"""
+    """Serializer for user details; counts come from the statistics stored on the profile"""
     profile = UserProfileSerializer(read_only=True)
-    articles_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
+    articles_count = serializers.IntegerField(source="profile.articles_count", read_only=True)
+    published_articles_count = serializers.IntegerField(source="profile.published_articles_count", read_only=True)
+    comments_count = serializers.IntegerField(source="profile.comments_count", read_only=True)
+    likes_received = serializers.IntegerField(source="profile.likes_received", read_only=True)
     
     class Meta:
         model = User
         fields = [
-            "id", "username", "email", "first_name", "last_name",
-            "is_staff", "date_joined", "profile", "articles_count", "comments_count"
+            "id", "username", "email", "first_name", "last_name", "is_staff", "date_joined", "profile",
+            "articles_count", "published_articles_count", "comments_count", "likes_received"
         ]
         read_only_fields = ["id", "date_joined", "is_staff"]
-    
-    def get_articles_count(self, obj):
-        return obj.articles.count()
-    
-    def get_comments_count(self, obj):
-        return obj.comments.count()
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -69,7 +74,8 @@ class RegisterSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data.pop("password2")
         password = validated_data.pop("password")
-        user = User.objects.create(**validated_data)
+        # Hash before the INSERT instead of saving the new user twice
+        user = User(**validated_data)
         user.set_password(password)
         user.save()
         return user
@@ -127,4 +133,38 @@ class ChangePasswordSerializer(serializers.Serializer):
         user = self.context["request"].user
         if not user.check_password(value):
             raise serializers.ValidationError("Old password is incorrect")
-        return value
\ No newline at end of file
+        return value
+
+
+class LoginSerializer(TokenObtainPairSerializer):
+    """Token pair for valid credentials, recording last_login through the coalescing buffer"""
+
+    def validate(self, attrs):
+        # TokenObtainPairSerializer.validate would save the user on every login
+        data = TokenObtainSerializer.validate(self, attrs)
+        refresh = self.get_token(self.user)
+        data["refresh"] = str(refresh)
+        data["access"] = str(refresh.access_token)
+        if api_settings.UPDATE_LAST_LOGIN:
+            last_login_buffer.record(self.user)
+        token_pruner.maybe_prune()
+        return data
+
+
+class RotatingTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh with rotation, blacklisting the old token in two statements"""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION and not blacklist_once(refresh):
+                raise TokenError(_("Token is blacklisted"))
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+
+        token_pruner.maybe_prune()
+        return data
@@ -0,0 +1,19 @@
+from blog_api.db.counters import count_subquery, repair_counters
+from .models import UserProfile
+
+
+def stat_subqueries():
+    """The true value of each stored statistic, as expressions over UserProfile"""
+    from articles.models import Article, ArticleLike, Comment
+
+    return {
+        "articles_count": count_subquery(Article.objects.all(), "author", "user_id"),
+        "published_articles_count": count_subquery(Article.objects.filter(is_published=True), "author", "user_id"),
+        "comments_count": count_subquery(Comment.objects.all(), "user", "user_id"),
+        "likes_received": count_subquery(ArticleLike.objects.all(), "article__author", "user_id"),
+    }
+
+
+def recount_user_stats(batch_size=1000):
+    """Recompute stored user statistics and repair any drift; returns (checked, repaired)"""
+    return repair_counters(UserProfile.objects.all(), stat_subqueries, batch_size)
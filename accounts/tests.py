@@ -0,0 +1,68 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from articles.models import Article, ArticleLike, Comment
+
+
+class MeStatsTests(TestCase):
+    """/api/me/ reflects stored statistics as soon as they change, despite the cached JWT user"""
+
+    def setUp(self):
+        cache.clear()
+        self.reader = User.objects.create_user("reader", password="Reader-pass-0!")
+        self.writer = User.objects.create_user("writer", password="Writer-pass-0!")
+        self.article = Article.objects.create(
+            title="Stats article", content="Body of the stats article", author=self.writer, is_published=True
+        )
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        return client
+
+    def me(self, client):
+        response = client.get("/api/me/", secure=True)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_posted_comment_shows_up_in_me(self):
+        client = self.client_for(self.reader)
+        # Loads the user into the authentication cache
+        self.assertEqual(self.me(client)["comments_count"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                f"/api/articles/{self.article.pk}/add_comment/", {"content": "A first comment"}, secure=True
+            )
+        self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(self.me(client)["comments_count"], 1)
+
+    def test_like_shows_up_in_the_authors_me(self):
+        author = self.client_for(self.writer)
+        self.assertEqual(self.me(author)["likes_received"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client_for(self.reader).post(f"/api/articles/{self.article.pk}/like/", secure=True)
+        self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(self.me(author)["likes_received"], 1)
+
+    def test_deleted_article_leaves_author_and_commenter_stats(self):
+        ArticleLike.objects.create(article=self.article, user=self.reader)
+        Comment.objects.create(article=self.article, user=self.reader, content="A comment to go")
+        Comment.objects.create(article=self.article, user=self.writer, content="An answer to go")
+        reader, author = self.client_for(self.reader), self.client_for(self.writer)
+        self.assertEqual(self.me(reader)["comments_count"], 1)
+        self.assertEqual(self.me(author)["likes_received"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.get(pk=self.article.pk).delete()
+
+        self.assertEqual(self.me(reader)["comments_count"], 0)
+        stats = self.me(author)
+        self.assertEqual(
+            (stats["articles_count"], stats["likes_received"], stats["comments_count"]), (0, 0, 0)
+        )
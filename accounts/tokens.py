@@ -0,0 +1,102 @@
+import logging
+import threading
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections, models, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from .indexes import ensure_index
+
+logger = logging.getLogger(__name__)
+
+EXPIRY_INDEX_NAME = "token_outstanding_expires_idx"
+
+
+def ensure_expiry_index(using):
+    """Index outstanding tokens by expiry, which the blacklist app leaves unindexed"""
+    from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+    ensure_index(using, OutstandingToken, models.Index(fields=["expires_at"], name=EXPIRY_INDEX_NAME))
+
+
+def blacklist_once(token):
+    """Blacklist a refresh token in two statements; False when it already was blacklisted
+
+    The conflict-ignoring inserts make a replayed or concurrent rotation of
+    the same token lose instead of minting a second token pair.
+    """
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+    quote = connection.ops.quote_name
+    with transaction.atomic(savepoint=False):
+        OutstandingToken.objects.bulk_create(
+            [OutstandingToken(
+                jti=token[api_settings.JTI_CLAIM], token=str(token), expires_at=datetime_from_epoch(token["exp"])
+            )],
+            ignore_conflicts=True,
+        )
+        blacklisted_at = BlacklistedToken._meta.get_field("blacklisted_at").get_db_prep_value(
+            timezone.now(), connection
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {quote(BlacklistedToken._meta.db_table)} (token_id, blacklisted_at) "
+                f"SELECT id, %s FROM {quote(OutstandingToken._meta.db_table)} WHERE jti = %s "
+                f"ON CONFLICT (token_id) DO NOTHING",
+                [blacklisted_at, token[api_settings.JTI_CLAIM]],
+            )
+            return cursor.rowcount == 1
+
+
+def prune_expired_tokens(batch_size=1000):
+    """Delete expired outstanding tokens and their blacklist entries; returns how many went"""
+    from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+    pruned = 0
+    while True:
+        # Bounded batches keep each DELETE short on a large table
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=timezone.now()).values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return pruned
+        OutstandingToken.objects.filter(pk__in=ids).delete()
+        pruned += len(ids)
+
+
+class TokenPruner:
+    """Runs ``prune_expired_tokens`` in the background at most once per ``TOKEN_PRUNE_INTERVAL``
+
+    The interval is claimed in the shared cache, so with a shared backend
+    one process prunes for the whole deployment.
+    """
+    cache_key = "token-prune"
+
+    @property
+    def interval(self):
+        return getattr(settings, "TOKEN_PRUNE_INTERVAL", 3600)
+
+    @property
+    def batch_size(self):
+        return getattr(settings, "TOKEN_PRUNE_BATCH_SIZE", 1000)
+
+    def maybe_prune(self):
+        if self.interval <= 0 or not cache.add(self.cache_key, True, timeout=self.interval):
+            return False
+        threading.Thread(target=self._run, name="token-prune", daemon=True).start()
+        return True
+
+    def _run(self):
+        try:
+            pruned = prune_expired_tokens(self.batch_size)
+            if pruned:
+                logger.info("Pruned %d expired refresh tokens", pruned)
+        except Exception:
+            logger.exception("Failed to prune expired refresh tokens")
+        finally:
+            # This thread's connections are not reused
+            connections.close_all()
+
+
+token_pruner = TokenPruner()
@@ -2,6 +2,7 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth.models import User
+from .pagination import UserDirectoryPagination
 from .serializers import (
     RegisterSerializer,
     UserSerializer,
@@ -52,7 +53,8 @@ class ChangePasswordAPIView(APIView):
         if serializer.is_valid():
             user = request.user
             user.set_password(serializer.validated_data["new_password"])
-            user.save()
+            # The save signal also drops the user from the authentication cache
+            user.save(update_fields=["password"])
             return Response(
                 {"message": "Password changed successfully"},
                 status=status.HTTP_200_OK
@@ -62,13 +64,21 @@ class ChangePasswordAPIView(APIView):
 
 class UserDetailAPIView(generics.RetrieveAPIView):
     """Get user public profile by ID"""
-    queryset = User.objects.all()
+    queryset = User.objects.select_related("profile")
     serializer_class = UserSerializer
     permission_classes = [permissions.AllowAny]
 
 
 class UserListAPIView(generics.ListAPIView):
-    """List all users with pagination"""
-    queryset = User.objects.all().order_by("-date_joined")
+    """List all users with pagination; ?search= matches the start of usernames, case-insensitively"""
+    queryset = User.objects.select_related("profile").order_by("-date_joined", "-id")
     serializer_class = UserSerializer
-    permission_classes = [permissions.AllowAny]
\ No newline at end of file
+    permission_classes = [permissions.AllowAny]
+    pagination_class = UserDirectoryPagination
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        prefix = self.request.query_params.get("search", "").strip()
+        if prefix:
+            queryset = queryset.filter(username__istartswith=prefix)
+        return queryset
\ No newline at end of file
@@ -9,7 +9,10 @@ class ArticleAdmin(admin.ModelAdmin):
     list_filter = ("is_published", "published_at", "tags")
     search_fields = ("title", "content", "author__username", "tags__name")
     prepopulated_fields = {"slug": ("title",)}
-    readonly_fields = ("views_count", "published_at", "updated_at", "slug")
+    readonly_fields = (
+        "views_count", "likes_count", "comments_count", "bookmarks_count",
+        "word_count", "read_time", "published_at", "updated_at", "slug"
+    )
     filter_horizontal = ("tags",)
     date_hierarchy = "published_at"
     list_per_page = 20
@@ -22,18 +25,18 @@ class ArticleAdmin(admin.ModelAdmin):
             "fields": ("is_published", "tags")
         }),
         ("Statistics", {
-            "fields": ("views_count", "published_at", "updated_at"),
+            "fields": (
+                "views_count", "likes_count", "comments_count", "bookmarks_count",
+                "word_count", "read_time", "published_at", "updated_at"
+            ),
             "classes": ("collapse",)
         }),
     )
     
-    def likes_count(self, obj):
-        count = obj.likes.count()
-        return format_html('<strong>{}</strong>', count)
-    likes_count.short_description = "Likes"
-    
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related("author").prefetch_related("tags", "likes")
+        return super().get_queryset(request).select_related("author").prefetch_related("tags").defer(
+            "plaintext", "search_vector"
+        )
 
 
 @admin.register(Comment)
@@ -0,0 +1,272 @@
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.http import HttpResponse
+from django.urls import URLPattern
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from .cache import response_cache
+from .counters import view_counter
+from .models import Tag
+from .pagination import ArticleFeedPagination, OptInCursorPagination
+from .serializers import ArticleListSerializer, CommentDetailSerializer
+from .threads import CommentThreadPagination, load_thread_replies, replies_per_thread
+
+
+class Fallback(Exception):
+    """Hand the request over to the synchronous DRF view"""
+
+
+class AsyncReadView:
+    """Async implementation of one hot read endpoint of a DRF view
+
+    Anonymous JSON GETs that only use ``query_params`` are answered on the
+    event loop, apart from database work and serialization. Page-number pages
+    are counted with ``acount()`` and fetched with ``aiterator()``, and
+    lookups use ``afirst()``/``aexists()``. Keyset (cursor) pages and comment
+    threads are a deliberate exception: DRF's CursorPagination and the
+    windowed reply loader are synchronous, so each of those pages is fetched
+    in a single ``sync_to_async`` hop. Serializers run in a hop as well, since
+    a relation they touch lazily would otherwise query from the event loop.
+    Django 5.0's async ORM runs every query in a worker thread anyway, so a
+    hop per page costs no more than a hop per query. The DRF view still supplies the
+    querysets, serializers, paginators, cache stamps and validators, so the
+    bodies and headers match the sync path. Everything else (writes,
+    authenticated or browsable-API requests, filters, missing objects) is
+    handed to the synchronous DRF view.
+    """
+    action = None
+    query_params = frozenset()
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self.renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+
+    @classmethod
+    def as_view(cls, fallback):
+        handler = cls(fallback)
+
+        async def view(request, *args, **kwargs):
+            return await handler.dispatch(request, *args, **kwargs)
+
+        view = csrf_exempt(view)
+        # Schema generation and instrumentation keep describing the DRF view
+        view.cls = fallback.cls
+        view.initkwargs = fallback.initkwargs
+        view.actions = getattr(fallback, "actions", None)
+        return view
+
+    def accepts(self, request, kwargs):
+        return (
+            request.method == "GET"
+            and "HTTP_AUTHORIZATION" not in request.META
+            and "format" not in kwargs
+            and "text/html" not in request.META.get("HTTP_ACCEPT", "")
+            and set(request.GET) <= self.query_params
+        )
+
+    async def dispatch(self, request, *args, **kwargs):
+        if self.accepts(request, kwargs):
+            try:
+                return await self.respond(self.get_view(request, args, kwargs), request, kwargs)
+            except Fallback:
+                pass
+        return await sync_to_async(self.call_fallback)(request, *args, **kwargs)
+
+    def call_fallback(self, request, *args, **kwargs):
+        # Render in the worker thread too, instead of a second hop in the handler
+        response = self.fallback(request, *args, **kwargs)
+        return response.render() if hasattr(response, "render") else response
+
+    def get_view(self, request, args, kwargs):
+        """The DRF view instance, set up as ``initial()`` would for an anonymous request"""
+        view = self.fallback.cls(**self.fallback.initkwargs)
+        view.action_map = self.fallback.actions or {}
+        # Bind the action handlers as ViewSet.as_view() does, so Allow lists the same verbs
+        for method, action in view.action_map.items():
+            setattr(view, method, getattr(view, action))
+        if hasattr(view, "get") and not hasattr(view, "head"):
+            view.head = view.get
+        view.action = self.action
+        view.args = args
+        view.kwargs = kwargs
+        view.format_kwarg = None
+        view.headers = {}
+        # No authenticators: the request has no credentials, so DRF would resolve AnonymousUser
+        view.request = Request(request, authenticators=())
+        return view
+
+    async def respond(self, view, request, kwargs):
+        validators = None
+        if self.action in getattr(view, "conditional_actions", ()):
+            validators = await sync_to_async(view.get_validators)(request, self.action, kwargs)
+        if validators is not None:
+            etag, last_modified = validators
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=int(last_modified.timestamp())
+            )
+            if not_modified is not None:
+                if not_modified.status_code == 304:
+                    await self.on_hit(view, kwargs)
+                return not_modified
+
+        key = None
+        if response_cache.enabled and self.action in getattr(view, "cached_actions", ()):
+            key = await response_cache.akey(request, view.get_cache_versions(self.action, kwargs))
+            entry = await response_cache.aget(key)
+            if entry is not None:
+                await self.on_hit(view, kwargs)
+                return self.add_validators(response_cache.to_response(entry, request), validators)
+
+        response = self.render(view, await self.get_data(view, kwargs))
+        if key is not None:
+            await response_cache.astore(key, response)
+            patch_vary_headers(response, ("Authorization",))
+            response["X-Cache"] = "MISS"
+        return self.add_validators(response, validators)
+
+    def render(self, view, data):
+        renderer = self.renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        response = HttpResponse(renderer.render(data, content_type), content_type=content_type)
+        response["Allow"] = ", ".join(view.allowed_methods)
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+    def add_validators(self, response, validators):
+        if validators is not None and response.status_code == 200:
+            etag, last_modified = validators
+            weak = response.get("Content-Encoding") == "gzip"
+            response["ETag"] = f"W/{etag}" if weak else etag
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+    async def on_hit(self, view, kwargs):
+        """Side effects of serving a cached or not-modified response"""
+
+    async def paginate(self, paginator, queryset, request):
+        """``paginator.paginate_queryset()`` through the async ORM where the paginator allows it"""
+        if isinstance(paginator, OptInCursorPagination):
+            if paginator.uses_cursor(request):
+                return await sync_to_async(paginator.paginate_queryset)(queryset, request)
+            paginator.cursor_paginator = None
+        if not isinstance(paginator, PageNumberPagination):
+            return await sync_to_async(paginator.paginate_queryset)(queryset, request)
+
+        page_size = paginator.get_page_size(request)
+        if not page_size:
+            raise Fallback
+        django_paginator = paginator.django_paginator_class(queryset, page_size)
+        # Paginator.count is a cached_property; filling it keeps its COUNT(*) off the sync path
+        django_paginator.count = await queryset.acount()
+        try:
+            page = django_paginator.page(paginator.get_page_number(request, django_paginator))
+        except InvalidPage:
+            # The DRF view renders the 404
+            raise Fallback
+        page.object_list = [obj async for obj in page.object_list.aiterator(chunk_size=page_size)]
+        paginator.request = request
+        paginator.page = page
+        paginator.display_page_controls = django_paginator.num_pages > 1 and paginator.template is not None
+        return list(page)
+
+    async def get_data(self, view, kwargs):
+        raise NotImplementedError
+
+    async def serialize(self, build):
+        """Run ``build()``, which serializes a page or object, in a worker thread"""
+        return await sync_to_async(build)()
+
+
+class PaginatedListRead(AsyncReadView):
+    """A viewset ``list``, paginated by ``paginate()``"""
+    action = "list"
+    query_params = frozenset({"page"})
+
+    async def get_data(self, view, kwargs):
+        page = await self.paginate(view.paginator, view.filter_queryset(view.get_queryset()), view.request)
+        return await self.serialize(
+            lambda: view.get_paginated_response(view.get_serializer(page, many=True).data).data
+        )
+
+
+class ArticleListRead(PaginatedListRead):
+    query_params = frozenset({"page", "pagination", "cursor"})
+
+
+class ArticleDetailRead(AsyncReadView):
+    action = "retrieve"
+
+    async def get_data(self, view, kwargs):
+        pk = kwargs.get("pk", "")
+        article = await view.get_queryset().filter(pk=pk).afirst() if pk.isdigit() else None
+        if article is None:
+            raise Fallback
+        await article.aincrement_views()
+        return await self.serialize(lambda: view.get_serializer(article).data)
+
+    async def on_hit(self, view, kwargs):
+        if kwargs.get("pk", "").isdigit():
+            await view_counter.aincr(int(kwargs["pk"]))
+
+
+class ArticleCommentsRead(AsyncReadView):
+    action = "comments"
+    query_params = frozenset({"cursor", "page_size", "replies"})
+
+    async def get_data(self, view, kwargs):
+        pk = kwargs.get("pk", "")
+        if not pk.isdigit() or not await view.get_queryset().filter(pk=pk).aexists():
+            raise Fallback
+        paginator = CommentThreadPagination()
+
+        def build():
+            page = paginator.paginate_queryset(view.get_thread_queryset(pk), view.request)
+            page = load_thread_replies(page, replies_per_thread(view.request), view.request)
+            return paginator.get_paginated_response(
+                CommentDetailSerializer(page, many=True, context={"request": view.request}).data
+            ).data
+
+        return await self.serialize(build)
+
+
+class TagArticlesRead(AsyncReadView):
+    action = "articles"
+    query_params = frozenset({"page", "pagination", "cursor"})
+
+    async def get_data(self, view, kwargs):
+        pk = kwargs.get("pk", "")
+        if not pk.isdigit() or not await Tag.objects.filter(pk=pk).aexists():
+            raise Fallback
+        paginator = ArticleFeedPagination()
+        page = await self.paginate(paginator, view.get_articles_queryset(pk), view.request)
+        return await self.serialize(lambda: paginator.get_paginated_response(
+            ArticleListSerializer(page, many=True, context={"request": view.request}).data
+        ).data)
+
+
+READ_VIEWS = {
+    "article-list": ArticleListRead,
+    "article-detail": ArticleDetailRead,
+    "article-comments": ArticleCommentsRead,
+    "tag-list": PaginatedListRead,
+    "tag-articles": TagArticlesRead,
+}
+
+
+def async_read_patterns(patterns):
+    """Route the hot read endpoints among router-generated ``patterns`` to async views"""
+    routed = []
+    for pattern in patterns:
+        view_class = READ_VIEWS.get(getattr(pattern, "name", None))
+        if view_class is not None:
+            pattern = URLPattern(
+                pattern.pattern, view_class.as_view(pattern.callback), pattern.default_args, pattern.name
+            )
+        routed.append(pattern)
+    return routed
@@ -0,0 +1,157 @@
+import gzip
+import hashlib
+import time
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+
+class ResponseCache:
+    """Versioned store of pre-rendered, pre-compressed API responses
+
+    Cache keys embed the current value of one or more version stamps, so
+    invalidation is a single stamp bump: stale entries are never read
+    again and simply age out of the cache.
+    """
+    key_prefix = "rc"
+
+    @property
+    def options(self):
+        return getattr(settings, "RESPONSE_CACHE", {})
+
+    @property
+    def enabled(self):
+        return self.options.get("ENABLED", True)
+
+    @property
+    def cache(self):
+        return caches[self.options.get("ALIAS", "default")]
+
+    @property
+    def timeout(self):
+        return self.options.get("TIMEOUT", 300)
+
+    def versions(self, names):
+        keys = [f"{self.key_prefix}:v:{name}" for name in names]
+        found = self.cache.get_many(keys)
+        missing = {key: time.time_ns() for key in keys if key not in found}
+        if missing:
+            self.cache.set_many(missing, timeout=None)
+            found.update(missing)
+        return [found[key] for key in keys]
+
+    async def aversions(self, names):
+        keys = [f"{self.key_prefix}:v:{name}" for name in names]
+        found = await self.cache.aget_many(keys)
+        missing = {key: time.time_ns() for key in keys if key not in found}
+        if missing:
+            await self.cache.aset_many(missing, timeout=None)
+            found.update(missing)
+        return [found[key] for key in keys]
+
+    def bump(self, *names):
+        """Invalidate every response keyed on these stamps once the transaction commits"""
+        transaction.on_commit(lambda: self._bump(names))
+
+    def _bump(self, names):
+        # Stamps are nanosecond timestamps, so they double as last-modified times
+        keys = [f"{self.key_prefix}:v:{name}" for name in names]
+        current = self.cache.get_many(keys)
+        now = time.time_ns()
+        self.cache.set_many({key: max(now, current.get(key, 0) + 1) for key in keys}, timeout=None)
+
+    def changed_at(self, names):
+        """Time of the most recent bump of any of these stamps"""
+        return datetime.fromtimestamp(max(self.versions(names)) / 1e9, tz=dt_timezone.utc)
+
+    def key(self, request, version_names):
+        return self._key(request, self.versions(version_names))
+
+    async def akey(self, request, version_names):
+        return self._key(request, await self.aversions(version_names))
+
+    def _key(self, request, versions):
+        parts = [
+            request.path,
+            "&".join(f"{k}={v}" for k, v in sorted(request.GET.items())),
+            request.META.get("HTTP_ACCEPT", ""),
+            *map(str, versions),
+        ]
+        digest = hashlib.sha1("|".join(parts).encode()).hexdigest()
+        return f"{self.key_prefix}:r:{digest}"
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    async def aget(self, key):
+        return await self.cache.aget(key)
+
+    def store(self, key, response):
+        response.render()
+        self.cache.set(key, self._entry(response), timeout=self.timeout)
+
+    async def astore(self, key, response):
+        await self.cache.aset(key, self._entry(response), timeout=self.timeout)
+
+    def _entry(self, response):
+        body = response.content
+        return {
+            "status": response.status_code,
+            "content_type": response["Content-Type"],
+            "body": body,
+            "gzip": gzip.compress(body, compresslevel=6),
+        }
+
+    def to_response(self, entry, request):
+        if "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", ""):
+            response = HttpResponse(entry["gzip"], status=entry["status"], content_type=entry["content_type"])
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(entry["body"], status=entry["status"], content_type=entry["content_type"])
+        patch_vary_headers(response, ("Accept", "Accept-Encoding", "Authorization"))
+        response["X-Cache"] = "HIT"
+        return response
+
+
+response_cache = ResponseCache()
+
+
+class CachedResponseMixin:
+    """Serve anonymous GETs for ``cached_actions`` from the response cache
+
+    Requests carrying an Authorization header bypass the cache, since their
+    bodies contain viewer-specific fields (is_liked, is_bookmarked).
+    """
+    cached_actions = ("list",)
+
+    def get_cache_versions(self, action, kwargs):
+        return ["articles"]
+
+    def on_cache_hit(self, request, action, kwargs):
+        pass
+
+    def dispatch(self, request, *args, **kwargs):
+        action = getattr(self, "action_map", {}).get(request.method.lower(), "list")
+        if (
+            not response_cache.enabled
+            or request.method != "GET"
+            or action not in self.cached_actions
+            or "HTTP_AUTHORIZATION" in request.META
+        ):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = response_cache.key(request, self.get_cache_versions(action, kwargs))
+        entry = response_cache.get(key)
+        if entry is not None:
+            self.on_cache_hit(request, action, kwargs)
+            return response_cache.to_response(entry, request)
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            response_cache.store(key, response)
+            patch_vary_headers(response, ("Authorization",))
+            response["X-Cache"] = "MISS"
+        return response
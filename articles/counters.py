@@ -0,0 +1,121 @@
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """Write-behind buffer that coalesces article view increments"""
+
+    def __init__(self):
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker = None
+        atexit.register(self.shutdown)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, "VIEW_COUNT_FLUSH_INTERVAL", 5)
+
+    @property
+    def max_pending(self):
+        return getattr(settings, "VIEW_COUNT_MAX_PENDING", 1000)
+
+    def incr(self, article_id, amount=1):
+        """Record views for an article, flushing when the buffer is full"""
+        if self.flush_interval <= 0:
+            self._write({article_id: amount})
+            return
+
+        if self._buffer(article_id, amount) >= self.max_pending:
+            self.flush()
+
+    async def aincr(self, article_id, amount=1):
+        """incr() for async views: only database writes leave the event loop"""
+        if self.flush_interval <= 0:
+            await sync_to_async(self._write)({article_id: amount})
+            return
+
+        if self._buffer(article_id, amount) >= self.max_pending:
+            await sync_to_async(self.flush)()
+
+    def _buffer(self, article_id, amount):
+        with self._lock:
+            self._pending[article_id] += amount
+            size = len(self._pending)
+        self._ensure_worker()
+        return size
+
+    def pending(self, article_id):
+        """Views recorded for an article but not yet written"""
+        with self._lock:
+            return self._pending.get(article_id, 0)
+
+    def flush(self):
+        """Write buffered views to the database, returning how many were written"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+
+        if not pending:
+            return 0
+
+        try:
+            self._write(pending)
+        except Exception:
+            logger.exception("Failed to flush %d buffered article views", sum(pending.values()))
+            with self._lock:
+                self._pending.update(pending)
+            return 0
+
+        return sum(pending.values())
+
+    def _write(self, pending):
+        from . import leaderboards
+        from .models import Article
+
+        # One UPDATE per distinct increment: most articles share small deltas
+        by_amount = defaultdict(list)
+        for article_id, amount in pending.items():
+            by_amount[amount].append(article_id)
+
+        with transaction.atomic():
+            for amount, article_ids in by_amount.items():
+                for start in range(0, len(article_ids), 500):
+                    Article.objects.filter(pk__in=article_ids[start:start + 500]).update(
+                        views_count=F("views_count") + amount
+                    )
+            leaderboards.record("view", pending)
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._run, name="view-counter-flush", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+            close_old_connections()
+
+    def shutdown(self):
+        """Stop the flush worker and write whatever is still buffered"""
+        self._stop.set()
+        worker = self._worker
+        if worker is not None and worker.is_alive() and worker is not threading.current_thread():
+            worker.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+
+view_counter = ViewCounter()
@@ -0,0 +1,51 @@
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import apply_engagement_change
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def add_engagement(model, article_id, user_id):
+    """Insert a like/bookmark row unless it exists; True when a row was added
+
+    A single ``INSERT ... ON CONFLICT DO NOTHING`` makes repeated and
+    concurrent requests safe, and the counter update runs in the same
+    transaction only when the row is actually new.
+    """
+    created_at = model._meta.get_field("created_at").get_db_prep_value(timezone.now(), connection)
+    with transaction.atomic(savepoint=False):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {_table(model)} (article_id, user_id, created_at) VALUES (%s, %s, %s) "
+                f"ON CONFLICT (article_id, user_id) DO NOTHING",
+                [article_id, user_id, created_at],
+            )
+            added = cursor.rowcount == 1
+        if added:
+            apply_engagement_change(model, article_id, 1)
+    return added
+
+
+def remove_engagement(model, article_id, user_id):
+    """Delete a like/bookmark row if present; True when a row was removed"""
+    with transaction.atomic(savepoint=False):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {_table(model)} WHERE article_id = %s AND user_id = %s",
+                [article_id, user_id],
+            )
+            removed = cursor.rowcount == 1
+        if removed:
+            apply_engagement_change(model, article_id, -1)
+    return removed
+
+
+def toggle_engagement(model, article_id, user_id):
+    """Add the row, or remove it when it already exists; returns the new state"""
+    with transaction.atomic():
+        if add_engagement(model, article_id, user_id):
+            return True
+        remove_engagement(model, article_id, user_id)
+        return False
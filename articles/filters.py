@@ -1,12 +1,14 @@
 import django_filters
+from django.db.models import Exists, OuterRef
 from .models import Article
+from .tags import normalize_tag_name, tag_cache
 
 
 class ArticleFilter(django_filters.FilterSet):
     """Advanced filtering for articles"""
     title = django_filters.CharFilter(lookup_expr="icontains")
     author = django_filters.CharFilter(field_name="author__username", lookup_expr="icontains")
-    tags = django_filters.CharFilter(field_name="tags__name", lookup_expr="iexact")
+    tags = django_filters.CharFilter(method="filter_tags")
     published_after = django_filters.DateTimeFilter(field_name="published_at", lookup_expr="gte")
     published_before = django_filters.DateTimeFilter(field_name="published_at", lookup_expr="lte")
     min_views = django_filters.NumberFilter(field_name="views_count", lookup_expr="gte")
@@ -14,4 +16,13 @@ class ArticleFilter(django_filters.FilterSet):
     
     class Meta:
         model = Article
-        fields = ["title", "author", "tags", "is_published"]
\ No newline at end of file
+        fields = ["title", "author", "tags", "is_published"]
+    
+    def filter_tags(self, queryset, name, value):
+        """Match a tag name case-insensitively, resolving it to ids from the tag cache"""
+        tag_ids = tag_cache.resolve([value]).get(normalize_tag_name(value))
+        if not tag_ids:
+            return queryset.none()
+        return queryset.filter(
+            Exists(Article.tags.through.objects.filter(article_id=OuterRef("pk"), tag_id__in=tag_ids))
+        )
\ No newline at end of file
@@ -0,0 +1,167 @@
+import json
+import logging
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from accounts.models import UserProfile
+from blog_api.sanitizer import sanitizer
+from . import leaderboards
+from .cache import response_cache
+from .models import Article
+from .search import update_search_vectors
+from .serializers import ArticleImportSerializer
+from .slugs import allocate_slugs
+from .tags import get_or_create_tags, normalize_tag_names
+
+logger = logging.getLogger(__name__)
+
+
+class ImportReport:
+    """Outcome of an import: created count plus per-record errors keyed by line"""
+
+    def __init__(self):
+        self.created = 0
+        self.errors = []
+
+    def fail(self, line, errors):
+        self.errors.append({"line": line, "errors": errors})
+
+    @property
+    def failed(self):
+        return len(self.errors)
+
+    def as_dict(self):
+        errors = sorted(self.errors, key=lambda error: error["line"])
+        return {"created": self.created, "failed": self.failed, "errors": errors}
+
+
+class ArticleImporter:
+    """Stream JSONL/NDJSON article records into the database in chunks
+
+    Each chunk is validated record by record, then written with a handful of
+    statements: one title check, one slug lookup, one tag upsert and lookup,
+    one articles insert and one tags through-table insert. Invalid records
+    are reported by line number and never abort the rest of the import.
+    """
+
+    def __init__(self, author, chunk_size=None, processes=None):
+        self.author = author
+        self.chunk_size = chunk_size or getattr(settings, "ARTICLE_IMPORT_CHUNK_SIZE", 500)
+        self.processes = processes
+        self.seen_titles = set()
+
+    def run(self, lines):
+        report = ImportReport()
+        chunk = []
+        for number, line in enumerate(lines, start=1):
+            if isinstance(line, bytes):
+                line = line.decode("utf-8", errors="replace")
+            if not line.strip():
+                continue
+            chunk.append((number, line))
+            if len(chunk) >= self.chunk_size:
+                self.import_chunk(chunk, report)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk, report)
+        return report
+
+    def import_chunk(self, chunk, report):
+        records = self.validate(chunk, report)
+        records = self.drop_duplicate_titles(records, report)
+        if not records:
+            return
+
+        contents = sanitizer.clean_many([data["content"] for _, data in records], processes=self.processes)
+        articles = []
+        for (_, data), content in zip(records, contents):
+            article = Article(
+                author=self.author,
+                title=data["title"],
+                content=content,
+                excerpt=data.get("excerpt", ""),
+                is_published=data.get("is_published", True),
+            )
+            article.prepare_content(sanitize=False)
+            articles.append(article)
+        for article, slug in zip(articles, allocate_slugs(Article, [article.title for article in articles])):
+            article.slug = slug
+
+        tag_ids = get_or_create_tags(name for _, data in records for name in data.get("tags", []))
+        tag_names = [normalize_tag_names(data.get("tags", [])) for _, data in records]
+
+        try:
+            with transaction.atomic():
+                Article.objects.bulk_create(articles)
+                Article.tags.through.objects.bulk_create(
+                    [
+                        Article.tags.through(article_id=article.pk, tag_id=tag_ids[name])
+                        for article, names in zip(articles, tag_names)
+                        for name in names
+                    ],
+                    ignore_conflicts=True,
+                )
+                update_search_vectors([article.pk for article in articles])
+                # bulk_create sends no post_save, so count, rank and invalidate listings here
+                leaderboards.ensure_entries([article.pk for article in articles])
+                UserProfile.adjust_stats(
+                    self.author.pk,
+                    articles_count=len(articles),
+                    published_articles_count=sum(article.is_published for article in articles),
+                )
+                response_cache.bump("articles", "tags")
+            report.created += len(articles)
+        except IntegrityError:
+            # A concurrent writer took one of the slugs; save one by one instead
+            for (line, _), article, names in zip(records, articles, tag_names):
+                self.save_one(line, article, [tag_ids[name] for name in names], report)
+
+    def validate(self, chunk, report):
+        records = []
+        for line, text in chunk:
+            try:
+                record = json.loads(text)
+            except ValueError as exc:
+                report.fail(line, {"non_field_errors": [f"Invalid JSON: {exc}"]})
+                continue
+            if not isinstance(record, dict):
+                report.fail(line, {"non_field_errors": ["Expected a JSON object"]})
+                continue
+            serializer = ArticleImportSerializer(data=record)
+            if serializer.is_valid():
+                records.append((line, serializer.validated_data))
+            else:
+                report.fail(line, serializer.errors)
+        return records
+
+    def drop_duplicate_titles(self, records, report):
+        """Enforce case-insensitive title uniqueness for the chunk with a single query"""
+        lowered = {data["title"].lower() for _, data in records}
+        existing = set(
+            Article.objects.annotate(title_lower=Lower("title")).filter(title_lower__in=lowered).values_list(
+                "title_lower", flat=True
+            )
+        )
+        unique = []
+        for line, data in records:
+            title = data["title"].lower()
+            if title in existing or title in self.seen_titles:
+                report.fail(line, {"title": ["An article with this title already exists"]})
+                continue
+            self.seen_titles.add(title)
+            unique.append((line, data))
+        return unique
+
+    def save_one(self, line, article, tag_ids, report):
+        article.pk = None
+        article.slug = ""
+        article._state.adding = True
+        try:
+            with transaction.atomic():
+                article.save()
+                article.tags.set(tag_ids)
+        except IntegrityError:
+            logger.exception("Could not import the article on line %s", line)
+            report.fail(line, {"non_field_errors": ["The article conflicts with one saved at the same time"]})
+        else:
+            report.created += 1
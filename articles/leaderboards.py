@@ -0,0 +1,153 @@
+import math
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, FloatField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+EPOCH = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+
+EVENTS = {
+    "view": ("popularity", 1.0),
+    "like": ("trend", 3.0),
+    "comment": ("trend", 2.0),
+}
+
+DEFAULT_WINDOWS = {"day": 86400, "week": 604800, "all": None}
+
+
+def windows():
+    """Window name -> decay time constant in seconds (None never decays)"""
+    return getattr(settings, "LEADERBOARD_WINDOWS", DEFAULT_WINDOWS)
+
+
+# Decaying windows store ln(sum(w * exp(t / tau))) relative to EPOCH. Ordering
+# by that key equals ordering by the exponentially decayed score at any moment,
+# and a new event folds in with a single log-add-exp UPDATE.
+def decay_key(points, tau, now):
+    return math.log(points) + (now - EPOCH).total_seconds() / tau
+
+
+def _log_add(column, key):
+    current = F(column)
+    # Clamp the exponent: PostgreSQL raises on exp() underflow
+    return Greatest(current, Value(key)) + Ln(
+        Value(1.0) + Exp(Greatest(-Abs(current - Value(key)), Value(-50.0)))
+    )
+
+
+def _score_update(column, points, now):
+    whens = []
+    for window, tau in windows().items():
+        if tau is None:
+            whens.append(When(window=window, then=F(column) + Value(points)))
+        elif points > 0:
+            whens.append(When(window=window, then=_log_add(column, decay_key(points, tau, now))))
+    return Case(*whens, default=F(column), output_field=FloatField())
+
+
+def ensure_entries(article_ids):
+    from .models import LeaderboardEntry
+
+    LeaderboardEntry.objects.bulk_create(
+        [LeaderboardEntry(article_id=article_id, window=window) for article_id in article_ids for window in windows()],
+        ignore_conflicts=True,
+    )
+
+
+def record(event, counts):
+    """Fold {article_id: n} occurrences of an event into every window
+
+    Negative counts (unlikes, deleted comments) only adjust the all-time
+    window; decayed windows are corrected by the rebuild_leaderboards job.
+    """
+    from .models import LeaderboardEntry
+
+    column, weight = EVENTS[event]
+    now = timezone.now()
+
+    by_amount = defaultdict(list)
+    for article_id, amount in counts.items():
+        if amount:
+            by_amount[amount].append(article_id)
+
+    for amount, article_ids in by_amount.items():
+        for start in range(0, len(article_ids), 500):
+            chunk = article_ids[start:start + 500]
+            ensure_entries(chunk)
+            LeaderboardEntry.objects.filter(article_id__in=chunk).update(
+                **{column: _score_update(column, amount * weight, now)}
+            )
+
+
+def top_article_ids(column, window, limit, published_only=True):
+    """Article ids with the highest score in a window, best first"""
+    from .models import LeaderboardEntry
+
+    if window not in windows():
+        raise KeyError(window)
+
+    entries = LeaderboardEntry.objects.filter(window=window)
+    if published_only:
+        entries = entries.filter(article__is_published=True)
+    return list(entries.order_by(f"-{column}", "-article_id").values_list("article_id", flat=True)[:limit])
+
+
+def rebuild(batch_size=1000):
+    """Recompute every window's scores from the stored counters and recent events; yields each window when done"""
+    from .models import Article
+
+    now = timezone.now()
+    article_ids = list(Article.objects.values_list("pk", flat=True))
+    for start in range(0, len(article_ids), batch_size):
+        ensure_entries(article_ids[start:start + batch_size])
+
+    for window, tau in windows().items():
+        with transaction.atomic():
+            if tau is None:
+                _rebuild_all_time(window)
+            else:
+                _rebuild_decayed(window, tau, now, batch_size)
+        yield window
+
+
+def _rebuild_all_time(window):
+    from .models import Article, LeaderboardEntry
+
+    article = Article.objects.filter(pk=OuterRef("article_id"))
+    _, like_weight = EVENTS["like"]
+    _, comment_weight = EVENTS["comment"]
+    LeaderboardEntry.objects.filter(window=window).update(
+        popularity=Subquery(article.values("views_count")),
+        trend=Subquery(
+            article.annotate(
+                score=F("likes_count") * like_weight + F("comments_count") * comment_weight
+            ).values("score")
+        ),
+    )
+
+
+def _rebuild_decayed(window, tau, now, batch_size):
+    from .models import ArticleLike, Comment, LeaderboardEntry
+
+    # Views carry no timestamps, so only the trend score can be replayed;
+    # popularity keeps accumulating from the write-behind view flushes.
+    since = now - timezone.timedelta(seconds=tau * 10)
+    totals = defaultdict(float)
+    for model, event in ((ArticleLike, "like"), (Comment, "comment")):
+        _, weight = EVENTS[event]
+        rows = model.objects.filter(created_at__gte=since).values_list("article_id", "created_at")
+        for article_id, created_at in rows.iterator(chunk_size=batch_size):
+            totals[article_id] += weight * math.exp((created_at - now).total_seconds() / tau)
+
+    LeaderboardEntry.objects.filter(window=window).update(trend=0)
+    entries = [
+        LeaderboardEntry(pk=pk, trend=decay_key(totals[article_id], tau, now))
+        for pk, article_id in LeaderboardEntry.objects.filter(
+            window=window, article_id__in=list(totals)
+        ).values_list("pk", "article_id")
+        if totals[article_id] > 0
+    ]
+    LeaderboardEntry.objects.bulk_update(entries, ["trend"], batch_size=batch_size)
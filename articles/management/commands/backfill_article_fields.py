@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from articles.models import Article
+from articles.search import update_search_vectors
+
+
+class Command(BaseCommand):
+    help = "Compute stored plaintext, word count and read time for existing articles"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Articles updated per batch")
+        parser.add_argument(
+            "--missing-only", action="store_true", help="Only fill articles that have no plaintext yet"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        articles = Article.objects.order_by("pk")
+        if options["missing_only"]:
+            articles = articles.filter(plaintext="")
+
+        last_id = 0
+        updated = 0
+        while True:
+            batch = list(articles.filter(pk__gt=last_id).only("pk", "content")[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].pk
+
+            # Content was sanitized when it was saved, so only the derived
+            # columns are rewritten; updated_at is left untouched.
+            for article in batch:
+                article.compute_derived_fields()
+            with transaction.atomic():
+                Article.objects.bulk_update(batch, Article.DERIVED_FIELDS)
+                update_search_vectors([article.pk for article in batch])
+            updated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Backfilled {updated} articles"))
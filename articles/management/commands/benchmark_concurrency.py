@@ -0,0 +1,237 @@
+import asyncio
+import json
+import math
+import os
+import resource
+import shlex
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from articles.models import Article, Tag
+
+SERVERS = {
+    "wsgi": (
+        "gunicorn blog_api.wsgi:application --bind 127.0.0.1:{port} --workers {workers} "
+        "--worker-class gthread --threads {threads} --log-level warning"
+    ),
+    "asgi": "uvicorn blog_api.asgi:application --port {port} --workers {workers} --no-access-log --log-level warning",
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)] if ordered else 0.0
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response and return its status code"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers.get("connection") == "close"
+
+
+async def connection_loop(host, port, paths, offset, warmup_until, stop_at, stats):
+    """Keep one keep-alive connection busy until ``stop_at``, cycling through ``paths``"""
+    i = offset
+    reader = writer = None
+    while time.monotonic() < stop_at:
+        path = paths[i % len(paths)]
+        i += 1
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.monotonic()
+            writer.write(
+                f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nAccept: application/json\r\n\r\n".encode()
+            )
+            status, closed = await read_response(reader)
+            finished = time.monotonic()
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            stats["errors"] += 1
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            await asyncio.sleep(0.01)
+            continue
+        if closed:
+            writer.close()
+            reader = writer = None
+        if started >= warmup_until:
+            stats["latencies"].append((finished - started) * 1000)
+            stats["statuses"][status] += 1
+
+
+def run_client(host, port, paths, connections, warmup, duration, offset):
+    """One load-generating process: ``connections`` concurrent keep-alive connections"""
+    async def main():
+        start = time.monotonic()
+        stats = {"latencies": [], "statuses": Counter(), "errors": 0}
+        await asyncio.gather(*(
+            connection_loop(host, port, paths, offset + n, start + warmup, start + warmup + duration, stats)
+            for n in range(connections)
+        ))
+        return stats
+
+    return asyncio.run(main())
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests/s and tail latency of the hot anonymous read endpoints served by WSGI "
+        "(gunicorn, sync DRF views) and ASGI (uvicorn, async views) at high connection counts"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--connections", type=int, default=1000, help="Concurrent keep-alive connections")
+        parser.add_argument("--duration", type=float, default=20, help="Measured seconds per target")
+        parser.add_argument("--warmup", type=float, default=3, help="Unmeasured seconds before measuring")
+        parser.add_argument("--workers", type=int, default=2, help="Server worker processes")
+        parser.add_argument("--threads", type=int, default=32, help="Threads per gunicorn worker")
+        parser.add_argument(
+            "--client-processes", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+            help="Load generator processes (one Python process cannot saturate a server)",
+        )
+        parser.add_argument(
+            "--target", action="append", default=[], metavar="NAME=URL",
+            help="Benchmark an already running server instead of starting gunicorn and uvicorn",
+        )
+        parser.add_argument("--path", action="append", default=[], help="Request path (default: hot read endpoints)")
+        parser.add_argument("--port", type=int, default=8765, help="First port for the servers started here")
+        parser.add_argument("--response-cache", action="store_true", help="Keep the response cache enabled")
+        parser.add_argument("--report", help="Write the JSON report to this path")
+
+    def handle(self, *args, **options):
+        paths = options["path"] or self.default_paths()
+        self.raise_file_limit(options["connections"])
+
+        results = {}
+        if options["target"]:
+            for target in options["target"]:
+                name, _, url = target.partition("=")
+                parts = urlsplit(url)
+                results[name] = self.measure(parts.hostname, parts.port or 80, paths, options)
+        else:
+            for offset, name in enumerate(SERVERS):
+                port = options["port"] + offset
+                with self.server(name, port, options):
+                    results[name] = self.measure("127.0.0.1", port, paths, options)
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<8} {result['rps']:>9.1f} req/s  p50 {result['p50_ms']:>8.2f}ms  "
+                f"p95 {result['p95_ms']:>8.2f}ms  p99 {result['p99_ms']:>8.2f}ms  "
+                f"errors {result['errors']}  non-2xx {result['non_2xx']}"
+            )
+        if options["report"]:
+            report = {"connections": options["connections"], "paths": paths, "results": results}
+            Path(options["report"]).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+        self.stdout.write(self.style.SUCCESS(f"✓ Benchmarked {len(results)} targets"))
+
+    def default_paths(self):
+        articles = Article.objects.filter(is_published=True)
+        article = articles.order_by("-comments_count").values_list("pk", flat=True).first()
+        tag = Tag.objects.annotate(n=Count("articles")).order_by("-n").values_list("pk", flat=True).first()
+        if article is None or tag is None:
+            raise CommandError("No published articles or tags to request; run the seed command first")
+        return [
+            "/api/articles/",
+            "/api/articles/?page=2",
+            f"/api/articles/{article}/",
+            f"/api/articles/{article}/comments/",
+            "/api/tags/",
+            f"/api/tags/{tag}/articles/",
+        ]
+
+    def raise_file_limit(self, connections):
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        needed = connections + 256
+        if soft < needed:
+            if hard != resource.RLIM_INFINITY and hard < needed:
+                raise CommandError(f"{connections} connections need {needed} file descriptors; the limit is {hard}")
+            resource.setrlimit(resource.RLIMIT_NOFILE, (needed, hard))
+
+    def server(self, name, port, options):
+        command = shlex.split(SERVERS[name].format(port=port, workers=options["workers"], threads=options["threads"]))
+        if shutil.which(command[0]) is None:
+            raise CommandError(f"{command[0]} is not installed; install it or pass --target {name}=URL")
+        env = {**os.environ, "ASYNC_READ_VIEWS_ENABLED": "True" if name == "asgi" else "False"}
+        if not options["response_cache"]:
+            env["RESPONSE_CACHE_ENABLED"] = "False"
+        return RunningServer(command, env, port)
+
+    def measure(self, host, port, paths, options):
+        processes = max(1, min(options["client_processes"], options["connections"]))
+        shares = [options["connections"] // processes + (i < options["connections"] % processes) for i in range(processes)]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [
+                pool.submit(run_client, host, port, paths, share, options["warmup"], options["duration"], offset)
+                for offset, share in enumerate(shares)
+            ]
+            runs = [future.result() for future in futures]
+
+        latencies = [latency for run in runs for latency in run["latencies"]]
+        statuses = sum((run["statuses"] for run in runs), Counter())
+        return {
+            "requests": len(latencies),
+            "rps": round(len(latencies) / options["duration"], 1),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(max(latencies, default=0.0), 2),
+            "errors": sum(run["errors"] for run in runs),
+            "non_2xx": sum(count for status, count in statuses.items() if not 200 <= status < 300),
+        }
+
+
+class RunningServer:
+    """Context manager that starts a server process and waits until it accepts connections"""
+
+    def __init__(self, command, env, port, timeout=30):
+        self.command = command
+        self.env = env
+        self.port = port
+        self.timeout = timeout
+
+    def __enter__(self):
+        self.process = subprocess.Popen(self.command, env=self.env, stdout=sys.stderr)
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise CommandError(f"{' '.join(self.command)} exited with {self.process.returncode}")
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=1).close()
+                return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise CommandError(f"{self.command[0]} did not start listening on port {self.port}")
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
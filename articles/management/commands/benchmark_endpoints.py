@@ -0,0 +1,232 @@
+import json
+import math
+import time
+from pathlib import Path
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from articles.models import Article, Comment, Tag
+from articles.seeding import VolumeSeeder
+
+DEFAULT_BUDGETS = Path(settings.BASE_DIR) / "benchmarks" / "budgets.json"
+DATASET = {"users": 200, "articles": 400, "comments_per_article": 6, "likes": 4000, "seed": 7}
+PASSWORDS = ("Bench-pass-0!", "Bench-pass-1!")
+
+# name, method, path, auth ("anon" or "user"), body (dict or callable(iteration, ctx))
+SCENARIOS = [
+    ("articles-list", "get", "/api/articles/", "anon", None),
+    ("articles-list", "get", "/api/articles/", "user", None),
+    ("articles-list-cursor", "get", "/api/articles/?pagination=cursor", "anon", None),
+    ("articles-search", "get", "/api/articles/?search=cache", "anon", None),
+    ("articles-filter-tag", "get", "/api/articles/?tags={tag_name}", "anon", None),
+    ("articles-ordering", "get", "/api/articles/?ordering=-likes_count", "user", None),
+    ("article-detail", "get", "/api/articles/{article}/", "anon", None),
+    ("article-detail", "get", "/api/articles/{article}/", "user", None),
+    ("article-comments", "get", "/api/articles/{article}/comments/", "anon", None),
+    ("article-likes", "get", "/api/articles/{article}/likes_list/", "anon", None),
+    ("articles-popular", "get", "/api/articles/popular/", "anon", None),
+    ("articles-trending", "get", "/api/articles/trending/", "user", None),
+    ("article-like", "post", "/api/articles/{article}/like/", "user", None),
+    ("article-like-put", "put", "/api/articles/{article}/like/", "user", None),
+    ("article-like-delete", "delete", "/api/articles/{article}/like/", "user", None),
+    ("article-bookmark", "post", "/api/articles/{article}/bookmark/", "user", None),
+    ("article-bookmark-put", "put", "/api/articles/{article}/bookmark/", "user", None),
+    ("article-bookmark-delete", "delete", "/api/articles/{article}/bookmark/", "user", None),
+    ("article-add-comment", "post", "/api/articles/{article}/add_comment/", "user",
+     lambda i, ctx: {"content": f"Benchmark comment {i}"}),
+    ("comments-list", "get", "/api/comments/", "anon", None),
+    ("comment-detail", "get", "/api/comments/{comment}/", "anon", None),
+    ("comment-replies", "get", "/api/comments/{comment}/replies/", "anon", None),
+    ("tags-list", "get", "/api/tags/", "anon", None),
+    ("tag-detail", "get", "/api/tags/{tag}/", "anon", None),
+    ("tag-articles", "get", "/api/tags/{tag}/articles/", "anon", None),
+    ("bookmarks", "get", "/api/bookmarks/", "user", None),
+    ("user-articles", "get", "/api/users/{author}/articles/", "anon", None),
+    ("users-list", "get", "/api/users/", "anon", None),
+    ("users-list-cursor", "get", "/api/users/?pagination=cursor", "anon", None),
+    ("users-search", "get", "/api/users/?search=SEED7_1", "anon", None),
+    ("user-detail", "get", "/api/users/{author}/", "anon", None),
+    ("me", "get", "/api/me/", "user", None),
+    ("me-update", "patch", "/api/me/", "user", lambda i, ctx: {"bio": f"Benchmarked {i} times"}),
+    ("register", "post", "/api/register/", "anon", lambda i, ctx: {
+        "username": f"bench_new_{i}", "email": f"bench_new_{i}@example.com", "first_name": "Bench",
+        "last_name": "Mark", "password": PASSWORDS[0], "password2": PASSWORDS[0],
+    }),
+    ("change-password", "post", "/api/change-password/", "user", lambda i, ctx: {
+        "old_password": PASSWORDS[i % 2], "new_password": PASSWORDS[(i + 1) % 2],
+        "new_password2": PASSWORDS[(i + 1) % 2],
+    }),
+    ("token-obtain", "post", "/api/token/", "anon", lambda i, ctx: {
+        "username": ctx["login_username"], "password": PASSWORDS[0],
+    }),
+    # Rotation blacklists each refresh token, so every request needs a fresh one
+    ("token-refresh", "post", "/api/token/refresh/", "anon", lambda i, ctx: {"refresh": ctx["refresh"][i]}),
+]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    help = "Benchmark every API route against checked-in query, latency and size budgets"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--budgets", default=str(DEFAULT_BUDGETS), help="Budget file to check against")
+        parser.add_argument("--report", help="Write the JSON report to this path")
+        parser.add_argument("--repeat", type=int, default=20, help="Measured requests per scenario")
+        parser.add_argument("--only", help="Run scenarios whose name contains this text")
+        parser.add_argument("--response-cache", action="store_true", help="Keep the response cache enabled")
+        parser.add_argument(
+            "--skip-latency", action="store_true", help="Only enforce query and size budgets (noisy CI hosts)"
+        )
+        parser.add_argument(
+            "--update-budgets", action="store_true", help="Rewrite the budget file from this run instead of checking"
+        )
+
+    def handle(self, *args, **options):
+        budgets_path = Path(options["budgets"])
+        budgets = json.loads(budgets_path.read_text()) if budgets_path.exists() else {"budgets": {}}
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            response_cache = {**getattr(settings, "RESPONSE_CACHE", {})}
+            if not options["response_cache"]:
+                response_cache["ENABLED"] = False
+            with override_settings(RESPONSE_CACHE=response_cache, VIEW_COUNT_FLUSH_INTERVAL=0):
+                ctx = self.seed(refresh_tokens=options["repeat"] + 1)
+                results = self.run_scenarios(ctx, options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if options["update_budgets"]:
+            budgets = {"dataset": DATASET, "budgets": {
+                key: {
+                    "queries": result["queries"],
+                    "p95_ms": max(100, math.ceil(result["p95_ms"] * 3)),
+                    "bytes": math.ceil(result["bytes"] * 1.25) + 512,
+                }
+                for key, result in results.items()
+            }}
+            budgets_path.parent.mkdir(parents=True, exist_ok=True)
+            budgets_path.write_text(json.dumps(budgets, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"✓ Wrote budgets for {len(results)} scenarios to {budgets_path}"))
+            return
+
+        metrics = ("queries", "bytes") if options["skip_latency"] else ("queries", "p95_ms", "bytes")
+        violations = self.check_budgets(results, budgets.get("budgets", {}), metrics)
+        if budgets.get("dataset", DATASET) != DATASET:
+            violations.insert(0, "budgets were recorded for a different dataset; rerun with --update-budgets")
+        report = {"dataset": DATASET, "results": results, "violations": violations}
+        if options["report"]:
+            Path(options["report"]).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+        if violations:
+            for violation in violations:
+                self.stderr.write(self.style.ERROR(f"✗ {violation}"))
+            raise CommandError(f"{len(violations)} budget(s) exceeded")
+        self.stdout.write(self.style.SUCCESS(f"✓ {len(results)} scenarios within budget"))
+
+    def seed(self, refresh_tokens):
+        VolumeSeeder(
+            users=DATASET["users"],
+            articles=DATASET["articles"],
+            comments_per_article=DATASET["comments_per_article"],
+            likes=DATASET["likes"],
+            seed=DATASET["seed"],
+            chunk_size=1000,
+        ).run()
+
+        reader = User.objects.create_user("bench_reader", "bench_reader@example.com", PASSWORDS[0])
+        login = User.objects.create_user("bench_login", "bench_login@example.com", PASSWORDS[0])
+        articles = Article.objects.filter(is_published=True)
+        # The most engaged rows are the worst case for per-row queries
+        top = articles.order_by("-likes_count", "-comments_count").first()
+        for article in articles.order_by("-published_at")[:10]:
+            article.bookmarks.create(user=reader)
+        tag = Tag.objects.annotate(n=Count("articles")).order_by("-n").first()
+        return {
+            "article": top.pk,
+            "comment": Comment.objects.filter(parent=None).annotate(n=Count("replies")).order_by("-n").first().pk,
+            "tag": tag.pk,
+            "tag_name": tag.name,
+            "author": articles.values("author").annotate(n=Count("pk")).order_by("-n")[0]["author"],
+            "reader": reader,
+            "access": str(RefreshToken.for_user(reader).access_token),
+            "refresh": [str(RefreshToken.for_user(login)) for _ in range(refresh_tokens)],
+            "login_username": login.username,
+        }
+
+    def run_scenarios(self, ctx, options):
+        results = {}
+        for name, method, path, auth, body in SCENARIOS:
+            if options["only"] and options["only"] not in name:
+                continue
+            key = f"{name}:{auth}"
+            url = path.format(**ctx)
+            headers = {"HTTP_AUTHORIZATION": f"Bearer {ctx['access']}"} if auth == "user" else {}
+            client = Client()
+
+            def request(iteration):
+                data = body(iteration, ctx) if callable(body) else body
+                kwargs = {"secure": True, **headers}
+                if data is not None:
+                    kwargs.update(data=json.dumps(data), content_type="application/json")
+                return getattr(client, method)(url, **kwargs)
+
+            # Warm up process-local caches (tag cache, content types, JWT keys)
+            request(0)
+            timings, queries, sizes, statuses = [], [], [], set()
+            for iteration in range(1, options["repeat"] + 1):
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = request(iteration)
+                    timings.append((time.perf_counter() - started) * 1000)
+                queries.append(len(captured))
+                sizes.append(len(response.content))
+                statuses.add(response.status_code)
+
+            results[key] = {
+                "method": method.upper(),
+                "path": url,
+                "status": sorted(statuses),
+                "queries": max(queries),
+                "p50_ms": round(percentile(timings, 50), 2),
+                "p95_ms": round(percentile(timings, 95), 2),
+                "bytes": max(sizes),
+            }
+            result = results[key]
+            self.stdout.write(
+                f"{key:<32} {result['queries']:>4} queries  p50 {result['p50_ms']:>7.2f}ms  "
+                f"p95 {result['p95_ms']:>7.2f}ms  {result['bytes']:>8} B  {result['status']}"
+            )
+        return results
+
+    def check_budgets(self, results, budgets, metrics):
+        violations = []
+        for key, result in results.items():
+            if any(status >= 400 for status in result["status"]):
+                violations.append(f"{key} returned {result['status']}")
+            budget = budgets.get(key)
+            if budget is None:
+                violations.append(f"{key} has no budget")
+                continue
+            for metric in metrics:
+                if result[metric] > budget[metric]:
+                    violations.append(f"{key} {metric} {result[metric]} exceeds budget {budget[metric]}")
+        return violations
@@ -0,0 +1,81 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from blog_api.sanitizer import ALLOWED_ATTRIBUTES, ALLOWED_TAGS, HTMLSanitizer
+
+PARAGRAPHS = [
+    "<p>Plain paragraph with <strong>bold</strong> and <em>emphasis</em>.</p>",
+    "<p onclick=\"steal()\">Handler attributes <script>alert(1)</script>are stripped.</p>",
+    "<ul><li>One</li><li>Two <a href=\"https://example.com\" style=\"x\">link</a></li></ul>",
+    "<blockquote>Quoted <iframe src=\"//evil\"></iframe>text</blockquote>",
+    "<pre><code>print(\"hello\")</code></pre>",
+    "<h2>Heading</h2><img src=\"/media/a.png\" alt=\"a\" onerror=\"x()\">",
+]
+
+
+def legacy_sanitize(content):
+    """The original per-call implementation, kept for comparison"""
+    import bleach
+    allowed_tags = [
+        'p', 'br', 'strong', 'em', 'u', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+        'ul', 'ol', 'li', 'blockquote', 'code', 'pre', 'a', 'img'
+    ]
+    allowed_attributes = {
+        'a': ['href', 'title', 'target'],
+        'img': ['src', 'alt', 'title', 'width', 'height']
+    }
+    return bleach.clean(content, tags=allowed_tags, attributes=allowed_attributes, strip=True)
+
+
+class Command(BaseCommand):
+    help = "Compare HTML sanitizer throughput against the original per-call bleach.clean"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bodies", type=int, default=2000, help="Documents per run")
+        parser.add_argument("--paragraphs", type=int, default=20, help="Paragraphs per document")
+        parser.add_argument("--duplicates", type=float, default=0.3, help="Share of repeated documents")
+        parser.add_argument("--processes", type=int, default=4, help="Workers for the pooled batch run")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        unique = max(1, int(options["bodies"] * (1 - options["duplicates"])))
+        documents = [
+            "".join(rng.choice(PARAGRAPHS) for _ in range(options["paragraphs"])) + f"<p>#{i}</p>"
+            for i in range(unique)
+        ]
+        bodies = documents + [rng.choice(documents) for _ in range(options["bodies"] - unique)]
+        rng.shuffle(bodies)
+
+        runs = [
+            ("legacy bleach.clean", lambda: [legacy_sanitize(body) for body in bodies]),
+        ]
+        cold = HTMLSanitizer(ALLOWED_TAGS, ALLOWED_ATTRIBUTES, cache_size=0)
+        runs.append(("compiled cleaner, no cache", lambda: [cold.clean(body) for body in bodies]))
+        cached = HTMLSanitizer(ALLOWED_TAGS, ALLOWED_ATTRIBUTES, cache_size=len(bodies) * 2)
+        runs.append(("cached, first pass", lambda: [cached.clean(body) for body in bodies]))
+        runs.append(("cached, repeat pass", lambda: [cached.clean(body) for body in bodies]))
+        runs.append(("cached, already-clean input", lambda: [cached.clean(body) for body in expected]))
+        batch = HTMLSanitizer(ALLOWED_TAGS, ALLOWED_ATTRIBUTES, cache_size=len(bodies) * 2)
+        runs.append(("clean_many, serial", lambda: batch.clean_many(bodies)))
+        pooled = HTMLSanitizer(ALLOWED_TAGS, ALLOWED_ATTRIBUTES, cache_size=len(bodies) * 2)
+        runs.append((
+            f"clean_many, {options['processes']} processes",
+            lambda: pooled.clean_many(bodies, processes=options["processes"]),
+        ))
+
+        expected = None
+        baseline = None
+        for name, run in runs:
+            started = time.perf_counter()
+            result = run()
+            elapsed = time.perf_counter() - started
+            if expected is None:
+                expected, baseline = result, elapsed
+            elif result != expected:
+                self.stderr.write(self.style.ERROR(f"✗ {name} produced different output"))
+            self.stdout.write(
+                f"{name:<32} {len(bodies) / elapsed:>10.0f} docs/s  {baseline / elapsed:>6.1f}x"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Sanitized {len(bodies)} documents per run"))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from accounts.models import UserProfile
+from articles.models import Article
+from blog_api.images import image_pipeline
+
+
+class Command(BaseCommand):
+    help = "Pre-generate missing renditions of featured images and avatars instead of on first request"
+
+    def handle(self, *args, **options):
+        names = set(Article.objects.exclude(featured_image="").exclude(featured_image=None).values_list(
+            "featured_image", flat=True
+        ))
+        names.update(UserProfile.objects.exclude(avatar="").exclude(avatar=None).values_list("avatar", flat=True))
+
+        failed = 0
+        for name in sorted(names):
+            try:
+                image_pipeline.generate(name)
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"✗ {name}: {exc}")
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Generated renditions for {len(names) - failed} images"))
@@ -0,0 +1,31 @@
+import sys
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from articles.ingest import ArticleImporter
+
+
+class Command(BaseCommand):
+    help = "Import articles from a JSONL/NDJSON file (one article object per line, - for stdin)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to read, or - for stdin")
+        parser.add_argument("--author", required=True, help="Username the articles are attributed to")
+        parser.add_argument("--chunk-size", type=int, default=None, help="Records written per batch")
+        parser.add_argument("--processes", type=int, default=None, help="Worker processes for HTML sanitizing")
+
+    def handle(self, *args, **options):
+        try:
+            author = User.objects.get(username=options["author"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['author']!r} does not exist")
+
+        importer = ArticleImporter(author, chunk_size=options["chunk_size"], processes=options["processes"])
+        if options["path"] == "-":
+            report = importer.run(sys.stdin)
+        else:
+            with open(options["path"], encoding="utf-8") as stream:
+                report = importer.run(stream)
+
+        for error in report.as_dict()["errors"]:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(f"✓ Imported {report.created} articles, {report.failed} failed"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from articles import leaderboards
+
+
+class Command(BaseCommand):
+    help = "Recompute article leaderboard scores (run periodically to correct drift)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows written per statement")
+
+    def handle(self, *args, **options):
+        for window in leaderboards.rebuild(options["batch_size"]):
+            self.stdout.write(self.style.SUCCESS(f"✓ Rebuilt {window} leaderboard"))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from articles.models import Article
+from articles.search import update_search_vectors, uses_full_text_search
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored full-text search vector for every article"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Articles updated per statement")
+
+    def handle(self, *args, **options):
+        if not uses_full_text_search():
+            raise CommandError("Full-text search vectors are only stored on PostgreSQL")
+
+        batch_size = options["batch_size"]
+        last_id = 0
+        updated = 0
+        while True:
+            batch_ids = list(
+                Article.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch_ids:
+                break
+            update_search_vectors(batch_ids)
+            last_id = batch_ids[-1]
+            updated += len(batch_ids)
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Reindexed {updated} articles"))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from articles.models import Article, ArticleLike, Bookmark, Comment
+from blog_api.db.counters import count_subquery, repair_counters
+
+COUNTERS = {
+    "likes_count": ArticleLike,
+    "comments_count": Comment,
+    "bookmarks_count": Bookmark,
+}
+
+
+def counter_subqueries():
+    """The true value of each stored engagement counter, as expressions over Article"""
+    return {field: count_subquery(model.objects.all(), "article") for field, model in COUNTERS.items()}
+
+
+class Command(BaseCommand):
+    help = "Recompute stored article engagement counters and repair any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Articles checked per batch")
+
+    def handle(self, *args, **options):
+        checked, repaired = repair_counters(Article.objects.all(), counter_subqueries, options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✓ Checked {checked} articles, repaired {repaired}"))
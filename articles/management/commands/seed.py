@@ -1,14 +1,30 @@
-from django.core.management.base import BaseCommand
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import User
 from articles.models import Article, Comment, Tag, ArticleLike, Bookmark
+from articles.seeding import VolumeSeeder
 from accounts.models import UserProfile
 import random
+import time
 
 
 class Command(BaseCommand):
-    help = "Seed database with sample data"
+    help = "Seed database with sample data (pass --users/--articles for a production-sized dataset)"
+    
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=0, help="Users to generate")
+        parser.add_argument("--articles", type=int, default=0, help="Articles to generate")
+        parser.add_argument("--comments-per-article", type=int, default=5, help="Average comments per article")
+        parser.add_argument("--likes", type=int, default=None, help="Total likes (default: 10 per article)")
+        parser.add_argument("--likes-zipf", type=float, default=1.1, help="Zipf exponent of article popularity")
+        parser.add_argument("--days", type=int, default=365, help="Spread publication dates over this many days")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed yields the same data")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows written per statement")
     
     def handle(self, *args, **options):
+        if options["users"] or options["articles"]:
+            return self.seed_volume(options)
+        
         self.stdout.write("Seeding database...")
         
         # Create admin user
@@ -221,4 +237,26 @@ article=article,
         self.stdout.write(self.style.SUCCESS("\n✅ Database seeded successfully!"))
         self.stdout.write(self.style.WARNING("\nLogin credentials:"))
         self.stdout.write("  Admin: admin / admin123")
-        self.stdout.write("  Users: alice/alice123, bob/bob123, charlie/charlie123, diana/diana123")
\ No newline at end of file
+        self.stdout.write("  Users: alice/alice123, bob/bob123, charlie/charlie123, diana/diana123")
+    
+    def seed_volume(self, options):
+        if options["users"] < 1 or options["articles"] < 1:
+            raise CommandError("--users and --articles must both be positive")
+        seeder = VolumeSeeder(
+            users=options["users"],
+            articles=options["articles"],
+            comments_per_article=options["comments_per_article"],
+            likes=options["likes"],
+            likes_zipf=options["likes_zipf"],
+            seed=options["seed"],
+            chunk_size=options["chunk_size"],
+            days=options["days"],
+            log=lambda message: self.stdout.write(self.style.SUCCESS(message)),
+        )
+        if User.objects.filter(username__startswith=seeder.prefix).exists():
+            raise CommandError(f"Seed {options['seed']} was already loaded; pass a different --seed")
+        
+        started = time.monotonic()
+        seeder.run()
+        call_command("rebuild_leaderboards", batch_size=options["chunk_size"], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"\n✅ Seeded in {time.monotonic() - started:.1f}s"))
@@ -1,8 +1,21 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_migrate, post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinLengthValidator
-from django.utils.text import slugify
-from blog_api.utils import sanitize_html
+from accounts.cache import user_cache
+from accounts.models import UserProfile
+from blog_api.db.counters import count_subquery
+from blog_api.images import image_pipeline
+from blog_api.utils import html_to_text, sanitize_html
+from .search import SearchVectorIndex, update_search_vectors
+from .slugs import save_with_slug
+from . import leaderboards
+from .cache import response_cache
+from .tags import tag_cache
 
 
 class Tag(models.Model):
@@ -13,9 +26,10 @@ class Tag(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
+            save_with_slug(self, self.name, lambda: super(Tag, self).save(*args, **kwargs))
     
     def __str__(self):
         return self.name
@@ -42,28 +56,78 @@ class Article(models.Model):
     tags = models.ManyToManyField(Tag, related_name="articles", blank=True)
     is_published = models.BooleanField(default=True, help_text="Is this article visible to the public?")
     views_count = models.PositiveIntegerField(default=0, editable=False)
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    bookmarks_count = models.PositiveIntegerField(default=0, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    read_time = models.PositiveIntegerField(default=1, editable=False, help_text="Estimated reading time in minutes")
+    plaintext = models.TextField(blank=True, editable=False)
+    
+    WORDS_PER_MINUTE = 200
+    DERIVED_FIELDS = ("word_count", "read_time", "plaintext")
+    # Columns list endpoints never serialize
+    LIST_DEFERRED_FIELDS = ("content", "plaintext", "search_vector")
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_author_stats = instance.author_stats()
+        instance._saved_featured_image = instance.featured_image.name if "featured_image" in field_names else None
+        return instance
     
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while Article.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            self.prepare_content()
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | {"excerpt", *self.DERIVED_FIELDS}
         
-        self.content = sanitize_html(self.content)
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
+            save_with_slug(self, self.title, lambda: super(Article, self).save(*args, **kwargs))
         
+        if update_fields is None or set(update_fields) & {"title", "excerpt", "content", "author"}:
+            update_search_vectors([self.pk])
+    
+    def prepare_content(self, sanitize=True):
+        """Sanitize content and fill the fields derived from it; bulk writers call this instead of save()"""
+        if sanitize:
+            self.content = sanitize_html(self.content)
+        self.compute_derived_fields()
         if not self.excerpt:
-            self.excerpt = self.content[:297] + "..." if len(self.content) > 300 else self.content
-        
-        super().save(*args, **kwargs)
+            self.excerpt = self.plaintext[:297] + "..." if len(self.plaintext) > 300 else self.plaintext
+    
+    def compute_derived_fields(self):
+        """Fill plaintext, word_count and read_time from the (sanitized) content"""
+        self.plaintext = html_to_text(self.content)
+        self.word_count = len(self.plaintext.split())
+        self.read_time = max(1, self.word_count // self.WORDS_PER_MINUTE)
     
     def increment_views(self):
-        """Increment article view count"""
+        """Increment article view count through the write-behind buffer"""
+        from .counters import view_counter
+        view_counter.incr(self.pk)
+        self.views_count += 1
+    
+    async def aincrement_views(self):
+        """increment_views() for async views"""
+        from .counters import view_counter
+        await view_counter.aincr(self.pk)
         self.views_count += 1
-        self.save(update_fields=["views_count"])
+    
+    def author_stats(self):
+        """(author_id, is_published, likes_count) as they count towards the author, or None when deferred"""
+        fields = ("author_id", "is_published", "likes_count")
+        if all(field in self.__dict__ for field in fields):
+            return tuple(self.__dict__[field] for field in fields)
+        return None
+    
+    @classmethod
+    def adjust_counter(cls, article_id, field, delta):
+        """Atomically add delta to one of the stored engagement counters"""
+        cls.objects.filter(pk=article_id).update(**{field: Greatest(F(field) + delta, 0)})
     
     def __str__(self):
         return self.title
@@ -71,8 +135,10 @@ class Article(models.Model):
     class Meta:
         ordering = ["-published_at"]
         indexes = [
-            models.Index(fields=["-published_at"]),
+            models.Index(fields=["-published_at", "-id"]),
+            models.Index(fields=["author", "-published_at", "-id"]),
             models.Index(fields=["slug"]),
+            SearchVectorIndex(fields=["search_vector"], name="article_search_vector_idx"),
         ]
 
 
@@ -95,7 +161,9 @@ class Comment(models.Model):
     is_edited = models.BooleanField(default=False)
     
     def save(self, *args, **kwargs):
-        self.content = sanitize_html(self.content)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            self.content = sanitize_html(self.content)
         if self.pk:
             self.is_edited = True
         super().save(*args, **kwargs)
@@ -133,6 +201,228 @@ class Bookmark(models.Model):
     class Meta:
         unique_together = ("article", "user")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"]),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} bookmarked {self.article.title}"
+
+
+class LeaderboardEntry(models.Model):
+    """Precomputed popularity and trending scores of an article for one window"""
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="leaderboard_entries")
+    window = models.CharField(max_length=10)
+    popularity = models.FloatField(default=0)
+    trend = models.FloatField(default=0)
+    
+    class Meta:
+        unique_together = ("article", "window")
+        indexes = [
+            models.Index(fields=["window", "-popularity"]),
+            models.Index(fields=["window", "-trend"]),
+        ]
     
     def __str__(self):
-        return f"{self.user.username} bookmarked {self.article.title}"
\ No newline at end of file
+        return f"{self.article_id} ({self.window})"
+
+
+ENGAGEMENT_COUNTERS = {
+    ArticleLike: "likes_count",
+    Bookmark: "bookmarks_count",
+    Comment: "comments_count",
+}
+
+LEADERBOARD_EVENTS = {
+    ArticleLike: "like",
+    Comment: "comment",
+}
+
+
+def apply_engagement_change(model, article_id, delta):
+    """Update the stored counter, response stamps and leaderboards for added (+1) or removed (-1) rows"""
+    Article.adjust_counter(article_id, ENGAGEMENT_COUNTERS[model], delta)
+    if model is ArticleLike:
+        # A concrete id, so the author's cached copy can be invalidated too
+        author_id = Article.objects.filter(pk=article_id).values_list("author_id", flat=True).first()
+        if author_id is not None:
+            UserProfile.adjust_stats(author_id, likes_received=delta)
+    response_cache.bump("articles", f"article:{article_id}")
+    if model in LEADERBOARD_EVENTS:
+        leaderboards.record(LEADERBOARD_EVENTS[model], {article_id: delta})
+
+
+@receiver(post_save, sender=ArticleLike)
+@receiver(post_save, sender=Bookmark)
+@receiver(post_save, sender=Comment)
+def increment_engagement_counter(sender, instance, created, **kwargs):
+    """Keep Article engagement counters in step with new rows"""
+    if created:
+        apply_engagement_change(sender, instance.article_id, 1)
+
+
+def deleting_articles(origin):
+    """Ids of the articles that a delete() call is removing, as recorded on its origin"""
+    return getattr(origin, "_deleting_article_ids", ())
+
+
+@receiver(pre_delete, sender=Article)
+def mark_article_deletion(sender, instance, origin=None, **kwargs):
+    """Record the article on the delete() origin, so its cascaded rows skip per-row bookkeeping
+
+    Counters, stamps and leaderboard entries of the article disappear with it;
+    updating them once per cascaded like, comment and bookmark would cost
+    several statements per row. The mark lives on the origin object, so it
+    never outlasts the delete() call, even one that fails.
+    """
+    if origin is not None:
+        origin.__dict__.setdefault("_deleting_article_ids", set()).add(instance.pk)
+
+
+@receiver(post_delete, sender=ArticleLike)
+@receiver(post_delete, sender=Bookmark)
+@receiver(post_delete, sender=Comment)
+def decrement_engagement_counter(sender, instance, origin=None, **kwargs):
+    """Keep Article engagement counters in step with deleted rows"""
+    if instance.article_id not in deleting_articles(origin):
+        apply_engagement_change(sender, instance.article_id, -1)
+
+
+@receiver(post_save, sender=Article)
+def add_leaderboard_entries(sender, instance, created, **kwargs):
+    """New articles rank from the start, not only after their first view, like or comment"""
+    if created:
+        leaderboards.ensure_entries([instance.pk])
+
+
+@receiver(post_migrate)
+def seed_leaderboards(sender, using, **kwargs):
+    """Fill empty leaderboards from the stored counters, e.g. for data that predates them"""
+    if sender.label != "articles":
+        return
+    if Article.objects.using(using).exists() and not LeaderboardEntry.objects.using(using).exists():
+        for _ in leaderboards.rebuild():
+            pass
+
+
+def apply_author_stats(stats, sign):
+    """Add (+1) or remove (-1) an article's contribution to its author's stored statistics"""
+    author_id, is_published, likes_count = stats
+    UserProfile.adjust_stats(
+        author_id,
+        articles_count=sign,
+        published_articles_count=sign if is_published else 0,
+        likes_received=sign * likes_count,
+    )
+
+
+@receiver(post_save, sender=Article)
+def count_author_article(sender, instance, created, **kwargs):
+    """Move the author's stored statistics when an article is added, published, hidden or reassigned"""
+    stats = instance.author_stats()
+    if created:
+        apply_author_stats((*stats[:2], 0), 1)
+    else:
+        saved = instance.__dict__.get("_saved_author_stats")
+        if saved is not None and stats is not None and saved[:2] != stats[:2]:
+            apply_author_stats(saved, -1)
+            apply_author_stats((*stats[:2], saved[2]), 1)
+    instance._saved_author_stats = stats
+
+
+@receiver(post_save, sender=Article)
+def render_featured_image(sender, instance, update_fields=None, **kwargs):
+    """Resize a new featured image in the background and forget the one it replaced"""
+    if update_fields is not None and "featured_image" not in update_fields:
+        return
+    saved = instance.__dict__.get("_saved_featured_image")
+    if instance.featured_image.name != saved:
+        image_pipeline.forget(saved)
+        if instance.featured_image:
+            image_pipeline.schedule(instance.featured_image.name)
+    instance._saved_featured_image = instance.featured_image.name
+
+
+@receiver(post_delete, sender=Article)
+def forget_featured_image(sender, instance, **kwargs):
+    """Stop serving renditions of a deleted article's featured image"""
+    image_pipeline.forget(instance.featured_image.name)
+
+
+@receiver(pre_delete, sender=Article)
+def uncount_article_comments(sender, instance, origin=None, **kwargs):
+    """Take the article's comments off their authors' totals in one UPDATE"""
+    if instance.pk not in deleting_articles(origin):
+        return
+    comments = Comment.objects.filter(article_id=instance.pk)
+    commenter_ids = list(comments.order_by().values_list("user_id", flat=True).distinct())
+    if commenter_ids:
+        UserProfile.objects.filter(user_id__in=commenter_ids).update(
+            comments_count=Greatest(F("comments_count") - count_subquery(comments, "user", "user_id"), 0)
+        )
+        for user_id in commenter_ids:
+            user_cache.invalidate(user_id)
+
+
+@receiver(post_delete, sender=Article)
+def uncount_author_article(sender, instance, origin=None, **kwargs):
+    """Cascaded likes skip their own signals, so the article's likes leave the author's total here"""
+    stats = instance.__dict__.get("_saved_author_stats") or instance.author_stats()
+    if stats is not None:
+        likes = stats[2] if instance.pk in deleting_articles(origin) else 0
+        apply_author_stats((*stats[:2], likes), -1)
+
+
+@receiver(post_save, sender=Comment)
+def count_user_comment(sender, instance, created, **kwargs):
+    if created:
+        UserProfile.adjust_stats(instance.user_id, comments_count=1)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_user_comment(sender, instance, origin=None, **kwargs):
+    if instance.article_id not in deleting_articles(origin):
+        UserProfile.adjust_stats(instance.user_id, comments_count=-1)
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def refresh_search_vector_on_tags_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Tag names are part of the search vector, so re-index when they change"""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    response_cache.bump("articles", "tags")
+    if not reverse:
+        update_search_vectors([instance.pk])
+    elif pk_set:
+        update_search_vectors(pk_set)
+
+
+@receiver(post_save, sender=Tag)
+def refresh_search_vector_on_tag_rename(sender, instance, created, **kwargs):
+    response_cache.bump("articles", "tags")
+    if not created:
+        update_search_vectors(instance.articles.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_article_responses(sender, instance, **kwargs):
+    response_cache.bump("articles", "tags", f"article:{instance.pk}")
+
+
+@receiver(post_save, sender=Comment)
+def invalidate_comment_responses(sender, instance, created, **kwargs):
+    """Edits are not covered by the engagement counter receivers"""
+    if not created:
+        response_cache.bump(f"article:{instance.article_id}")
+
+
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_responses(sender, instance, **kwargs):
+    response_cache.bump("articles", "tags")
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_cache(sender, instance, **kwargs):
+    tag_cache.invalidate()
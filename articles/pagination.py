@@ -0,0 +1,44 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class ArticleCursorPagination(CursorPagination):
+    """Keyset pagination over (published_at, id)"""
+    ordering = ("-published_at", "-id")
+
+
+class BookmarkCursorPagination(CursorPagination):
+    """Keyset pagination over (created_at, id)"""
+    ordering = ("-created_at", "-id")
+
+
+class OptInCursorPagination(PageNumberPagination):
+    """Page-number pagination unless the client asks for a cursor
+
+    Clients opt in with ?pagination=cursor on the first request and then
+    follow the ``next``/``previous`` links, which carry ?cursor=. Cursor
+    pages skip the COUNT(*) and seek on an index instead of using OFFSET.
+    """
+    cursor_class = None
+
+    def uses_cursor(self, request):
+        return "cursor" in request.query_params or request.query_params.get("pagination") == "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.uses_cursor(request):
+            self.cursor_paginator = self.cursor_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class ArticleFeedPagination(OptInCursorPagination):
+    cursor_class = ArticleCursorPagination
+
+
+class BookmarkFeedPagination(OptInCursorPagination):
+    cursor_class = BookmarkCursorPagination
@@ -0,0 +1,13 @@
+from rest_framework.parsers import BaseParser
+
+
+class JSONLinesParser(BaseParser):
+    """Hand NDJSON bodies over as an iterator of raw lines, without buffering them"""
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return iter(stream.readline, b"")
+
+
+class JSONLParser(JSONLinesParser):
+    media_type = "application/jsonl"
@@ -0,0 +1,153 @@
+import re
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, Exists, F, Index, IntegerField, OuterRef, Q, Subquery, TextField, Value, When
+from django.db.models.functions import Coalesce, Greatest, Lower, StrIndex, Substr
+from django.utils.html import escape, format_html
+from rest_framework import filters, serializers
+
+# Private-use characters delimit headline matches; the serializer turns them into <mark> tags
+MATCH_START, MATCH_STOP = "\ue000", "\ue001"
+MATCH = re.compile(f"{MATCH_START}(.*?){MATCH_STOP}", re.DOTALL)
+
+
+def search_config():
+    return getattr(settings, "SEARCH_CONFIG", "english")
+
+
+def uses_full_text_search():
+    return connection.vendor == "postgresql"
+
+
+class SearchVectorIndex(GinIndex):
+    """GIN index on PostgreSQL, a plain index elsewhere so SQLite databases still build"""
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return Index.create_sql(self, model, schema_editor, **kwargs)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+
+def build_search_vector():
+    """Weighted tsvector expression: title (A), excerpt and tags (B), body text (C), author (D)"""
+    from .models import Tag
+
+    config = search_config()
+    tag_names = Tag.objects.filter(articles=OuterRef("pk")).order_by().values("articles").annotate(
+        names=StringAgg("name", delimiter=" ")
+    ).values("names")
+    author_name = User.objects.filter(pk=OuterRef("author_id")).values("username")
+
+    return (
+        SearchVector("title", weight="A", config=config)
+        + SearchVector("excerpt", weight="B", config=config)
+        + SearchVector(
+            Coalesce(Subquery(tag_names), Value(""), output_field=TextField()), weight="B", config=config
+        )
+        + SearchVector("plaintext", weight="C", config=config)
+        + SearchVector(
+            Coalesce(Subquery(author_name), Value(""), output_field=TextField()), weight="D", config=config
+        )
+    )
+
+
+def update_search_vectors(article_ids):
+    """Recompute the stored search vector for the given articles in one UPDATE"""
+    from .models import Article
+
+    article_ids = list(article_ids)
+    if not article_ids or not uses_full_text_search():
+        return
+    Article.objects.filter(pk__in=article_ids).update(search_vector=build_search_vector())
+
+
+class ArticleSearchFilter(filters.SearchFilter):
+    """Full-text article search ranked by relevance
+
+    On PostgreSQL this matches against the stored, GIN-indexed search_vector
+    and annotates ``search_rank`` and a highlighted ``search_snippet``. Other
+    databases fall back to case-insensitive matching with a field-weighted
+    rank so the endpoint behaves the same in development and tests.
+    """
+    snippet_length = 200
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        if uses_full_text_search():
+            return self.full_text_search(queryset, " ".join(terms))
+        return self.fallback_search(queryset, terms)
+
+    def full_text_search(self, queryset, text):
+        config = search_config()
+        query = SearchQuery(text, search_type="websearch", config=config)
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F("search_vector"), query),
+            search_snippet=SearchHeadline(
+                "plaintext", query, config=config, start_sel=MATCH_START, stop_sel=MATCH_STOP, max_words=35,
+                min_words=15,
+            ),
+        ).order_by("-search_rank", "-published_at", "-id")
+
+    def fallback_search(self, queryset, terms):
+        from .models import Tag
+
+        weights = {"title": 8, "excerpt": 4, "plaintext": 2, "author__username": 1}
+        rank = Value(0)
+        for term in terms:
+            tag_match = Exists(Tag.objects.filter(articles=OuterRef("pk"), name__icontains=term))
+            queryset = queryset.filter(
+                Q(title__icontains=term)
+                | Q(excerpt__icontains=term)
+                | Q(plaintext__icontains=term)
+                | Q(author__username__icontains=term)
+                | tag_match
+            )
+            for field, weight in weights.items():
+                rank = rank + Case(
+                    When(**{f"{field}__icontains": term}, then=Value(weight)),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            rank = rank + Case(When(tag_match, then=Value(4)), default=Value(0), output_field=IntegerField())
+
+        first_match = StrIndex(Lower("plaintext"), Value(terms[0].lower()))
+        return queryset.annotate(
+            search_rank=rank,
+            search_snippet=Substr("plaintext", Greatest(first_match - 60, Value(1)), self.snippet_length),
+        ).order_by("-search_rank", "-published_at", "-id")
+
+
+def snippet_html(snippet):
+    """HTML for a search snippet: the plaintext escaped, with only the matched terms wrapped in <mark>
+
+    The stored plaintext is unescaped text (``&lt;img&gt;`` in the content is
+    ``<img>`` there), so it must never be sent as markup as it is.
+    """
+    def text(part):
+        return escape(part.replace(MATCH_START, "").replace(MATCH_STOP, ""))
+
+    parts, end = [], 0
+    for match in MATCH.finditer(snippet):
+        parts.append(text(snippet[end:match.start()]))
+        parts.append(format_html("<mark>{}</mark>", text(match.group(1))))
+        end = match.end()
+    parts.append(text(snippet[end:]))
+    return "".join(parts)
+
+
+class SearchSnippetField(serializers.CharField):
+    """Read-only search snippet, safe to render as HTML"""
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return snippet_html(str(value))
@@ -0,0 +1,288 @@
+import csv
+import io
+import math
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from accounts.models import UserProfile
+from accounts.stats import recount_user_stats
+from .models import Article, ArticleLike, Bookmark, Comment, Tag
+from .search import update_search_vectors
+
+WORDS = (
+    "api cache database django python query index latency request response server client model view "
+    "serializer token schema migration deploy scale shard replica queue worker thread async stream "
+    "payload benchmark profile memory cpu network socket protocol header cookie session router "
+    "template static media upload image search rank vector signal middleware pagination cursor "
+    "feature release bug fix refactor test coverage pipeline container cluster node metric alert"
+).split()
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Kumar", "Novak", "Okafor", "Silva", "Muller", "Sato", "Haddad"]
+LOCATIONS = ["New York", "London", "Tokyo", "Paris", "Berlin", "Lagos", "Sao Paulo", "Bangalore", ""]
+TAG_NAMES = [
+    "python", "django", "javascript", "react", "technology", "tutorial", "news", "ai", "webdev",
+    "database", "devops", "security", "performance", "career", "opinion", "rust", "go", "cloud",
+]
+COMMENTS = [
+    "Great article! Very helpful.", "Thanks for sharing this.", "I learned a lot from this post.",
+    "Could you elaborate more on this topic?", "This is exactly what I was looking for!",
+    "I disagree with the second point.", "Benchmarks or it didn't happen.", "Same here.", "+1",
+]
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk inserts keep the auto_now/auto_now_add values they were given"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class RowWriter:
+    """Buffered inserts of plain rows, via COPY on PostgreSQL and bulk_create elsewhere"""
+
+    def __init__(self, model, fields, chunk_size):
+        self.model = model
+        self.fields = fields
+        self.chunk_size = chunk_size
+        self.rows = []
+        self.written = 0
+        self.use_copy = connection.vendor == "postgresql"
+
+    def add(self, *row):
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        if self.use_copy:
+            self.copy(self.rows)
+        else:
+            self.model.objects.bulk_create(
+                [self.model(**dict(zip(self.fields, row))) for row in self.rows], batch_size=self.chunk_size
+            )
+        self.written += len(self.rows)
+        self.rows = []
+
+    def copy(self, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(value.isoformat() if hasattr(value, "isoformat") else value for value in row)
+        buffer.seek(0)
+        columns = ", ".join(
+            connection.ops.quote_name(self.model._meta.get_field(field).column) for field in self.fields
+        )
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+class VolumeSeeder:
+    """Deterministic, production-shaped dataset generator
+
+    Article popularity follows a Zipf law with exponent ``likes_zipf``: a few
+    articles collect most likes, views and comments, and a few comments grow
+    long reply threads. The same ``seed`` always produces the same rows
+    (timestamps are relative to the time of the run). Rows are generated and
+    written in chunks, so memory stays flat regardless of volume.
+    """
+
+    def __init__(self, users, articles, comments_per_article=5, likes=None, likes_zipf=1.1, seed=42,
+                 chunk_size=5000, days=365, log=None):
+        self.n_users = users
+        self.n_articles = articles
+        self.comments_per_article = comments_per_article
+        self.n_likes = likes if likes is not None else articles * 10
+        self.zipf = likes_zipf
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.days = days
+        self.log = log or (lambda message: None)
+        self.rng = random.Random(seed)
+        self.now = timezone.now()
+        self.prefix = f"seed{seed}_"
+
+    def run(self):
+        with explicit_timestamps(UserProfile, Article, Comment, ArticleLike, Bookmark):
+            user_ids = self.seed_users()
+            tag_ids = self.seed_tags()
+            self.seed_articles(user_ids, tag_ids)
+        # Rows were bulk inserted without signals, so derive the profile statistics once
+        recount_user_stats(self.chunk_size)
+        self.log("✓ Counted profile statistics")
+
+    def seed_users(self):
+        password = make_password("password")
+        user_ids = []
+        for start in range(0, self.n_users, self.chunk_size):
+            users = []
+            for i in range(start, min(start + self.chunk_size, self.n_users)):
+                first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+                users.append(User(
+                    username=f"{self.prefix}{i}",
+                    email=f"{self.prefix}{i}@example.com",
+                    first_name=first,
+                    last_name=last,
+                    password=password,
+                    date_joined=self.now - timedelta(days=self.rng.uniform(0, self.days * 2)),
+                ))
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                # bulk_create skips the post_save signal that creates profiles
+                UserProfile.objects.bulk_create([
+                    UserProfile(
+                        user_id=user.pk,
+                        location=self.rng.choice(LOCATIONS),
+                        created_at=user.date_joined,
+                        updated_at=user.date_joined,
+                    )
+                    for user in users
+                ])
+            user_ids.extend(user.pk for user in users)
+        self.log(f"✓ Created {len(user_ids)} users with profiles")
+        return user_ids
+
+    def seed_tags(self):
+        Tag.objects.bulk_create([Tag(name=name, slug=name) for name in TAG_NAMES], ignore_conflicts=True)
+        tag_ids = list(Tag.objects.filter(name__in=TAG_NAMES).order_by("name").values_list("pk", flat=True))
+        self.log(f"✓ Ensured {len(tag_ids)} tags")
+        return tag_ids
+
+    def zipf_weights(self, n, exponent):
+        weights = [1 / (rank ** exponent) for rank in range(1, n + 1)]
+        total = sum(weights)
+        return [weight / total for weight in weights]
+
+    def seed_articles(self, user_ids, tag_ids):
+        # Popularity rank is independent of insertion order and author
+        ranks = list(range(self.n_articles))
+        self.rng.shuffle(ranks)
+        like_share = self.zipf_weights(self.n_articles, self.zipf)
+        comment_share = self.zipf_weights(self.n_articles, self.zipf * 0.8)
+        total_comments = self.comments_per_article * self.n_articles
+        # A handful of prolific authors write most articles
+        author_weights = list(accumulate(self.zipf_weights(len(user_ids), 0.9)))
+        tag_weights = list(accumulate(self.zipf_weights(len(tag_ids), 0.7)))
+
+        tag_rows = RowWriter(Article.tags.through, ["article_id", "tag_id"], self.chunk_size)
+        likes = RowWriter(ArticleLike, ["article_id", "user_id", "created_at"], self.chunk_size)
+        bookmarks = RowWriter(Bookmark, ["article_id", "user_id", "created_at"], self.chunk_size)
+        comments = 0
+
+        for start in range(0, self.n_articles, self.chunk_size):
+            plans = []
+            articles = []
+            for i in range(start, min(start + self.chunk_size, self.n_articles)):
+                rank = ranks[i]
+                n_likes = min(len(user_ids), round(self.n_likes * like_share[rank]))
+                n_comments = round(total_comments * comment_share[rank])
+                n_bookmarks = min(len(user_ids), n_likes // 4)
+                published_at = self.now - timedelta(days=self.days * self.rng.random() ** 2)
+                article = Article(
+                    title=self.title(i),
+                    content=self.body(),
+                    author_id=self.rng.choices(user_ids, cum_weights=author_weights)[0],
+                    published_at=published_at,
+                    updated_at=published_at,
+                    is_published=self.rng.random() > 0.03,
+                    views_count=n_likes * self.rng.randint(5, 40) + self.rng.randint(0, 50),
+                    likes_count=n_likes,
+                    comments_count=n_comments,
+                    bookmarks_count=n_bookmarks,
+                )
+                article.slug = f"{slugify(article.title)[:200]}-{self.seed}-{i}"
+                article.prepare_content(sanitize=False)
+                articles.append(article)
+                plans.append((n_likes, n_comments, n_bookmarks))
+
+            with transaction.atomic():
+                Article.objects.bulk_create(articles, batch_size=self.chunk_size)
+                for article, (n_likes, n_comments, n_bookmarks) in zip(articles, plans):
+                    k = self.rng.randint(1, 4)
+                    for tag_id in {self.rng.choices(tag_ids, cum_weights=tag_weights)[0] for _ in range(k)}:
+                        tag_rows.add(article.pk, tag_id)
+                    for user_id in self.rng.sample(user_ids, n_likes):
+                        likes.add(article.pk, user_id, self.after(article.published_at))
+                    for user_id in self.rng.sample(user_ids, n_bookmarks):
+                        bookmarks.add(article.pk, user_id, self.after(article.published_at))
+                comments += self.seed_comments(articles, plans, user_ids)
+                tag_rows.flush()
+                likes.flush()
+                bookmarks.flush()
+                update_search_vectors([article.pk for article in articles])
+            self.log(f"  … {start + len(articles)}/{self.n_articles} articles")
+
+        self.log(f"✓ Created {self.n_articles} articles, {tag_rows.written} tag links")
+        self.log(f"✓ Created {comments} comments, {likes.written} likes, {bookmarks.written} bookmarks")
+
+    def seed_comments(self, articles, plans, user_ids):
+        top_level = []
+        reply_plans = []
+        for article, (_, n_comments, _) in zip(articles, plans):
+            n_replies = int(n_comments * 0.4)
+            threads = []
+            for _ in range(n_comments - n_replies):
+                comment = self.comment(article, user_ids, self.after(article.published_at))
+                top_level.append(comment)
+                threads.append(comment)
+            if threads and n_replies:
+                reply_plans.append((article, threads, n_replies))
+        Comment.objects.bulk_create(top_level, batch_size=self.chunk_size)
+
+        # Heavy-tailed thread weights: most comments get no replies, a few get long threads
+        replies = []
+        for article, threads, n_replies in reply_plans:
+            weights = list(accumulate(self.rng.paretovariate(1.2) for _ in threads))
+            for _ in range(n_replies):
+                parent = self.rng.choices(threads, cum_weights=weights)[0]
+                reply = self.comment(article, user_ids, self.after(parent.created_at))
+                reply.parent_id = parent.pk
+                replies.append(reply)
+                if len(replies) >= self.chunk_size:
+                    Comment.objects.bulk_create(replies)
+                    replies = []
+        Comment.objects.bulk_create(replies)
+        return len(top_level) + sum(n_replies for _, _, n_replies in reply_plans)
+
+    def comment(self, article, user_ids, created_at):
+        return Comment(
+            article_id=article.pk,
+            user_id=self.rng.choice(user_ids),
+            content=self.rng.choice(COMMENTS),
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+    def after(self, moment):
+        """A random time between ``moment`` and now, biased towards ``moment``"""
+        span = (self.now - moment).total_seconds()
+        return moment + timedelta(seconds=span * self.rng.random() ** 3)
+
+    def title(self, i):
+        words = self.rng.sample(WORDS, self.rng.randint(3, 8))
+        return f"{' '.join(words).capitalize()} #{self.seed}-{i}"
+
+    def body(self):
+        n_words = min(5000, max(30, int(self.rng.lognormvariate(math.log(600), 0.6))))
+        words = self.rng.choices(WORDS, k=n_words)
+        paragraphs = [" ".join(words[i:i + 80]) for i in range(0, n_words, 80)]
+        return "".join(f"<p>{paragraph.capitalize()}.</p>" for paragraph in paragraphs)
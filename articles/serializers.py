@@ -1,72 +1,99 @@
-def get_likes_count(self, obj):
-        return obj.likes.count()
+from django.contrib.auth.models import User
+from django.db import models
+from rest_framework import serializers
+from blog_api.images import RenditionsField
+from .models import Article, Comment, Tag, ArticleLike, Bookmark
+from .search import SearchSnippetField
+from .tags import get_or_create_tags
+from .viewer import get_viewer_state
+
+
+class TagSerializer(serializers.ModelSerializer):
+    """Serializer for tags"""
+    articles_count = serializers.IntegerField(read_only=True)
     
-    def get_comments_count(self, obj):
-        return obj.comments.count()
+    class Meta:
+        model = Tag
+        fields = ["id", "name", "slug", "description", "articles_count", "created_at"]
+        read_only_fields = ["slug", "created_at"]
+
+
+class ViewerStateListSerializer(serializers.ListSerializer):
+    """List serializer that resolves is_liked/is_bookmarked for the whole page at once"""
+    article_id_attr = "pk"
+    
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        state = get_viewer_state(self.context.get("request"))
+        if state is not None:
+            state.load(getattr(item, self.article_id_attr) for item in items)
+        return super().to_representation(items)
+
+
+class BookmarkListSerializer(ViewerStateListSerializer):
+    article_id_attr = "article_id"
+
+
+class ViewerStateMixin:
+    """is_liked/is_bookmarked answered from the request's ViewerState"""
     
     def get_is_liked(self, obj):
-        request = self.context.get("request")
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(user=request.user).exists()
-        return False
+        state = get_viewer_state(self.context.get("request"))
+        return state is not None and state.is_liked(obj.pk)
     
     def get_is_bookmarked(self, obj):
-        request = self.context.get("request")
-        if request and request.user.is_authenticated:
-            return obj.bookmarks.filter(user=request.user).exists()
-        return False
+        state = get_viewer_state(self.context.get("request"))
+        return state is not None and state.is_bookmarked(obj.pk)
+
+
+class AuthorSerializer(serializers.ModelSerializer):
+    """Lightweight serializer for article and comment authors"""
+    avatar = serializers.ImageField(source="profile.avatar", read_only=True)
+    avatar_renditions = RenditionsField(source="profile.avatar")
+    
+    class Meta:
+        model = User
+        fields = ["id", "username", "first_name", "last_name", "avatar", "avatar_renditions"]
+
+
+class ArticleListSerializer(ViewerStateMixin, serializers.ModelSerializer):
+    """Serializer for article lists"""
+    author = AuthorSerializer(read_only=True)
+    tags = TagSerializer(many=True, read_only=True)
+    is_liked = serializers.SerializerMethodField()
+    is_bookmarked = serializers.SerializerMethodField()
+    search_rank = serializers.FloatField(read_only=True)
+    search_snippet = SearchSnippetField()
+    featured_image_renditions = RenditionsField(source="featured_image")
     
-    def get_read_time(self, obj):
-        """Calculate estimated reading time in minutes"""
-        words_per_minute = 200
-        word_count = len(obj.content.split())
-        minutes = word_count // words_per_minute
-        return max(1, minutes)
+    class Meta:
+        model = Article
+        fields = [
+            "id", "slug", "title", "excerpt", "featured_image", "featured_image_renditions", "published_at",
+            "updated_at", "author", "tags", "views_count", "likes_count",
+            "comments_count", "bookmarks_count", "is_liked", "is_bookmarked",
+            "read_time", "is_published", "search_rank", "search_snippet"
+        ]
+        list_serializer_class = ViewerStateListSerializer
 
 
-class ArticleDetailSerializer(serializers.ModelSerializer):
+class ArticleDetailSerializer(ViewerStateMixin, serializers.ModelSerializer):
     """Serializer for detailed article view"""
     author = AuthorSerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     is_bookmarked = serializers.SerializerMethodField()
-    read_time = serializers.SerializerMethodField()
+    featured_image_renditions = RenditionsField(source="featured_image")
     
     class Meta:
         model = Article
         fields = [
-            "id", "slug", "title", "content", "excerpt", "featured_image",
+            "id", "slug", "title", "content", "excerpt", "featured_image", "featured_image_renditions",
             "published_at", "updated_at", "author", "tags", "views_count",
-            "likes_count", "comments_count", "is_liked", "is_bookmarked",
-            "read_time", "is_published"
+            "likes_count", "comments_count", "bookmarks_count", "is_liked",
+            "is_bookmarked", "read_time", "is_published"
         ]
         read_only_fields = ["slug", "published_at", "views_count"]
-    
-    def get_likes_count(self, obj):
-        return obj.likes.count()
-    
-    def get_comments_count(self, obj):
-        return obj.comments.count()
-    
-    def get_is_liked(self, obj):
-        request = self.context.get("request")
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(user=request.user).exists()
-        return False
-    
-    def get_is_bookmarked(self, obj):
-        request = self.context.get("request")
-        if request and request.user.is_authenticated:
-            return obj.bookmarks.filter(user=request.user).exists()
-        return False
-    
-    def get_read_time(self, obj):
-        words_per_minute = 200
-        word_count = len(obj.content.split())
-        minutes = word_count // words_per_minute
-        return max(1, minutes)
 
 
 class ArticleWriteSerializer(serializers.ModelSerializer):
@@ -100,13 +127,7 @@ class ArticleWriteSerializer(serializers.ModelSerializer):
         article = Article.objects.create(author=self.context["request"].user, **validated_data)
         
         if tag_names:
-            tags = []
-            for name in tag_names:
-                name = name.strip().lower()
-                if name:
-                    tag, _ = Tag.objects.get_or_create(name=name)
-                    tags.append(tag)
-            article.tags.set(tags)
+            article.tags.set(get_or_create_tags(tag_names).values())
         
         return article
     
@@ -118,17 +139,24 @@ class ArticleWriteSerializer(serializers.ModelSerializer):
         instance.save()
         
         if tag_names is not None:
-            tags = []
-            for name in tag_names:
-                name = name.strip().lower()
-                if name:
-                    tag, _ = Tag.objects.get_or_create(name=name)
-                    tags.append(tag)
-            instance.tags.set(tags)
+            instance.tags.set(get_or_create_tags(tag_names).values())
         
         return instance
 
 
+class ArticleImportSerializer(ArticleWriteSerializer):
+    """Validates one record of a bulk article import
+
+    Title uniqueness is checked for the whole chunk at once by the importer.
+    """
+    
+    class Meta(ArticleWriteSerializer.Meta):
+        fields = ["title", "content", "excerpt", "tags", "is_published"]
+    
+    def validate_title(self, value):
+        return value
+
+
 class CommentSerializer(serializers.ModelSerializer):
     """Serializer for comments"""
     user = AuthorSerializer(read_only=True)
@@ -143,6 +171,8 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ["created_at", "updated_at", "is_edited"]
     
     def get_replies_count(self, obj):
+        if hasattr(obj, "num_replies"):
+            return obj.num_replies
         return obj.replies.count()
     
     def validate_parent(self, value):
@@ -166,18 +196,22 @@ class CommentDetailSerializer(serializers.ModelSerializer):
     """Serializer for comment with replies"""
     user = AuthorSerializer(read_only=True)
     replies = serializers.SerializerMethodField()
+    replies_count = serializers.IntegerField(source="num_replies", read_only=True)
+    replies_next = serializers.CharField(read_only=True)
     
     class Meta:
         model = Comment
         fields = [
             "id", "content", "created_at", "updated_at", "user",
-            "parent", "is_edited", "replies"
+            "parent", "is_edited", "replies", "replies_count", "replies_next"
         ]
         read_only_fields = ["created_at", "updated_at", "is_edited"]
     
     def get_replies(self, obj):
+        if hasattr(obj, "thread_replies"):
+            return CommentSerializer(obj.thread_replies, many=True, context=self.context).data
         if obj.parent is None:
-            replies = obj.replies.all()
+            replies = obj.replies.select_related("user", "user__profile")
             return CommentSerializer(replies, many=True, context=self.context).data
         return []
 
@@ -199,4 +233,5 @@ class BookmarkSerializer(serializers.ModelSerializer):
     class Meta:
         model = Bookmark
         fields = ["id", "article", "created_at"]
-        read_only_fields = ["created_at"]
\ No newline at end of file
+        read_only_fields = ["created_at"]
+        list_serializer_class = BookmarkListSerializer
\ No newline at end of file
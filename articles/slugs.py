@@ -0,0 +1,89 @@
+import re
+from collections import defaultdict
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, IntegerField, Max, Q, When
+from django.db.models.functions import Cast, Substr
+from django.utils.text import slugify
+
+SAVE_ATTEMPTS = 5
+BULK_CHUNK = 100
+
+
+def base_slug(model, text):
+    max_length = model._meta.get_field("slug").max_length
+    return slugify(text)[:max_length].strip("-") or model._meta.model_name
+
+
+def with_suffix(model, base, suffix):
+    if not suffix:
+        return base
+    max_length = model._meta.get_field("slug").max_length
+    tail = f"-{suffix}"
+    return base[:max_length - len(tail)] + tail
+
+
+def allocate_slug(model, text):
+    """Next free slug for ``text``, found with a single aggregate query
+
+    ``base`` is returned when it is free, otherwise ``base-N`` with N one past
+    the highest suffix in use. The result can still be taken by a concurrent
+    writer; save_with_slug() retries on the unique constraint.
+    """
+    base = base_slug(model, text)
+    numbered = Q(slug__regex=rf"^{re.escape(base)}-[0-9]{{1,9}}$")
+    suffix = Cast(Substr("slug", len(base) + 2), IntegerField())
+    taken = model._default_manager.filter(Q(slug=base) | numbered).aggregate(
+        base_taken=Count("pk", filter=Q(slug=base)),
+        max_suffix=Max(Case(When(numbered, then=suffix), output_field=IntegerField())),
+    )
+    if not taken["base_taken"]:
+        return base
+    return with_suffix(model, base, (taken["max_suffix"] or 0) + 1)
+
+
+def allocate_slugs(model, texts):
+    """Free, mutually distinct slugs for a batch of new rows, in input order
+
+    Existing slugs for every base in the batch are read in one query per
+    ``BULK_CHUNK`` bases, instead of one round-trip per collision.
+    """
+    bases = [base_slug(model, text) for text in texts]
+    unique_bases = list(dict.fromkeys(bases))
+    taken = set()
+    max_suffix = defaultdict(int)
+    for start in range(0, len(unique_bases), BULK_CHUNK):
+        chunk = unique_bases[start:start + BULK_CHUNK]
+        pattern = rf"^({'|'.join(map(re.escape, chunk))})-[0-9]{{1,9}}$"
+        existing = model._default_manager.filter(Q(slug__in=chunk) | Q(slug__regex=pattern)).values_list(
+            "slug", flat=True
+        )
+        for slug in existing:
+            base, _, number = slug.rpartition("-")
+            taken.add(slug)
+            if number.isdigit() and base in chunk:
+                max_suffix[base] = max(max_suffix[base], int(number))
+
+    # One title's base can equal another's numbered slug ("a-2" vs the third "a")
+    slugs = []
+    for base in bases:
+        slug = base
+        while slug in taken:
+            max_suffix[base] += 1
+            slug = with_suffix(model, base, max_suffix[base])
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def save_with_slug(instance, text, save):
+    """Allocate a slug for ``instance`` and ``save()``, retrying on slug collisions"""
+    model = type(instance)
+    for attempt in range(1, SAVE_ATTEMPTS + 1):
+        instance.slug = allocate_slug(model, text)
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            # Only a concurrent writer taking the same slug is worth retrying
+            if attempt == SAVE_ATTEMPTS or not model._default_manager.filter(slug=instance.slug).exists():
+                raise
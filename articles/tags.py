@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from .cache import response_cache
+from .slugs import allocate_slugs
+
+
+def normalize_tag_name(name):
+    return name.strip().lower()
+
+
+def normalize_tag_names(names):
+    """Normalized, de-duplicated tag names in first-seen order, blanks dropped"""
+    return list(dict.fromkeys(name for name in map(normalize_tag_name, names) if name))
+
+
+class TagCache:
+    """Process-local map of normalized tag name -> tag ids
+
+    The whole vocabulary is loaded on first use when it fits in
+    ``TAG_CACHE_SIZE``; a name missing from a complete load is known not to
+    exist. Larger vocabularies degrade to a bounded LRU filled per lookup.
+    Tag signals clear the local copy immediately, and ``TAG_CACHE_TTL``
+    bounds how long another process can serve a renamed or deleted tag.
+    Names map to several ids only for case variants created outside the API.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._complete = False
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return getattr(settings, "TAG_CACHE_SIZE", 5000)
+
+    @property
+    def ttl(self):
+        return getattr(settings, "TAG_CACHE_TTL", 60)
+
+    def _fetch(self, names=None):
+        """Load {normalized name: ids} for the given names, or the first max_size + 1 tags"""
+        from .models import Tag
+
+        tags = Tag.objects.order_by("pk")
+        if names is None:
+            tags = tags[:self.max_size + 1]
+        else:
+            tags = tags.filter(reduce(or_, (Q(name__iexact=name) for name in names)))
+        found = {}
+        rows = 0
+        for pk, name in tags.values_list("pk", "name"):
+            found.setdefault(normalize_tag_name(name), []).append(pk)
+            rows += 1
+        return {name: tuple(ids) for name, ids in found.items()}, rows
+
+    def resolve(self, names):
+        """Map each existing normalized name to its tag ids; unknown names are left out"""
+        names = normalize_tag_names(names)
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+                entries, rows = self._fetch()
+                self._complete = rows <= self.max_size
+                self._entries = OrderedDict(entries if self._complete else {})
+                self._loaded_at = time.monotonic()
+
+            found = {}
+            missing = []
+            for name in names:
+                if name in self._entries:
+                    self._entries.move_to_end(name)
+                    found[name] = self._entries[name]
+                elif not self._complete:
+                    missing.append(name)
+
+        if missing:
+            fetched, _ = self._fetch(missing)
+            self.add(fetched)
+            found.update(fetched)
+        return found
+
+    def add(self, mapping):
+        """Record tags created by this process (bulk inserts send no signals)"""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            for name, ids in mapping.items():
+                self._entries[name] = tuple(ids)
+                self._entries.move_to_end(name)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._complete = False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._complete = False
+            self._loaded_at = None
+
+    def invalidate(self):
+        """Drop the local copy now and again once the current transaction commits"""
+        self.clear()
+        transaction.on_commit(self.clear)
+
+
+tag_cache = TagCache()
+
+
+def get_or_create_tags(names):
+    """Map normalized tag names to ids, creating missing tags in one bulk insert"""
+    from .models import Tag
+
+    names = normalize_tag_names(names)
+    if not names:
+        return {}
+
+    tag_ids = {name: ids[0] for name, ids in tag_cache.resolve(names).items()}
+    missing = [name for name in names if name not in tag_ids]
+    if missing:
+        Tag.objects.bulk_create(
+            [Tag(name=name, slug=slug) for name, slug in zip(missing, allocate_slugs(Tag, missing))],
+            ignore_conflicts=True,
+        )
+        created = dict(Tag.objects.filter(name__in=missing).values_list("name", "pk"))
+        # A concurrent writer may have claimed one of the slugs; fall back to save()
+        for name in missing:
+            if name not in created:
+                created[name] = Tag.objects.get_or_create(name=name)[0].pk
+        tag_ids.update(created)
+        transaction.on_commit(lambda: tag_cache.add({name: (pk,) for name, pk in created.items()}))
+        # bulk_create sends no post_save, so invalidate tag listings here
+        response_cache.bump("tags")
+    return tag_ids
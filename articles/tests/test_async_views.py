@@ -0,0 +1,78 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from articles.async_views import AsyncReadView
+from articles.models import Article, Comment, Tag
+from articles.pagination import ArticleCursorPagination
+
+
+class AsyncReadViewTests(TestCase):
+    """The async read endpoints answer without the DRF view and return the same bodies"""
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user("writer", password="Writer-pass-0!")
+        reader = User.objects.create_user("reader", password="Reader-pass-0!")
+        cls.tag = Tag.objects.create(name="gardening")
+        articles = [
+            Article.objects.create(title=f"Async article {i}", content=f"Body number {i}", author=author)
+            for i in range(3)
+        ]
+        cls.article = articles[0]
+        cls.article.tags.add(cls.tag)
+        comment = Comment.objects.create(article=cls.article, user=reader, content="A comment")
+        Comment.objects.create(article=cls.article, user=author, content="A reply", parent=comment)
+
+    def setUp(self):
+        cache.clear()
+
+    def paths(self):
+        return [
+            "/api/articles/",
+            "/api/articles/?pagination=cursor",
+            f"/api/articles/{self.article.pk}/",
+            f"/api/articles/{self.article.pk}/comments/",
+            "/api/tags/",
+            f"/api/tags/{self.tag.pk}/articles/",
+        ]
+
+    def without_views(self, body):
+        # Every read of the detail adds a view
+        return {key: value for key, value in body.items() if key != "views_count"}
+
+    async def test_reads_are_served_without_the_drf_view(self):
+        with mock.patch.object(AsyncReadView, "call_fallback", side_effect=AssertionError("fell back")):
+            for path in self.paths():
+                with self.subTest(path):
+                    response = await self.async_client.get(path, secure=True)
+
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(response["X-Cache"], "MISS")
+
+    async def test_bodies_match_the_drf_view(self):
+        for path in self.paths():
+            with self.subTest(path):
+                served = await self.async_client.get(path, secure=True)
+                await cache.aclear()
+                with mock.patch.object(AsyncReadView, "accepts", return_value=False):
+                    fallback = await self.async_client.get(path, secure=True)
+
+                self.assertEqual(self.without_views(served.json()), self.without_views(fallback.json()))
+
+    async def test_missing_objects_fall_back_to_a_404(self):
+        response = await self.async_client.get("/api/articles/999999/", secure=True)
+
+        self.assertEqual(response.status_code, 404)
+
+    async def test_cursor_pages_follow_next_links(self):
+        titles = []
+        with mock.patch.object(ArticleCursorPagination, "page_size", 2), \
+                mock.patch.object(AsyncReadView, "call_fallback", side_effect=AssertionError("fell back")):
+            path = "/api/articles/?pagination=cursor"
+            while path:
+                page = (await self.async_client.get(path, secure=True)).json()
+                titles += [article["title"] for article in page["results"]]
+                path = page["next"]
+
+        self.assertEqual(titles, [f"Async article {i}" for i in (2, 1, 0)])
@@ -0,0 +1,69 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from articles.counters import view_counter
+from articles.models import Article
+
+
+class ConditionalGetTests(TestCase):
+    """ETag and Last-Modified validators answer repeat reads with 304 Not Modified"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("writer", password="Writer-pass-0!")
+        cls.staff = User.objects.create_user("editor", password="Editor-pass-0!", is_staff=True)
+        cls.article = Article.objects.create(title="Published article", content="Out in the open",
+                                             author=cls.author)
+        cls.draft = Article.objects.create(title="Draft article", content="Not out yet", author=cls.author,
+                                           is_published=False)
+
+    def setUp(self):
+        cache.clear()
+
+    def views(self, article):
+        view_counter.flush()
+        return Article.objects.values_list("views_count", flat=True).get(pk=article.pk)
+
+    def test_matching_etag_gets_not_modified(self):
+        path = f"/api/articles/{self.article.pk}/"
+        etag = self.client.get(path, secure=True)["ETag"]
+
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag, secure=True)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.views(self.article), 2)
+
+    def test_writes_change_the_etag(self):
+        path = f"/api/articles/{self.article.pk}/"
+        etag = self.client.get(path, secure=True)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.filter(pk=self.article.pk).first().save()
+
+        self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=etag, secure=True).status_code, 200)
+
+    def test_forged_authorization_does_not_reveal_drafts(self):
+        response = self.client.get(
+            f"/api/articles/{self.draft.pk}/", HTTP_AUTHORIZATION="Bearer forged", HTTP_IF_NONE_MATCH="*",
+            secure=True,
+        )
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.views(self.draft), 0)
+
+    def test_anonymous_wildcard_does_not_reveal_drafts(self):
+        response = self.client.get(f"/api/articles/{self.draft.pk}/", HTTP_IF_NONE_MATCH="*", secure=True)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.views(self.draft), 0)
+
+    def test_staff_still_read_drafts(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.staff)}")
+
+        response = client.get(f"/api/articles/{self.draft.pk}/", secure=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], "Draft article")
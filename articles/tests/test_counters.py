@@ -0,0 +1,66 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from articles.models import Article, ArticleLike, Bookmark, Comment
+
+
+class EngagementCounterTests(TestCase):
+    """Stored like, comment and bookmark counters follow their rows"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("writer", password="Writer-pass-0!")
+        cls.readers = User.objects.bulk_create(User(username=f"reader{i}") for i in range(30))
+
+    def setUp(self):
+        self.article = Article.objects.create(title="Counted article", content="Body of the counted article",
+                                              author=self.author)
+
+    def counters(self):
+        return Article.objects.values_list("likes_count", "comments_count", "bookmarks_count").get(
+            pk=self.article.pk
+        )
+
+    def test_counters_follow_added_and_removed_rows(self):
+        like = ArticleLike.objects.create(article=self.article, user=self.readers[0])
+        Comment.objects.create(article=self.article, user=self.readers[0], content="First comment")
+        comment = Comment.objects.create(article=self.article, user=self.readers[1], content="Second comment")
+        Bookmark.objects.create(article=self.article, user=self.readers[1])
+        self.assertEqual(self.counters(), (1, 2, 1))
+
+        like.delete()
+        comment.delete()
+        self.assertEqual(self.counters(), (0, 1, 1))
+
+    def engage(self, article, readers):
+        ArticleLike.objects.bulk_create(ArticleLike(article=article, user=reader) for reader in readers)
+        Bookmark.objects.bulk_create(Bookmark(article=article, user=reader) for reader in readers)
+        Comment.objects.bulk_create(
+            Comment(article=article, user=reader, content=f"Comment by {reader.username}") for reader in readers
+        )
+
+    def delete_queries(self, article):
+        with CaptureQueriesContext(connection) as captured:
+            with self.captureOnCommitCallbacks(execute=True):
+                article.delete()
+        self.assertFalse(Article.objects.filter(pk=article.pk).exists())
+        return len(captured)
+
+    def test_deleting_an_article_skips_per_row_bookkeeping(self):
+        other = Article.objects.create(title="Busy article", content="Body of the busy article", author=self.author)
+        self.engage(self.article, self.readers[:2])
+        self.engage(other, self.readers)
+
+        self.assertEqual(self.delete_queries(Article.objects.get(pk=other.pk)),
+                         self.delete_queries(Article.objects.get(pk=self.article.pk)))
+
+    def test_deleting_a_user_still_updates_other_articles(self):
+        reader = self.readers[0]
+        ArticleLike.objects.create(article=self.article, user=reader)
+        Comment.objects.create(article=self.article, user=reader, content="A comment to go")
+        Bookmark.objects.create(article=self.article, user=reader)
+
+        reader.delete()
+
+        self.assertEqual(self.counters(), (0, 0, 0))
@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from articles.models import Article, ArticleLike, Bookmark
+
+ENDPOINTS = {
+    "like": (ArticleLike, "likes_count", "is_liked"),
+    "bookmark": (Bookmark, "bookmarks_count", "is_bookmarked"),
+}
+
+
+class EngagementEndpointTests(TestCase):
+    """POST toggles likes and bookmarks; PUT and DELETE set them idempotently"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("writer", password="Writer-pass-0!")
+        cls.reader = User.objects.create_user("reader", password="Reader-pass-0!")
+        cls.article = Article.objects.create(title="Engaging article", content="Worth a like", author=cls.author)
+        cls.draft = Article.objects.create(title="Draft article", content="Not out yet", author=cls.author,
+                                           is_published=False)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.reader)}")
+
+    def send(self, method, endpoint, article=None):
+        path = f"/api/articles/{(article or self.article).pk}/{endpoint}/"
+        return getattr(self.client, method)(path, secure=True)
+
+    def state(self, endpoint):
+        model, counter, _ = ENDPOINTS[endpoint]
+        return (
+            model.objects.filter(article=self.article, user=self.reader).count(),
+            Article.objects.values_list(counter, flat=True).get(pk=self.article.pk),
+        )
+
+    def test_put_is_idempotent(self):
+        for endpoint, (_, _, flag) in ENDPOINTS.items():
+            with self.subTest(endpoint):
+                statuses = [self.send("put", endpoint) for _ in range(2)]
+
+                self.assertEqual([response.status_code for response in statuses], [201, 200])
+                self.assertTrue(all(response.json()[flag] for response in statuses))
+                self.assertEqual(self.state(endpoint), (1, 1))
+
+    def test_delete_is_idempotent(self):
+        for endpoint, (_, _, flag) in ENDPOINTS.items():
+            with self.subTest(endpoint):
+                self.send("put", endpoint)
+
+                statuses = [self.send("delete", endpoint) for _ in range(2)]
+
+                self.assertEqual([response.status_code for response in statuses], [200, 200])
+                self.assertFalse(any(response.json()[flag] for response in statuses))
+                self.assertEqual(self.state(endpoint), (0, 0))
+
+    def test_post_toggles(self):
+        for endpoint, (_, _, flag) in ENDPOINTS.items():
+            with self.subTest(endpoint):
+                first, second = self.send("post", endpoint), self.send("post", endpoint)
+
+                self.assertEqual((first.status_code, first.json()[flag]), (201, True))
+                self.assertEqual((second.status_code, second.json()[flag]), (200, False))
+                self.assertEqual(self.state(endpoint), (0, 0))
+
+    def test_drafts_and_anonymous_users_are_refused(self):
+        for endpoint in ENDPOINTS:
+            with self.subTest(endpoint):
+                self.assertEqual(self.send("put", endpoint, self.draft).status_code, 404)
+                self.assertEqual(APIClient().put(f"/api/articles/{self.article.pk}/{endpoint}/", secure=True)
+                                 .status_code, 401)
+
+    def test_anonymous_comments_are_refused(self):
+        response = APIClient().post(
+            f"/api/articles/{self.article.pk}/add_comment/", {"content": "Who am I?"}, secure=True
+        )
+
+        self.assertEqual(response.status_code, 401)
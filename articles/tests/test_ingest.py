@@ -0,0 +1,99 @@
+import json
+from unittest import mock
+from django.contrib.auth.models import User
+from django.db import IntegrityError
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from articles.models import Article
+
+
+class BulkImportTests(TestCase):
+    """POST /api/articles/bulk/ imports NDJSON line by line and reports bad lines"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("editor", password="Editor-pass-0!", is_staff=True)
+        cls.reader = User.objects.create_user("reader", password="Reader-pass-0!")
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        return client
+
+    def post(self, lines, user=None, content_type="application/x-ndjson"):
+        body = "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines)
+        return self.client_for(user or self.staff).post(
+            "/api/articles/bulk/", body, content_type=content_type, secure=True
+        )
+
+    def record(self, title, **fields):
+        return {"title": title, "content": f"<p>Body of {title}</p>", **fields}
+
+    def test_valid_lines_are_created_and_bad_lines_reported(self):
+        response = self.post([
+            self.record("First import", tags=["News", "news"]),
+            "{not json",
+            '["not", "an", "object"]',
+            {"content": "No title here"},
+            "",
+            self.record("Second import", is_published=False),
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self.assertEqual((report["created"], report["failed"]), (2, 3))
+        self.assertEqual([error["line"] for error in report["errors"]], [2, 3, 4])
+        self.assertIn("title", report["errors"][2]["errors"])
+        first = Article.objects.get(title="First import")
+        self.assertEqual(list(first.tags.values_list("name", flat=True)), ["news"])
+        self.assertFalse(Article.objects.get(title="Second import").is_published)
+
+    def test_duplicate_titles_are_rejected(self):
+        Article.objects.create(title="Existing title", content="Already here", author=self.staff)
+
+        response = self.post([
+            self.record("existing TITLE"), self.record("Repeated"), self.record("repeated"),
+        ])
+
+        self.assertEqual(response.json()["created"], 1)
+        self.assertEqual([error["line"] for error in response.json()["errors"]], [1, 3])
+
+    def test_slugs_stay_distinct_within_a_batch(self):
+        Article.objects.create(title="Alpha", content="Already here", author=self.staff)
+
+        response = self.post([self.record("Alpha 1"), self.record("Alpha!")])
+
+        self.assertEqual(response.json()["created"], 2)
+        self.assertCountEqual(
+            Article.objects.filter(title__in=["Alpha 1", "Alpha!"]).values_list("slug", flat=True),
+            ["alpha-1", "alpha-2"],
+        )
+
+    def test_nothing_created_is_a_bad_request(self):
+        response = self.post(["{not json", {"title": "No content"}])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["failed"], 2)
+
+    def test_conflicts_are_reported_without_database_details(self):
+        conflict = IntegrityError('duplicate key value violates unique constraint "articles_article_slug_key"')
+        with mock.patch.object(Article.objects, "bulk_create", side_effect=conflict), \
+                mock.patch.object(Article, "save", side_effect=conflict):
+            with self.assertLogs("articles.ingest", "ERROR"):
+                response = self.post([self.record("Conflicted")])
+
+        self.assertEqual(response.status_code, 400)
+        message = response.json()["errors"][0]["errors"]["non_field_errors"][0]
+        self.assertNotIn("constraint", message)
+
+    def test_other_content_types_are_unsupported(self):
+        response = self.post([self.record("As JSON")], content_type="application/json")
+
+        self.assertEqual(response.status_code, 415)
+
+    def test_jsonl_content_type_is_accepted(self):
+        self.assertEqual(self.post([self.record("As JSONL")], content_type="application/jsonl").status_code, 201)
+
+    def test_only_staff_can_import(self):
+        self.assertEqual(self.post([self.record("Not allowed")], user=self.reader).status_code, 403)
@@ -0,0 +1,55 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from articles.models import Article, ArticleLike, LeaderboardEntry
+
+
+class LeaderboardTests(TestCase):
+    """Popular and trending lists read precomputed scores per window"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("writer", password="Writer-pass-0!")
+        cls.reader = User.objects.create_user("reader", password="Reader-pass-0!")
+        cls.quiet = Article.objects.create(title="Quiet article", content="Nobody reads this", author=cls.author)
+        cls.liked = Article.objects.create(title="Liked article", content="Everybody likes this", author=cls.author)
+        cls.draft = Article.objects.create(title="Draft article", content="Not out yet", author=cls.author,
+                                           is_published=False)
+
+    def setUp(self):
+        cache.clear()
+
+    def ranking(self, path, **params):
+        response = self.client.get(f"/api/articles/{path}/", params, secure=True)
+        self.assertEqual(response.status_code, 200)
+        return [article["id"] for article in response.json()]
+
+    def test_articles_without_events_are_listed(self):
+        self.assertCountEqual(self.ranking("popular"), [self.quiet.pk, self.liked.pk])
+
+    def test_likes_move_articles_up_the_trending_list(self):
+        ArticleLike.objects.create(article=self.liked, user=self.reader)
+
+        for window in ("day", "week", "all"):
+            self.assertEqual(self.ranking("trending", window=window)[0], self.liked.pk)
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(len(self.ranking("popular", limit=-1)), 1)
+        self.assertEqual(len(self.ranking("popular", limit=0)), 1)
+        self.assertEqual(len(self.ranking("popular", limit=500)), 2)
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in ({"limit": "many"}, {"window": "decade"}):
+            response = self.client.get("/api/articles/popular/", params, secure=True)
+            self.assertEqual(response.status_code, 400)
+
+    def test_rebuild_restores_missing_entries(self):
+        ArticleLike.objects.create(article=self.liked, user=self.reader)
+        LeaderboardEntry.objects.all().delete()
+
+        call_command("rebuild_leaderboards", stdout=StringIO())
+
+        self.assertEqual(LeaderboardEntry.objects.count(), 9)
+        self.assertEqual(self.ranking("trending")[0], self.liked.pk)
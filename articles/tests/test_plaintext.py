@@ -0,0 +1,54 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from articles.models import Article
+from articles.search import MATCH_START, MATCH_STOP, snippet_html
+
+
+class PlaintextTests(TestCase):
+    """Word count, read time, excerpt and search snippets come from the stored plaintext"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("writer", password="Writer-pass-0!")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_derived_fields_are_stored_on_save(self):
+        article = Article.objects.create(
+            title="Derived fields", content="<p>One two</p><p>three <strong>four</strong></p>", author=self.author
+        )
+
+        self.assertEqual(article.plaintext, "One two three four")
+        self.assertEqual(article.word_count, 4)
+        self.assertEqual(article.read_time, 1)
+        self.assertEqual(article.excerpt, "One two three four")
+
+    def test_entity_encoded_markup_is_not_returned_as_html(self):
+        Article.objects.create(
+            title="Entities",
+            content="<p>Careful with &lt;img src=x onerror=alert(1)&gt; in a post</p>",
+            author=self.author,
+        )
+
+        response = self.client.get("/api/articles/", {"search": "onerror"}, secure=True)
+
+        snippet = response.json()["results"][0]["search_snippet"]
+        self.assertNotIn("<img", snippet)
+        self.assertIn("&lt;img src=x onerror=alert(1)&gt;", snippet)
+
+
+class SnippetHtmlTests(SimpleTestCase):
+
+    def test_only_matches_become_marks(self):
+        snippet = f"<b>bold</b> {MATCH_START}term{MATCH_STOP} & <i>{MATCH_START}more"
+
+        self.assertEqual(
+            snippet_html(snippet), "&lt;b&gt;bold&lt;/b&gt; <mark>term</mark> &amp; &lt;i&gt;more"
+        )
+
+    def test_markup_inside_a_match_is_escaped(self):
+        self.assertEqual(
+            snippet_html(f"{MATCH_START}<script>{MATCH_STOP}"), "<mark>&lt;script&gt;</mark>"
+        )
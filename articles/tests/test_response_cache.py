@@ -0,0 +1,104 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from articles.models import Article, ArticleLike, Comment, Tag
+
+
+class ResponseCacheTests(TestCase):
+    """Anonymous GETs are served from the response cache until a write bumps their stamps"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("writer", password="Writer-pass-0!")
+        cls.reader = User.objects.create_user("reader", password="Reader-pass-0!")
+        cls.article = Article.objects.create(title="Cached article", content="Body of the cached article",
+                                             author=cls.author)
+        cls.tag = Tag.objects.create(name="gardening")
+        cls.article.tags.add(cls.tag)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, path):
+        response = self.client.get(path, secure=True)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assertCached(self, path):
+        self.get(path)
+        self.assertEqual(self.get(path)["X-Cache"], "HIT")
+
+    def write(self, action):
+        with self.captureOnCommitCallbacks(execute=True):
+            action()
+
+    def test_new_article_invalidates_the_list(self):
+        self.assertCached("/api/articles/")
+
+        self.write(lambda: Article.objects.create(title="Fresh article", content="Just written", author=self.author))
+
+        response = self.get("/api/articles/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertIn("Fresh article", [article["title"] for article in response.json()["results"]])
+
+    def test_edit_invalidates_the_detail(self):
+        path = f"/api/articles/{self.article.pk}/"
+        self.assertCached(path)
+
+        def edit():
+            self.article.title = "Edited article"
+            self.article.save()
+
+        self.write(edit)
+
+        self.assertEqual(self.get(path).json()["title"], "Edited article")
+
+    def test_engagement_invalidates_the_detail_and_comments(self):
+        detail, comments = f"/api/articles/{self.article.pk}/", f"/api/articles/{self.article.pk}/comments/"
+        self.assertCached(detail)
+        self.assertCached(comments)
+
+        self.write(lambda: ArticleLike.objects.create(article=self.article, user=self.reader))
+        self.write(lambda: Comment.objects.create(article=self.article, user=self.reader, content="Fresh comment"))
+
+        article = self.get(detail).json()
+        self.assertEqual((article["likes_count"], article["comments_count"]), (1, 1))
+        self.assertEqual(len(self.get(comments).json()["results"]), 1)
+
+    def test_comment_edit_invalidates_the_comments(self):
+        comment = Comment.objects.create(article=self.article, user=self.reader, content="First draft")
+        path = f"/api/articles/{self.article.pk}/comments/"
+        self.assertCached(path)
+
+        def edit():
+            comment.content = "Second draft"
+            comment.save()
+
+        self.write(edit)
+
+        self.assertEqual(self.get(path).json()["results"][0]["content"], "Second draft")
+
+    def test_tag_rename_invalidates_tags_and_articles(self):
+        self.assertCached("/api/tags/")
+        self.assertCached(f"/api/articles/{self.article.pk}/")
+
+        def rename():
+            self.tag.name = "horticulture"
+            self.tag.save()
+
+        self.write(rename)
+
+        self.assertIn("horticulture", [tag["name"] for tag in self.get("/api/tags/").json()["results"]])
+        self.assertIn("horticulture", str(self.get(f"/api/articles/{self.article.pk}/").json()["tags"]))
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        self.get("/api/articles/")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.reader)}")
+
+        response = client.get("/api/articles/", secure=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Cache", response)
@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from articles.models import Article, Tag
+
+
+class ArticleSearchTests(TestCase):
+    """?search= matches titles, bodies, tags and authors, best fields first (SQLite fallback)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user("gardener", password="Gardener-pass-0!")
+        cls.in_title = Article.objects.create(
+            title="Composting basics", content="How to start a heap in your garden", author=author
+        )
+        cls.in_body = Article.objects.create(
+            title="Spring chores", content="Turn the composting heap before planting", author=author
+        )
+        cls.tagged = Article.objects.create(title="Soil care", content="Mulch keeps the soil moist", author=author)
+        cls.tagged.tags.add(Tag.objects.create(name="composting-tips"))
+        cls.unrelated = Article.objects.create(title="Bird feeders", content="Seeds for the winter", author=author)
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, text):
+        response = self.client.get("/api/articles/", {"search": text}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def test_title_matches_rank_first(self):
+        ids = [result["id"] for result in self.search("composting")]
+
+        self.assertEqual(ids[0], self.in_title.pk)
+        self.assertCountEqual(ids, [self.in_title.pk, self.in_body.pk, self.tagged.pk])
+
+    def test_every_term_must_match(self):
+        self.assertEqual([result["id"] for result in self.search("composting planting")], [self.in_body.pk])
+
+    def test_matches_authors(self):
+        self.assertEqual(len(self.search("gardener")), 4)
+
+    def test_results_carry_rank_and_snippet(self):
+        result = self.search("heap")[0]
+
+        self.assertIn("search_rank", result)
+        self.assertIn("heap", result["search_snippet"])
@@ -0,0 +1,66 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase
+from articles import slugs
+from articles.models import Article, Tag
+from articles.slugs import allocate_slug, allocate_slugs
+
+
+class SlugAllocationTests(TestCase):
+    """Slugs are unique, numbered past the highest suffix in use and retried on conflicts"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("writer", password="Writer-pass-0!")
+
+    def create(self, title, **fields):
+        return Article.objects.create(title=title, content=f"Body of {title}", author=self.author, **fields)
+
+    def test_colliding_titles_get_numbered_slugs(self):
+        slugs = [self.create("Same title").slug for _ in range(3)]
+
+        self.assertEqual(slugs, ["same-title", "same-title-1", "same-title-2"])
+
+    def test_numbering_continues_past_the_highest_suffix(self):
+        self.create("Numbered", slug="numbered")
+        self.create("Numbered", slug="numbered-7")
+        # Not a numbered slug of "numbered"
+        self.create("Numbered", slug="numbered-draft")
+
+        self.assertEqual(self.create("Numbered").slug, "numbered-8")
+
+    def test_explicit_slugs_are_kept(self):
+        self.assertEqual(self.create("Anything", slug="chosen-slug").slug, "chosen-slug")
+
+    def test_suffixes_fit_the_field(self):
+        max_length = Tag._meta.get_field("slug").max_length
+        Tag.objects.create(name="t" * max_length)
+
+        slug = Tag.objects.create(name="t" * (max_length - 1) + "T").slug
+
+        self.assertEqual(len(slug), max_length)
+        self.assertTrue(slug.endswith("-1"))
+
+    def test_titles_without_slug_characters_fall_back_to_the_model_name(self):
+        self.assertEqual(self.create("!!!").slug, "article")
+
+    def test_slug_taken_by_a_concurrent_writer_is_retried(self):
+        self.create("Raced")
+        allocations = iter(["raced", "raced-1"])
+
+        with mock.patch.object(slugs, "allocate_slug", side_effect=lambda model, text: next(allocations)):
+            article = self.create("Raced")
+
+        self.assertEqual(article.slug, "raced-1")
+
+    def test_batches_get_distinct_slugs_in_input_order(self):
+        self.create("Batch")
+        self.create("Batch")
+
+        self.assertEqual(allocate_slugs(Article, ["Batch", "Other", "Batch"]), ["batch-2", "other", "batch-3"])
+        self.assertEqual(allocate_slug(Article, "Batch"), "batch-2")
+
+    def test_batch_bases_do_not_collide_with_numbered_slugs_in_the_same_batch(self):
+        self.create("Alpha")
+
+        self.assertEqual(allocate_slugs(Article, ["Alpha 1", "Alpha", "Alpha"]), ["alpha-1", "alpha-2", "alpha-3"])
@@ -0,0 +1,93 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from articles.models import Article, Tag
+from articles.tags import TagCache, get_or_create_tags, tag_cache
+
+
+class TagCacheTests(TestCase):
+    """Tag names resolve from a process-local cache that follows tag writes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tags = {name: Tag.objects.create(name=name) for name in ("python", "django", "rust")}
+
+    def setUp(self):
+        self.cache = TagCache()
+
+    def test_names_resolve_case_insensitively(self):
+        self.assertEqual(self.cache.resolve([" Python ", "DJANGO", "cobol"]), {
+            "python": (self.tags["python"].pk,), "django": (self.tags["django"].pk,),
+        })
+
+    def test_complete_vocabulary_answers_from_memory(self):
+        self.cache.resolve(["python"])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.cache.resolve(["rust", "cobol"]), {"rust": (self.tags["rust"].pk,)})
+
+    @override_settings(TAG_CACHE_SIZE=1)
+    def test_large_vocabularies_fall_back_to_lookups(self):
+        self.cache.resolve(["python"])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.cache.resolve(["rust"]), {"rust": (self.tags["rust"].pk,)})
+        self.assertEqual(len(self.cache._entries), 1)
+
+    @override_settings(TAG_CACHE_TTL=0)
+    def test_expired_copies_are_reloaded(self):
+        self.cache.resolve(["python"])
+        # bulk_create sends no signals, so only the TTL catches this tag
+        Tag.objects.bulk_create([Tag(name="go", slug="go")])
+
+        self.assertIn("go", self.cache.resolve(["go"]))
+
+    def test_signals_clear_the_shared_cache(self):
+        tag_cache.resolve(["python"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tag = self.tags["python"]
+            tag.name = "python3"
+            tag.save()
+
+        self.assertEqual(tag_cache.resolve(["python", "python3"]), {"python3": (tag.pk,)})
+
+    def test_get_or_create_tags_reuses_and_creates(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tag_ids = get_or_create_tags(["Django", "elixir", "elixir"])
+
+        self.assertEqual(tag_ids["django"], self.tags["django"].pk)
+        self.assertEqual(Tag.objects.get(name="elixir").pk, tag_ids["elixir"])
+        self.assertEqual(tag_cache.resolve(["elixir"]), {"elixir": (tag_ids["elixir"],)})
+
+
+class TagFilterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user("writer", password="Writer-pass-0!")
+        cls.tagged = Article.objects.create(title="Tagged", content="Has a tag", author=author)
+        cls.tag = Tag.objects.create(name="gardening")
+        cls.tagged.tags.add(cls.tag)
+        Article.objects.create(title="Untagged", content="Has no tag", author=author)
+
+    def setUp(self):
+        cache.clear()
+        tag_cache.clear()
+
+    def filtered(self, name):
+        response = self.client.get("/api/articles/", {"tags": name}, secure=True)
+        return [article["id"] for article in response.json()["results"]]
+
+    def test_filter_by_tag_name(self):
+        self.assertEqual(self.filtered("Gardening"), [self.tagged.pk])
+        self.assertEqual(self.filtered("unknown"), [])
+
+    def test_renamed_tags_filter_at_once(self):
+        self.filtered("gardening")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag.name = "horticulture"
+            self.tag.save()
+
+        self.assertEqual(self.filtered("horticulture"), [self.tagged.pk])
@@ -0,0 +1,70 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from articles.counters import ViewCounter
+from articles.models import Article
+
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=60, VIEW_COUNT_MAX_PENDING=1000)
+class ViewCounterTests(TestCase):
+    """Views are buffered per article and written in bulk on flush"""
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user("writer", password="Writer-pass-0!")
+        cls.first = Article.objects.create(title="First article", content="Body of the first article", author=author)
+        cls.second = Article.objects.create(title="Second article", content="Body of the second article", author=author)
+
+    def setUp(self):
+        self.counter = ViewCounter()
+        self.addCleanup(self.counter.shutdown)
+
+    def views(self, article):
+        return Article.objects.values_list("views_count", flat=True).get(pk=article.pk)
+
+    def test_views_are_buffered_until_flush(self):
+        for _ in range(3):
+            self.counter.incr(self.first.pk)
+        self.counter.incr(self.second.pk, 2)
+
+        self.assertEqual(self.views(self.first), 0)
+        self.assertEqual(self.counter.pending(self.first.pk), 3)
+
+        self.assertEqual(self.counter.flush(), 5)
+        self.assertEqual((self.views(self.first), self.views(self.second)), (3, 2))
+        self.assertEqual(self.counter.pending(self.first.pk), 0)
+        self.assertEqual(self.counter.flush(), 0)
+
+    @override_settings(VIEW_COUNT_MAX_PENDING=2)
+    def test_full_buffer_flushes_immediately(self):
+        self.counter.incr(self.first.pk)
+        self.assertEqual(self.views(self.first), 0)
+
+        self.counter.incr(self.second.pk)
+
+        self.assertEqual((self.views(self.first), self.views(self.second)), (1, 1))
+
+    def test_failed_flush_keeps_the_views(self):
+        self.counter.incr(self.first.pk, 4)
+
+        with mock.patch.object(self.counter, "_write", side_effect=RuntimeError("database is down")):
+            with self.assertLogs("articles.counters", "ERROR"):
+                self.assertEqual(self.counter.flush(), 0)
+
+        self.assertEqual(self.counter.pending(self.first.pk), 4)
+        self.assertEqual(self.counter.flush(), 4)
+        self.assertEqual(self.views(self.first), 4)
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+    def test_zero_interval_writes_through(self):
+        self.counter.incr(self.first.pk)
+
+        self.assertEqual(self.views(self.first), 1)
+        self.assertEqual(self.counter.pending(self.first.pk), 0)
+
+    def test_shutdown_drains_the_buffer(self):
+        self.counter.incr(self.first.pk, 2)
+
+        self.counter.shutdown()
+
+        self.assertEqual(self.views(self.first), 2)
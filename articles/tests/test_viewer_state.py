@@ -0,0 +1,52 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from articles.models import Article, ArticleLike, Bookmark
+from articles.pagination import ArticleFeedPagination
+
+
+class ViewerStateQueryCountTests(TestCase):
+    """is_liked/is_bookmarked are resolved per page, not per article"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = User.objects.create_user("reader", password="Reader-pass-0!")
+        author = User.objects.create_user("writer", password="Writer-pass-0!")
+        articles = Article.objects.bulk_create(
+            Article(title=f"Article {i}", slug=f"article-{i}", content=f"Body of article {i}", author=author)
+            for i in range(50)
+        )
+        ArticleLike.objects.bulk_create(ArticleLike(article=article, user=cls.reader) for article in articles[::2])
+        Bookmark.objects.bulk_create(Bookmark(article=article, user=cls.reader) for article in articles[::3])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def list_page(self, page_size):
+        # The response cache keys on the URL, which is the same for both page sizes
+        cache.clear()
+        with mock.patch.object(ArticleFeedPagination, "page_size", page_size):
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.get("/api/articles/", secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), page_size)
+        return response.json()["results"], len(captured)
+
+    def test_query_count_is_flat_across_page_sizes(self):
+        self.list_page(5)
+        _, small = self.list_page(5)
+        _, large = self.list_page(50)
+        self.assertEqual(small, large)
+
+    def test_viewer_state_matches_rows(self):
+        results, _ = self.list_page(50)
+        liked = set(ArticleLike.objects.filter(user=self.reader).values_list("article_id", flat=True))
+        bookmarked = set(Bookmark.objects.filter(user=self.reader).values_list("article_id", flat=True))
+        for article in results:
+            self.assertEqual(article["is_liked"], article["id"] in liked)
+            self.assertEqual(article["is_bookmarked"], article["id"] in bookmarked)
@@ -0,0 +1,85 @@
+from collections import defaultdict
+from django.conf import settings
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.urls import reverse
+from rest_framework.pagination import Cursor, CursorPagination
+from .models import Comment
+
+
+class CommentThreadPagination(CursorPagination):
+    """Keyset pagination over top-level comments"""
+    ordering = ("-created_at", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class ReplyPagination(CursorPagination):
+    """Keyset pagination over the replies of one comment"""
+    ordering = ("-created_at", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+def replies_per_thread(request):
+    default = getattr(settings, "COMMENT_THREAD_REPLIES", 3)
+    try:
+        return max(0, min(int(request.query_params.get("replies", default)), 20))
+    except ValueError:
+        return default
+
+
+def load_thread_replies(comments, limit, request):
+    """Attach the first ``limit`` replies of every comment using one windowed query
+
+    Each comment gets ``thread_replies`` and ``replies_next``, a cursor link to
+    the rest of its replies (or None when all of them were loaded).
+    """
+    comments = list(comments)
+    for comment in comments:
+        comment.thread_replies = []
+        comment.replies_next = None
+    if not comments or limit == 0:
+        return comments
+
+    ranked = Comment.objects.filter(parent_id__in=[c.pk for c in comments]).select_related(
+        "user", "user__profile"
+    ).annotate(
+        reply_rank=Window(
+            RowNumber(),
+            partition_by=[F("parent_id")],
+            order_by=[F("created_at").desc(), F("id").desc()],
+        )
+    ).filter(reply_rank__lte=limit).order_by("parent_id", "reply_rank")
+
+    replies = defaultdict(list)
+    for reply in ranked:
+        # Replies cannot be replied to, so their own count is always zero
+        reply.num_replies = 0
+        replies[reply.parent_id].append(reply)
+
+    for comment in comments:
+        comment.thread_replies = replies[comment.pk]
+        if comment.num_replies > len(comment.thread_replies):
+            comment.replies_next = replies_cursor_url(request, comment.pk, comment.thread_replies)
+    return comments
+
+
+def replies_cursor_url(request, comment_id, loaded):
+    """Cursor link that continues a reply list after the ones already loaded"""
+    paginator = ReplyPagination()
+    paginator.base_url = request.build_absolute_uri(reverse("comment-replies", args=[comment_id]))
+    # Same scheme as CursorPagination.get_next_link: seek past the last reply
+    # whose timestamp differs from the final one, then skip the tied rest.
+    last_created = loaded[-1].created_at
+    tied = 0
+    for reply in reversed(loaded):
+        if reply.created_at != last_created:
+            position = paginator._get_position_from_instance(reply, paginator.ordering)
+            break
+        tied += 1
+    else:
+        position = None
+    return paginator.encode_cursor(Cursor(offset=tied, reverse=False, position=position))
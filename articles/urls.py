@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
@@ -7,14 +8,19 @@ from .views import (
     BookmarkListView,
     UserArticlesView
 )
+from .async_views import async_read_patterns
 
 router = DefaultRouter()
 router.register(r"articles", ArticleViewSet, basename="article")
 router.register(r"comments", CommentViewSet, basename="comment")
 router.register(r"tags", TagViewSet, basename="tag")
 
+router_urls = router.urls
+if settings.ASYNC_READ_VIEWS_ENABLED:
+    router_urls = async_read_patterns(router_urls)
+
 urlpatterns = [
-    path("", include(router.urls)),
+    path("", include(router_urls)),
     path("bookmarks/", BookmarkListView.as_view(), name="bookmark_list"),
     path("users/<int:user_id>/articles/", UserArticlesView.as_view(), name="user_articles"),
 ]
\ No newline at end of file
@@ -0,0 +1,45 @@
+from .models import ArticleLike, Bookmark
+
+
+class ViewerState:
+    """Per-request cache of the articles the current user has liked or bookmarked"""
+
+    def __init__(self, user):
+        self.user = user
+        self.liked = set()
+        self.bookmarked = set()
+        self._resolved = set()
+
+    def load(self, article_ids):
+        """Resolve liked/bookmarked state for many articles with one query each"""
+        missing = set(article_ids) - self._resolved
+        if not missing:
+            return
+
+        self.liked.update(
+            ArticleLike.objects.filter(user=self.user, article_id__in=missing).values_list("article_id", flat=True)
+        )
+        self.bookmarked.update(
+            Bookmark.objects.filter(user=self.user, article_id__in=missing).values_list("article_id", flat=True)
+        )
+        self._resolved.update(missing)
+
+    def is_liked(self, article_id):
+        self.load([article_id])
+        return article_id in self.liked
+
+    def is_bookmarked(self, article_id):
+        self.load([article_id])
+        return article_id in self.bookmarked
+
+
+def get_viewer_state(request):
+    """Return the request's ViewerState, or None for anonymous requests"""
+    if request is None or not request.user.is_authenticated:
+        return None
+
+    state = getattr(request, "_viewer_state", None)
+    if state is None:
+        state = ViewerState(request.user)
+        request._viewer_state = state
+    return state
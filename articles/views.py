@@ -1,8 +1,10 @@
 from rest_framework import viewsets, permissions, generics, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q, Prefetch
+from django.db import transaction
+from django.db.models import Count, Q
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Article, Comment, Tag, ArticleLike, Bookmark
 from .serializers import (
@@ -17,37 +19,80 @@ from .serializers import (
 )
 from .permissions import IsAdminOrReadOnly, IsOwnerOrAdmin, IsAuthenticatedOrReadOnly
 from .filters import ArticleFilter
+from .pagination import ArticleFeedPagination, BookmarkFeedPagination
+from .search import ArticleSearchFilter
+from . import leaderboards
+from .threads import CommentThreadPagination, ReplyPagination, load_thread_replies, replies_per_thread
+from .cache import CachedResponseMixin, response_cache
+from .conditional import ConditionalGetMixin, collection_validators, make_etag
+from .counters import view_counter
+from .ingest import ArticleImporter
+from .parsers import JSONLinesParser, JSONLParser
+from .engagement import add_engagement, remove_engagement, toggle_engagement
 
 
-class ArticleViewSet(viewsets.ModelViewSet):
+class ArticleViewSet(ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """ViewSet for articles with advanced features"""
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["title", "content", "excerpt", "tags__name", "author__username"]
-    ordering_fields = ["published_at", "title", "views_count", "updated_at"]
+    cached_actions = ("list", "retrieve", "popular", "trending", "comments", "likes_list")
+    conditional_actions = ("list", "retrieve")
+    filter_backends = [DjangoFilterBackend, ArticleSearchFilter, filters.OrderingFilter]
+    ordering_fields = ["published_at", "title", "views_count", "likes_count", "comments_count", "updated_at"]
     filterset_class = ArticleFilter
+    pagination_class = ArticleFeedPagination
     
     def get_queryset(self):
         queryset = Article.objects.select_related("author", "author__profile").prefetch_related(
-            "tags",
-            Prefetch("likes", queryset=ArticleLike.objects.select_related("user")),
-            Prefetch("bookmarks", queryset=Bookmark.objects.select_related("user"))
+            "tags"
         )
         
+        if self.action == "list":
+            queryset = queryset.defer(*Article.LIST_DEFERRED_FIELDS)
+        else:
+            queryset = queryset.defer("search_vector")
+        
         if not self.request.user.is_staff:
             queryset = queryset.filter(is_published=True)
         
-        if self.action == "list":
-            queryset = queryset.annotate(
-                likes_count=Count("likes", distinct=True),
-                comments_count=Count("comments", distinct=True)
-            )
+        return queryset.order_by("-published_at", "-id")
+    
+    def get_cache_versions(self, action, kwargs):
+        if "pk" in kwargs:
+            return [f"article:{kwargs['pk']}", "tags"]
+        return ["articles"]
+    
+    def on_cache_hit(self, request, action, kwargs):
+        if action == "retrieve" and kwargs.get("pk", "").isdigit():
+            view_counter.incr(int(kwargs["pk"]))
+    
+    on_not_modified = on_cache_hit
+    
+    def get_validators(self, request, action, kwargs):
+        viewer = self.viewer_key(request)
+        if action == "list":
+            return collection_validators(request, ["articles"], viewer)
+        
+        pk = kwargs.get("pk", "")
+        if not pk.isdigit():
+            return None
+        # Validators run before authentication, so drafts always take the
+        # full path, where only staff get past get_queryset()
+        row = Article.objects.filter(pk=pk, is_published=True).values_list(
+            "updated_at", "likes_count", "comments_count", "bookmarks_count"
+        ).first()
+        if row is None:
+            return None
         
-        return queryset.order_by("-published_at")
+        stamps = [f"article:{pk}", "tags"]
+        etag = make_etag(
+            request.path, request.META.get("HTTP_ACCEPT", ""), viewer, *row, *response_cache.versions(stamps)
+        )
+        return etag, max(row[0], response_cache.changed_at(stamps))
     
     def get_permissions(self):
-        if self.action in ["create", "update", "partial_update", "destroy"]:
+        if self.action in ["create", "update", "partial_update", "destroy", "bulk"]:
             return [IsAdminOrReadOnly()]
-        return [permissions.AllowAny()]
+        # Actions such as like and bookmark declare their own permission_classes
+        return super().get_permissions()
     
     def get_serializer_class(self):
         if self.action == "list":
@@ -63,49 +108,66 @@ class ArticleViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
     
-    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
-    def like(self, request, pk=None):
-        """Like an article"""
-        article = self.get_object()
-        like, created = ArticleLike.objects.get_or_create(article=article, user=request.user)
-        
-        if not created:
-            like.delete()
-            return Response(
-                {"message": "Article unliked", "is_liked": False},
-                status=status.HTTP_200_OK
-            )
+    @action(detail=False, methods=["post"], parser_classes=[JSONLinesParser, JSONLParser])
+    def bulk(self, request):
+        """Import articles from a JSONL/NDJSON body, one article per line"""
+        report = ArticleImporter(author=request.user).run(request.data)
+        return Response(
+            report.as_dict(),
+            status=status.HTTP_201_CREATED if report.created else status.HTTP_400_BAD_REQUEST
+        )
+    
+    def set_engagement(self, model, pk):
+        """Apply the request verb to the user's like/bookmark row; returns (active, changed)
         
+        Only the article's primary key is checked, so no rows or prefetches are
+        loaded. POST toggles, while PUT (add) and DELETE (remove) are idempotent.
+        """
+        articles = Article.objects.all()
+        if not self.request.user.is_staff:
+            articles = articles.filter(is_published=True)
+        article_id = generics.get_object_or_404(articles.values_list("pk", flat=True), pk=pk)
+        user_id = self.request.user.pk
+        if self.request.method == "PUT":
+            return True, add_engagement(model, article_id, user_id)
+        if self.request.method == "DELETE":
+            return False, remove_engagement(model, article_id, user_id)
+        return toggle_engagement(model, article_id, user_id), True
+    
+    @action(detail=True, methods=["post", "put", "delete"], permission_classes=[permissions.IsAuthenticated])
+    def like(self, request, pk=None):
+        """Toggle a like with POST, or like (PUT) and unlike (DELETE) idempotently"""
+        liked, changed = self.set_engagement(ArticleLike, pk)
         return Response(
-            {"message": "Article liked", "is_liked": True},
-            status=status.HTTP_201_CREATED
+            {"message": "Article liked" if liked else "Article unliked", "is_liked": liked},
+            status=status.HTTP_201_CREATED if liked and changed else status.HTTP_200_OK
         )
     
-    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    @action(detail=True, methods=["post", "put", "delete"], permission_classes=[permissions.IsAuthenticated])
     def bookmark(self, request, pk=None):
-        """Bookmark an article"""
-        article = self.get_object()
-        bookmark, created = Bookmark.objects.get_or_create(article=article, user=request.user)
-        
-        if not created:
-            bookmark.delete()
-            return Response(
-                {"message": "Bookmark removed", "is_bookmarked": False},
-                status=status.HTTP_200_OK
-            )
-        
+        """Toggle a bookmark with POST, or add (PUT) and remove (DELETE) it idempotently"""
+        bookmarked, changed = self.set_engagement(Bookmark, pk)
         return Response(
-            {"message": "Article bookmarked", "is_bookmarked": True},
-            status=status.HTTP_201_CREATED
+            {"message": "Article bookmarked" if bookmarked else "Bookmark removed", "is_bookmarked": bookmarked},
+            status=status.HTTP_201_CREATED if bookmarked and changed else status.HTTP_200_OK
         )
     
+    def get_thread_queryset(self, article_id):
+        """Top-level comments of an article with their reply counts"""
+        return Comment.objects.filter(article_id=article_id, parent=None).select_related(
+            "user", "user__profile"
+        ).annotate(num_replies=Count("replies"))
+    
     @action(detail=True, methods=["get"])
     def comments(self, request, pk=None):
-        """Get all comments for an article"""
+        """Get top-level comments for an article, each with its first replies"""
         article = self.get_object()
-        comments = article.comments.filter(parent=None).select_related("user", "user__profile").prefetch_related("replies")
-        serializer = CommentDetailSerializer(comments, many=True, context={"request": request})
-        return Response(serializer.data)
+        comments = self.get_thread_queryset(article.pk)
+        paginator = CommentThreadPagination()
+        page = paginator.paginate_queryset(comments, request)
+        load_thread_replies(page, replies_per_thread(request), request)
+        serializer = CommentDetailSerializer(page, many=True, context={"request": request})
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
     def add_comment(self, request, pk=None):
@@ -116,7 +178,8 @@ class ArticleViewSet(viewsets.ModelViewSet):
             context={"request": request, "article_id": article.id}
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            serializer.save()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
     @action(detail=True, methods=["get"])
@@ -129,18 +192,30 @@ class ArticleViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=["get"])
     def popular(self, request):
-        """Get popular articles by views"""
-        articles = self.get_queryset().order_by("-views_count")[:10]
-        serializer = self.get_serializer(articles, many=True)
-        return Response(serializer.data)
+        """Get popular articles by time-decayed views (?window=day|week|all)"""
+        return self.leaderboard_response(request, "popularity", default_window="all")
     
     @action(detail=False, methods=["get"])
     def trending(self, request):
-        """Get trending articles by recent likes"""
-        articles = self.get_queryset().annotate(
-            recent_likes=Count("likes", filter=Q(likes__created_at__gte=timezone.now() - timezone.timedelta(days=7)))
-        ).order_by("-recent_likes")[:10]
-        serializer = self.get_serializer(articles, many=True)
+        """Get trending articles by time-decayed likes and comments (?window=day|week|all)"""
+        return self.leaderboard_response(request, "trend", default_window="week")
+    
+    def leaderboard_response(self, request, score, default_window):
+        window = request.query_params.get("window", default_window)
+        if window not in leaderboards.windows():
+            raise ValidationError({"window": f"Choose one of: {', '.join(leaderboards.windows())}"})
+        
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 10)), 50))
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer"})
+        
+        article_ids = leaderboards.top_article_ids(
+            score, window, limit, published_only=not request.user.is_staff
+        )
+        articles = self.get_queryset().in_bulk(article_ids)
+        ranked = [articles[pk] for pk in article_ids if pk in articles]
+        serializer = self.get_serializer(ranked, many=True)
         return Response(serializer.data)
 
 
@@ -150,20 +225,37 @@ class CommentViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     
     def get_queryset(self):
-        return Comment.objects.select_related("user", "user__profile", "article").order_by("-created_at")
+        return Comment.objects.select_related("user", "user__profile", "article").annotate(
+            num_replies=Count("replies")
+        ).order_by("-created_at")
     
     def get_permissions(self):
         if self.action in ["update", "partial_update", "destroy"]:
             return [IsOwnerOrAdmin()]
         return [IsAuthenticatedOrReadOnly()]
     
+    @action(detail=True, methods=["get"])
+    def replies(self, request, pk=None):
+        """Page through the replies of a comment"""
+        comment = self.get_object()
+        replies = comment.replies.select_related("user", "user__profile")
+        paginator = ReplyPagination()
+        page = paginator.paginate_queryset(replies, request)
+        for reply in page:
+            reply.num_replies = 0
+        serializer = CommentSerializer(page, many=True, context={"request": request})
+        return paginator.get_paginated_response(serializer.data)
+    
     def perform_destroy(self, instance):
         """Delete comment or its replies"""
-        instance.delete()
+        with transaction.atomic():
+            instance.delete()
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(ConditionalGetMixin, CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for tags (read-only)"""
+    cached_actions = ("list", "retrieve", "articles")
+    conditional_actions = ("articles",)
     queryset = Tag.objects.annotate(
         articles_count=Count("articles", filter=Q(articles__is_published=True))
     ).order_by("-articles_count")
@@ -173,18 +265,31 @@ class TagViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ["name", "description"]
     ordering_fields = ["name", "created_at", "articles_count"]
     
+    def get_cache_versions(self, action, kwargs):
+        if action == "articles":
+            return ["articles", "tags"]
+        return ["tags"]
+    
+    def get_validators(self, request, action, kwargs):
+        return collection_validators(request, ["articles", "tags"], self.viewer_key(request))
+    
+    def get_articles_queryset(self, tag_id):
+        """Published articles carrying a tag, newest first"""
+        return Article.objects.filter(tags=tag_id, is_published=True).select_related(
+            "author", "author__profile"
+        ).prefetch_related("tags").defer(*Article.LIST_DEFERRED_FIELDS).order_by("-published_at", "-id")
+    
     @action(detail=True, methods=["get"])
     def articles(self, request, pk=None):
         """Get all articles for a specific tag"""
         tag = self.get_object()
-        articles = tag.articles.filter(is_published=True).select_related(
-            "author", "author__profile"
-        ).prefetch_related("tags").order_by("-published_at")
+        articles = self.get_articles_queryset(tag.pk)
         
-        page = self.paginate_queryset(articles)
+        paginator = ArticleFeedPagination()
+        page = paginator.paginate_queryset(articles, request)
         if page is not None:
             serializer = ArticleListSerializer(page, many=True, context={"request": request})
-            return self.get_paginated_response(serializer.data)
+            return paginator.get_paginated_response(serializer.data)
         
         serializer = ArticleListSerializer(articles, many=True, context={"request": request})
         return Response(serializer.data)
@@ -194,24 +299,28 @@ class BookmarkListView(generics.ListAPIView):
     """List user's bookmarked articles"""
     serializer_class = BookmarkSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = BookmarkFeedPagination
     
     def get_queryset(self):
         return Bookmark.objects.filter(user=self.request.user).select_related(
             "article", "article__author", "article__author__profile"
-        ).prefetch_related("article__tags").order_by("-created_at")
+        ).prefetch_related("article__tags").defer(
+            *(f"article__{field}" for field in Article.LIST_DEFERRED_FIELDS)
+        ).order_by("-created_at", "-id")
 
 
-class UserArticlesView(generics.ListAPIView):
+class UserArticlesView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
     """List articles by a specific user"""
     serializer_class = ArticleListSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = ArticleFeedPagination
+    
+    def get_validators(self, request, action, kwargs):
+        return collection_validators(request, ["articles"], self.viewer_key(request))
     
     def get_queryset(self):
         user_id = self.kwargs.get("user_id")
         queryset = Article.objects.filter(author_id=user_id, is_published=True).select_related(
             "author", "author__profile"
-        ).prefetch_related("tags").order_by("-published_at")
+        ).prefetch_related("tags").defer(*Article.LIST_DEFERRED_FIELDS).order_by("-published_at", "-id")
         return queryset
-
-
-from django.utils import timezone
\ No newline at end of file
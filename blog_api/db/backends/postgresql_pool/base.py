@@ -0,0 +1,79 @@
+from functools import partial
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+from django.utils.asyncio import async_unsafe
+from blog_api.db.pool import ConnectionPool, PoolTimeout, get_pool
+
+Database = base.Database
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend that borrows connections from a process-wide pool per alias
+
+    ``OPTIONS["pool"]`` holds the ConnectionPool settings (min_size, max_size,
+    timeout, max_lifetime, max_idle, check_after). Django closes the
+    connection at the end of every request, which here hands it back to the
+    pool, so WSGI threads and the per-request threads of async views share
+    at most ``max_size`` connections per process. Async ORM calls run in
+    those threads, so both paths acquire through the same thread-safe pool.
+    """
+
+    @property
+    def pool(self):
+        return get_pool((self.alias, self.settings_dict["NAME"]), self.create_pool)
+
+    def create_pool(self):
+        if self.settings_dict["CONN_MAX_AGE"] != 0:
+            raise ImproperlyConfigured("Pooled connections must be returned after each request; set CONN_MAX_AGE to 0")
+        return ConnectionPool(
+            self.alias,
+            connect=partial(super().get_new_connection, self.get_connection_params()),
+            check=self.check_connection,
+            reset=self.reset_connection,
+            **self.settings_dict["OPTIONS"].get("pool", {}),
+        )
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        if self.alias == NO_DB_ALIAS:
+            # Maintenance connections (test database setup) must not linger in a pool
+            return super().get_new_connection(conn_params)
+        try:
+            return self.pool.acquire()
+        except PoolTimeout as exc:
+            raise Database.OperationalError(str(exc)) from exc
+
+    def _close(self):
+        if self.connection is None:
+            return
+        if self.alias == NO_DB_ALIAS:
+            return super()._close()
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # The wrapper keeps using this connection until the block unwinds
+                self.pool.discard(self.connection)
+            else:
+                self.pool.release(self.connection)
+
+    @staticmethod
+    def check_connection(connection):
+        if connection.closed:
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        return True
+
+    @staticmethod
+    def reset_connection(connection):
+        if connection.closed:
+            raise Database.InterfaceError("connection already closed")
+        if not connection.autocommit:
+            # Roll back whatever the borrower left open; Django sets autocommit again on hand-off
+            connection.rollback()
+            connection.autocommit = True
@@ -0,0 +1,43 @@
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, group_by, outer="pk"):
+    """Correlated COUNT(*) of rows whose ``group_by`` is the outer row's ``outer``"""
+    counts = queryset.filter(**{group_by: OuterRef(outer)}).order_by().values(group_by).annotate(
+        total=Count("pk")
+    ).values("total")
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def repair_counters(queryset, counters, batch_size=1000):
+    """Compare stored counters with their true values and repair the rows that drifted
+
+    ``counters()`` returns ``{field: expression}`` computing each stored
+    field's true value. Rows are checked in primary-key batches with one
+    query each, and only drifted rows are rewritten. Returns (checked, repaired).
+    """
+    last_id = 0
+    checked = repaired = 0
+    while True:
+        batch_ids = list(queryset.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not batch_ids:
+            return checked, repaired
+        last_id = batch_ids[-1]
+        checked += len(batch_ids)
+
+        expressions = counters()
+        actual = {f"actual_{field}": expression for field, expression in expressions.items()}
+        drift = Q()
+        for field in expressions:
+            drift |= ~Q(**{field: F(f"actual_{field}")})
+        drifted_ids = list(
+            queryset.filter(pk__in=batch_ids).annotate(**actual).filter(drift).values_list("pk", flat=True)
+        )
+        if not drifted_ids:
+            continue
+
+        with transaction.atomic():
+            queryset.filter(pk__in=drifted_ids).update(**counters())
+        repaired += len(drifted_ids)
@@ -0,0 +1,349 @@
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the acquire timeout"""
+
+
+class PooledConnection:
+    """Bookkeeping for one raw connection owned by a pool"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.released_at = self.created_at
+
+
+class Waiter:
+    """A thread queued for a connection; ``pooled`` is None when it was granted a slot to open one"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.pooled = None
+
+
+class ConnectionPool:
+    """Thread-safe pool of raw DB-API connections
+
+    ``connect()`` opens a connection, ``check(connection)`` must return True
+    for a working one and ``reset(connection)`` returns it to a clean state
+    (or raises). Connections idle for more than ``check_after`` seconds are
+    checked before hand-off, connections older than ``max_lifetime`` are
+    replaced, and a maintenance thread keeps ``min_size`` open and closes
+    the surplus idle for more than ``max_idle``. When the pool is full,
+    callers queue and are served in arrival order. The pool only needs those
+    three callables, so it can be exercised with stand-in connections.
+    """
+
+    def __init__(
+        self, name, connect, check, reset, min_size=0, max_size=10, timeout=10.0, max_lifetime=3600.0,
+        max_idle=600.0, check_after=1.0,
+    ):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+        self.name = name
+        self.connect = connect
+        self.check = check
+        self.reset = reset
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self._idle = deque()
+        self._in_use = {}
+        self._opening = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker = None
+        self._stats = dict.fromkeys(
+            ("acquired", "waited", "timeouts", "opened", "closed", "recycled", "failed_checks", "connect_errors"), 0
+        )
+        self._wait_seconds = 0.0
+        self._wait_max = 0.0
+        self._peak_in_use = 0
+
+    @property
+    def size(self):
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def acquire(self):
+        """Hand out a healthy connection, opening one or waiting up to ``timeout`` for one"""
+        self._ensure_worker()
+        started = time.monotonic()
+        waited = False
+        while True:
+            waiter = None
+            with self._lock:
+                if self._idle and not self._waiters:
+                    # Most recently used first: warm connections, and the rest age out
+                    pooled = self._checkout(self._idle.pop())
+                elif self.size < self.max_size and not self._waiters:
+                    self._opening += 1
+                    pooled = None
+                else:
+                    waiter = Waiter()
+                    self._waiters.append(waiter)
+
+            if waiter is not None:
+                waited = True
+                waiter.event.wait(max(0.0, started + self.timeout - time.monotonic()))
+                with self._lock:
+                    if not waiter.event.is_set():
+                        self._waiters.remove(waiter)
+                        self._stats["timeouts"] += 1
+                        self._record_wait(time.monotonic() - started)
+                        raise PoolTimeout(
+                            f"No connection available in pool {self.name!r} within {self.timeout}s "
+                            f"({len(self._in_use)}/{self.max_size} in use)"
+                        )
+                pooled = waiter.pooled
+
+            if pooled is None:
+                pooled = self._open()
+            elif not self._usable(pooled):
+                with self._lock:
+                    del self._in_use[id(pooled.connection)]
+                    self._close(pooled.connection)
+                continue
+
+            with self._lock:
+                self._stats["acquired"] += 1
+                if waited:
+                    self._stats["waited"] += 1
+                    self._record_wait(time.monotonic() - started)
+                self._peak_in_use = max(self._peak_in_use, len(self._in_use))
+            return pooled.connection
+
+    def release(self, connection):
+        """Take a connection back, resetting it, or closing it when broken or too old"""
+        with self._lock:
+            pooled = self._in_use.pop(id(connection), None)
+        if pooled is None:
+            self._close_quietly(connection)
+            return
+        expired = self._expired(pooled)
+        keep = not expired
+        if keep:
+            try:
+                self.reset(connection)
+            except Exception:
+                logger.warning("Discarding connection from pool %r that failed to reset", self.name, exc_info=True)
+                keep = False
+        with self._lock:
+            if keep:
+                pooled.released_at = time.monotonic()
+                self._give_back(pooled)
+            else:
+                self._stats["recycled"] += expired
+                self._close(connection)
+
+    def discard(self, connection):
+        """Close a checked-out connection instead of returning it"""
+        with self._lock:
+            self._in_use.pop(id(connection), None)
+            self._close(connection)
+
+    def stats(self):
+        with self._lock:
+            acquired = self._stats["acquired"]
+            return {
+                **self._stats,
+                "size": self.size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "waiting": len(self._waiters),
+                "peak_in_use": self._peak_in_use,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "wait_seconds": self._wait_seconds,
+                "wait_max_seconds": self._wait_max,
+                # Share of acquisitions that found every connection busy
+                "saturation": self._stats["waited"] / acquired if acquired else 0.0,
+            }
+
+    def maintain(self):
+        """Close expired and surplus idle connections and top the pool up to ``min_size``"""
+        now = time.monotonic()
+        with self._lock:
+            keep = deque()
+            surplus = self.size - self.min_size
+            # Oldest-released first, so the connections in regular use survive
+            for pooled in self._idle:
+                if self._expired(pooled, now):
+                    self._stats["recycled"] += 1
+                    self._close(pooled.connection)
+                    surplus -= 1
+                elif surplus > 0 and now - pooled.released_at > self.max_idle:
+                    self._close(pooled.connection)
+                    surplus -= 1
+                else:
+                    keep.append(pooled)
+            self._idle = keep
+            missing = max(0, self.min_size - self.size)
+            self._opening += missing
+
+        for _ in range(missing):
+            try:
+                pooled = self._open()
+            except Exception:
+                logger.warning("Could not open a connection for pool %r", self.name, exc_info=True)
+                continue
+            with self._lock:
+                del self._in_use[id(pooled.connection)]
+                self._give_back(pooled)
+
+    def close(self):
+        """Stop maintenance and close the idle connections; checked-out ones close on release"""
+        self._stop.set()
+        with self._lock:
+            while self._idle:
+                self._close(self._idle.pop().connection)
+
+    def _open(self):
+        # The caller has reserved the slot by counting it in ``_opening``
+        try:
+            pooled = PooledConnection(self.connect())
+        except Exception:
+            with self._lock:
+                self._opening -= 1
+                self._stats["connect_errors"] += 1
+                self._grant_slot()
+            raise
+        with self._lock:
+            self._opening -= 1
+            self._stats["opened"] += 1
+            self._checkout(pooled)
+        return pooled
+
+    def _checkout(self, pooled):
+        self._in_use[id(pooled.connection)] = pooled
+        return pooled
+
+    def _give_back(self, pooled):
+        # Called with the lock held: the longest waiter gets the connection directly
+        if self._waiters:
+            waiter = self._waiters.popleft()
+            waiter.pooled = self._checkout(pooled)
+            waiter.event.set()
+        else:
+            self._idle.append(pooled)
+
+    def _grant_slot(self):
+        # Called with the lock held after capacity was freed: let the longest waiter open a connection
+        if self._waiters and self.size < self.max_size:
+            self._opening += 1
+            self._waiters.popleft().event.set()
+
+    def _usable(self, pooled):
+        if self._expired(pooled):
+            with self._lock:
+                self._stats["recycled"] += 1
+            return False
+        if time.monotonic() - pooled.released_at < self.check_after:
+            return True
+        try:
+            healthy = self.check(pooled.connection)
+        except Exception:
+            healthy = False
+        if not healthy:
+            with self._lock:
+                self._stats["failed_checks"] += 1
+            logger.warning("Discarding a connection from pool %r that failed its health check", self.name)
+        return healthy
+
+    def _expired(self, pooled, now=None):
+        return ((now or time.monotonic()) - pooled.created_at) > self.max_lifetime
+
+    def _record_wait(self, seconds):
+        self._wait_seconds += seconds
+        self._wait_max = max(self._wait_max, seconds)
+
+    def _close(self, connection):
+        # Called with the lock held
+        self._stats["closed"] += 1
+        self._close_quietly(connection)
+        self._grant_slot()
+
+    def _close_quietly(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _ensure_worker(self):
+        if self._stop.is_set() or self._worker is not None and self._worker.is_alive():
+            return
+
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name=f"db-pool-{self.name}", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.maintain()
+            except Exception:
+                logger.exception("Maintenance of pool %r failed", self.name)
+            if self._stop.wait(max(1, min(self.max_idle, self.max_lifetime, 30) / 2)):
+                return
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, factory):
+    """The process-wide pool for ``key``, created by ``factory()`` on first use"""
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = factory()
+    return pool
+
+
+def all_pools():
+    with _pools_lock:
+        return list(_pools.values())
+
+
+POOL_METRICS = (
+    ("size", "gauge", "Open connections"),
+    ("idle", "gauge", "Connections waiting in the pool"),
+    ("in_use", "gauge", "Connections handed out"),
+    ("peak_in_use", "gauge", "Most connections handed out at once"),
+    ("max_size", "gauge", "Configured maximum pool size"),
+    ("acquired", "counter", "Connections handed out"),
+    ("waited", "counter", "Acquisitions that waited for a busy pool"),
+    ("timeouts", "counter", "Acquisitions that gave up after the timeout"),
+    ("wait_seconds", "counter", "Time spent waiting for a connection"),
+    ("opened", "counter", "Connections opened"),
+    ("closed", "counter", "Connections closed"),
+    ("recycled", "counter", "Connections replaced for exceeding their lifetime"),
+    ("failed_checks", "counter", "Connections discarded by the hand-off health check"),
+    ("connect_errors", "counter", "Failed attempts to open a connection"),
+)
+
+
+def render_metrics():
+    """Prometheus text lines for every pool in this process"""
+    stats = {pool.name: pool.stats() for pool in all_pools()}
+    if not stats:
+        return ""
+    lines = []
+    for key, kind, help_text in POOL_METRICS:
+        name = f"blog_db_pool_{key}" + ("_total" if kind == "counter" else "")
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        lines += [f'{name}{{alias="{alias}"}} {values[key]}' for alias, values in sorted(stats.items())]
+    return "\n".join(lines) + "\n"
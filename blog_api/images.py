@@ -0,0 +1,232 @@
+import atexit
+import hashlib
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.urls import reverse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+PIL_FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+CONTENT_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg"}
+
+
+class RenditionPipeline:
+    """Resized WebP/JPEG renditions of uploaded images, cached on disk by content hash
+
+    Uploads are handed to a small thread pool once their transaction commits
+    (Pillow releases the GIL while decoding, resizing and encoding), and a
+    request for a rendition that does not exist yet waits on the same pool,
+    so a burst of first requests resizes an image only once. Renditions are
+    stored under ``renditions/<hash>/``: identical uploads share them and a
+    replaced image never serves the old picture.
+    """
+    root = "renditions"
+
+    def __init__(self):
+        self._executor = None
+        self._inflight = {}
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    @property
+    def renditions(self):
+        return getattr(settings, "IMAGE_RENDITIONS", {"thumb": 160, "card": 640, "hero": 1600})
+
+    @property
+    def formats(self):
+        return getattr(settings, "IMAGE_RENDITION_FORMATS", ("webp", "jpeg"))
+
+    @property
+    def quality(self):
+        return getattr(settings, "IMAGE_RENDITION_QUALITY", 80)
+
+    @property
+    def workers(self):
+        return getattr(settings, "IMAGE_RENDITION_WORKERS", 2)
+
+    @property
+    def timeout(self):
+        return getattr(settings, "IMAGE_RENDITION_TIMEOUT", 30)
+
+    @property
+    def digest_ttl(self):
+        return getattr(settings, "IMAGE_DIGEST_TTL", 86400)
+
+    def sources(self):
+        """(model, field name) of the image fields that renditions are made from"""
+        from accounts.models import UserProfile
+        from articles.models import Article
+
+        return ((Article, "featured_image"), (UserProfile, "avatar"))
+
+    def is_source(self, name):
+        """Whether ``name`` is a stored featured image or avatar; nothing else is resized on request"""
+        if name.startswith(f"{self.root}/"):
+            return False
+        for model, field in self.sources():
+            if name.startswith(model._meta.get_field(field).upload_to):
+                return model.objects.filter(**{field: name}).exists()
+        return False
+
+    def digest_key(self, name):
+        return f"img:{hashlib.blake2b(name.encode(), digest_size=16).hexdigest()}"
+
+    def digest(self, name):
+        """Content hash of a stored image, remembered per name"""
+        key = self.digest_key(name)
+        digest = cache.get(key)
+        if digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            with default_storage.open(name) as source:
+                for chunk in source.chunks():
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            cache.set(key, digest, timeout=self.digest_ttl)
+        return digest
+
+    def forget(self, name):
+        """Drop the remembered hash of an image that was replaced or deleted, once the transaction commits"""
+        if name:
+            transaction.on_commit(lambda: cache.delete(self.digest_key(name)))
+
+    def path(self, digest, rendition, fmt):
+        return f"{self.root}/{digest[:2]}/{digest}/{rendition}.{fmt}"
+
+    def urls(self, name, request=None):
+        """``{rendition: {"width": max_width, <format>: url, ...}}`` for a stored image, or None"""
+        if not name:
+            return None
+        result = {}
+        for rendition, width in self.renditions.items():
+            entry = {"width": width}
+            for fmt in self.formats:
+                url = reverse("image_rendition", kwargs={"rendition": rendition, "fmt": fmt, "name": name})
+                entry[fmt] = request.build_absolute_uri(url) if request is not None else url
+            result[rendition] = entry
+        return result
+
+    def generate(self, name):
+        """Write every missing rendition of a stored image; returns its content hash"""
+        from PIL import Image, ImageOps
+
+        digest = self.digest(name)
+        # Largest first, so each rendition is resized from the previous one
+        sizes = sorted(self.renditions.items(), key=lambda item: -item[1])
+        missing = {
+            (rendition, fmt) for rendition, _ in sizes for fmt in self.formats
+            if not default_storage.exists(self.path(digest, rendition, fmt))
+        }
+        if not missing:
+            return digest
+
+        with default_storage.open(name) as source, Image.open(source) as image:
+            # JPEG sources decode straight at a reduced scale when far larger than needed
+            image.draft("RGB", (sizes[0][1], sizes[0][1]))
+            current = ImageOps.exif_transpose(image)
+            if current.mode not in ("RGB", "RGBA"):
+                current = current.convert("RGBA" if current.has_transparency_data else "RGB")
+            for rendition, width in sizes:
+                if current.width > width:
+                    height = max(1, round(current.height * width / current.width))
+                    current = current.resize((width, height), Image.Resampling.LANCZOS)
+                for fmt in self.formats:
+                    if (rendition, fmt) in missing:
+                        default_storage.save(self.path(digest, rendition, fmt), ContentFile(self.encode(current, fmt)))
+        return digest
+
+    def encode(self, image, fmt):
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        if fmt == "jpeg":
+            if image.mode == "RGBA":
+                flattened = Image.new("RGB", image.size, "white")
+                flattened.paste(image, mask=image.getchannel("A"))
+                image = flattened
+            image.save(buffer, "JPEG", quality=self.quality, optimize=True, progressive=True)
+        else:
+            image.save(buffer, PIL_FORMATS[fmt], quality=self.quality)
+        return buffer.getvalue()
+
+    def submit(self, name):
+        """Queue generation for a stored image, sharing a run that is already queued"""
+        with self._lock:
+            future = self._inflight.get(name)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="renditions")
+                future = self._inflight[name] = self._executor.submit(self._run, name)
+        return future
+
+    def _run(self, name):
+        try:
+            return self.generate(name)
+        except OSError as exc:
+            # Missing, unreadable or non-image files (UnidentifiedImageError is an OSError)
+            logger.warning("Cannot generate renditions of %s: %s", name, exc)
+            raise
+        except Exception:
+            logger.exception("Failed to generate renditions of %s", name)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(name, None)
+
+    def schedule(self, name):
+        """Generate renditions in the background after the surrounding transaction commits"""
+        if name and self.workers > 0:
+            transaction.on_commit(lambda: self.submit(name))
+
+    def ensure(self, name, rendition, fmt):
+        """Storage path of one rendition, generating the image's renditions first when missing
+
+        Raises FileNotFoundError for names that are not a stored featured image
+        or avatar, so requests cannot resize (or cache the hash of) arbitrary
+        media files, renditions included. A cached digest means the name was
+        checked within ``IMAGE_DIGEST_TTL``; replacing or deleting the image
+        forgets it.
+        """
+        digest = cache.get(self.digest_key(name))
+        if digest is None:
+            if not self.is_source(name):
+                raise FileNotFoundError(name)
+            digest = self.digest(name)
+        path = self.path(digest, rendition, fmt)
+        if not default_storage.exists(path):
+            if self.workers > 0:
+                self.submit(name).result(timeout=self.timeout)
+            else:
+                self.generate(name)
+        return path
+
+    def shutdown(self):
+        """Drop queued work; renditions not written yet are generated on first request"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+image_pipeline = RenditionPipeline()
+
+
+@extend_schema_field(OpenApiTypes.OBJECT)
+class RenditionsField(serializers.Field):
+    """Read-only map of an image field's rendition URLs, for building ``srcset`` attributes"""
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return image_pipeline.urls(value.name if value else None, self.context.get("request"))
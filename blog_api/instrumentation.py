@@ -0,0 +1,253 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import BaseSerializer
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+PHASES = ("db", "auth", "serialize", "sanitize", "render")
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Timings collected while one request is being handled"""
+
+    def __init__(self):
+        self.view = "unresolved"
+        self.action = ""
+        self.queries = 0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.active = set()
+        self.total = 0.0
+
+    def server_timing(self):
+        app = max(0.0, self.total - sum(self.phases.values()))
+        entries = [f'db;dur={self.phases["db"] * 1000:.2f};desc="{self.queries} queries"']
+        entries += [f"{phase};dur={self.phases[phase] * 1000:.2f}" for phase in PHASES[1:] if self.phases[phase]]
+        entries += [f"app;dur={app * 1000:.2f}", f"total;dur={self.total * 1000:.2f}"]
+        return ", ".join(entries)
+
+
+def record_query(execute, sql, params, many, context):
+    """Connection execute wrapper that charges queries to the current request, if instrumented"""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.phases["db"] += time.perf_counter() - started
+        metrics.queries += 1
+
+
+def install_query_recorder(connection, **kwargs):
+    # Connections are per thread, and async views query from worker threads,
+    # so every connection carries the wrapper and the ContextVar picks the request
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in the block to ``phase`` of the current request, if instrumented"""
+    metrics = _current.get()
+    if metrics is None or phase in metrics.active:
+        # Nested blocks of the same phase (serializers built inside serializers) count once
+        yield
+        return
+    metrics.active.add(phase)
+    started = time.perf_counter()
+    db_before = metrics.phases["db"]
+    try:
+        yield
+    finally:
+        metrics.active.discard(phase)
+        # Queries issued inside the block are already counted under "db"
+        elapsed = time.perf_counter() - started - (metrics.phases["db"] - db_before)
+        metrics.phases[phase] += max(0.0, elapsed)
+
+
+def install_serializer_timer():
+    """Charge every ``serializer.data`` to the "serialize" phase
+
+    ``Serializer.data`` and ``ListSerializer.data`` both build on
+    ``BaseSerializer.data``, so wrapping it covers the DRF views and the
+    async views alike. Only installed when instrumentation is enabled.
+    """
+    data = BaseSerializer.data.fget
+    if getattr(data, "timed", False):
+        return
+
+    def timed_data(self):
+        with timed("serialize"):
+            return data(self)
+
+    timed_data.timed = True
+    BaseSerializer.data = property(timed_data)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+class MetricsRegistry:
+    """Process-local aggregates per DRF view and action, rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = defaultdict(int)
+            self.durations = defaultdict(lambda: Histogram(DURATION_BUCKETS))
+            self.queries = defaultdict(lambda: Histogram(QUERY_BUCKETS))
+            self.phase_seconds = defaultdict(float)
+
+    def observe(self, metrics, status):
+        key = (metrics.view, metrics.action)
+        with self._lock:
+            self.requests[key + (f"{status // 100}xx",)] += 1
+            self.durations[key].observe(metrics.total)
+            self.queries[key].observe(metrics.queries)
+            for phase, seconds in metrics.phases.items():
+                self.phase_seconds[key + (phase,)] += seconds
+
+    def render(self):
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP blog_requests_total Requests handled, by view, action and status class",
+                "# TYPE blog_requests_total counter",
+            ]
+            for (view, action, status), count in sorted(self.requests.items()):
+                lines.append(f'blog_requests_total{{view="{view}",action="{action}",status="{status}"}} {count}')
+            lines += self._histogram(
+                "blog_request_duration_seconds", "Request wall time", self.durations
+            )
+            lines += self._histogram("blog_request_db_queries", "SQL queries per request", self.queries)
+            lines += [
+                "# HELP blog_request_phase_seconds_total Time spent per request phase",
+                "# TYPE blog_request_phase_seconds_total counter",
+            ]
+            for (view, action, phase), seconds in sorted(self.phase_seconds.items()):
+                lines.append(
+                    f'blog_request_phase_seconds_total{{view="{view}",action="{action}",phase="{phase}"}} {seconds:.6f}'
+                )
+        return "\n".join(lines) + "\n"
+
+    def _histogram(self, name, help_text, histograms):
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (view, action), histogram in sorted(histograms.items()):
+            labels = f'view="{view}",action="{action}"'
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += histogram.counts[-1]
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.total:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+registry = MetricsRegistry()
+
+
+class InstrumentationMiddleware:
+    """Per-request SQL, auth, serializer, sanitize and render timings as Server-Timing headers
+
+    Removed from the stack at startup unless INSTRUMENTATION_ENABLED is set,
+    so disabled instrumentation costs nothing per request.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "INSTRUMENTATION_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_recorder)
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+        install_serializer_timer()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.total = time.perf_counter() - started
+            _current.reset(token)
+        return self.record(metrics, response)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.total = time.perf_counter() - started
+            _current.reset(token)
+        return self.record(metrics, response)
+
+    def record(self, metrics, response):
+        response["Server-Timing"] = metrics.server_timing()
+        registry.observe(metrics, response.status_code)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is None:
+            return None
+        view_class = getattr(view_func, "cls", None)
+        method = request.method.lower()
+        if view_class is None:
+            metrics.view, metrics.action = view_func.__name__, method
+        else:
+            actions = getattr(view_func, "actions", None) or {}
+            metrics.view, metrics.action = view_class.__name__, actions.get(method, method)
+        return None
+
+
+class TimedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that reports its time to the request metrics"""
+
+    def authenticate(self, request):
+        with timed("auth"):
+            return super().authenticate(request)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSON renderer that reports its time to the request metrics"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed("render"):
+            return super().render(data, accepted_media_type, renderer_context)
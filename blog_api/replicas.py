@@ -0,0 +1,226 @@
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+import jwt
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_routing = ContextVar("replica_routing", default=None)
+
+
+def replica_options():
+    return getattr(settings, "READ_REPLICAS", {})
+
+
+class RequestRouting:
+    """Where the current request may read from; one replica is used per request"""
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.alias = None
+        self.wrote = False
+
+
+class ReplicaSet:
+    """Weighted choice among the replicas that passed their last health check
+
+    A replica is re-checked at most every ``HEALTH_CHECK_INTERVAL`` seconds:
+    it must answer ``SELECT 1`` and, on PostgreSQL with ``MAX_LAG_SECONDS``
+    set, be replaying WAL no further behind than that. Failing replicas are
+    skipped until a later check passes; with none healthy, reads go to the
+    primary.
+    """
+
+    def __init__(self):
+        self._healthy = {}
+        self._checked_at = {}
+        self._lock = threading.Lock()
+
+    @property
+    def weights(self):
+        return replica_options().get("ALIASES", {})
+
+    def choose(self):
+        candidates = [(alias, weight) for alias, weight in self.weights.items() if weight > 0 and self.is_healthy(alias)]
+        if not candidates:
+            return DEFAULT_DB_ALIAS
+        aliases, weights = zip(*candidates)
+        return random.choices(aliases, weights=weights)[0]
+
+    def is_healthy(self, alias):
+        interval = replica_options().get("HEALTH_CHECK_INTERVAL", 5)
+        with self._lock:
+            due = time.monotonic() - self._checked_at.get(alias, float("-inf")) >= interval
+            if due:
+                # Claim the check so concurrent requests keep using the last verdict
+                self._checked_at[alias] = time.monotonic()
+        if due:
+            self._healthy[alias] = self.check(alias)
+        return self._healthy.get(alias, False)
+
+    def check(self, alias):
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                max_lag = replica_options().get("MAX_LAG_SECONDS", 0)
+                if max_lag and connection.vendor == "postgresql":
+                    cursor.execute(
+                        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+                    )
+                    lag = cursor.fetchone()[0]
+                    if lag > max_lag:
+                        logger.warning("Replica %s is %.1fs behind; reading from others", alias, lag)
+                        return False
+            return True
+        except Exception:
+            logger.warning("Replica %s failed its health check", alias, exc_info=True)
+            connection.close()
+            return False
+
+    def reset(self):
+        self._healthy.clear()
+        self._checked_at.clear()
+
+
+replicas = ReplicaSet()
+
+
+class ReplicaRouter:
+    """Send reads of replica-eligible requests to a replica, everything else to the primary
+
+    Outside a request routed by ReplicaRoutingMiddleware (commands, worker
+    threads) all queries use the primary. Inside one, reads switch back to
+    the primary for the rest of the request once it writes or opens a
+    transaction on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if routing is None or not routing.use_replica or routing.wrote:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if routing.alias is None:
+            routing.alias = replicas.choose()
+        return routing.alias
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def jwt_user_id(request):
+    """User id claim of a Bearer token, read without verification
+
+    Only used to key the primary pin: a forged id can at worst send its own
+    reads to the primary.
+    """
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    scheme, _, token = header.partition(" ")
+    if scheme != "Bearer" or not token:
+        return None
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return None
+    return claims.get(settings.SIMPLE_JWT.get("USER_ID_CLAIM", "user_id"))
+
+
+class ReplicaRoutingMiddleware:
+    """Route safe-method requests to read replicas, with read-your-writes pinning
+
+    A client that sent a write reads from the primary for the next
+    ``PIN_SECONDS``; bookkeeping writes of safe requests (view counters) do
+    not pin. Browsers carry the pin in a cookie;
+    JWT clients are pinned server-side by the token's user id, so the pin
+    follows the user across devices and cookie-less API clients.
+    Removed from the stack when no replicas are configured.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_options().get("ALIASES"):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    @property
+    def cookie_name(self):
+        return replica_options().get("COOKIE_NAME", "primary_pin")
+
+    @property
+    def pin_seconds(self):
+        return replica_options().get("PIN_SECONDS", 5)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        pin_key = self.pin_key(request)
+        pinned = self.cookie_pinned(request) or (pin_key is not None and cache.get(pin_key))
+        routing = RequestRouting(use_replica=request.method in SAFE_METHODS and not pinned)
+        token = _routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if request.method not in SAFE_METHODS:
+            until = self.pin(request, response)
+            if pin_key is not None:
+                cache.set(pin_key, until, timeout=self.pin_seconds)
+        return response
+
+    async def __acall__(self, request):
+        pin_key = self.pin_key(request)
+        pinned = self.cookie_pinned(request) or (pin_key is not None and await cache.aget(pin_key))
+        routing = RequestRouting(use_replica=request.method in SAFE_METHODS and not pinned)
+        token = _routing.set(routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if request.method not in SAFE_METHODS:
+            until = self.pin(request, response)
+            if pin_key is not None:
+                await cache.aset(pin_key, until, timeout=self.pin_seconds)
+        return response
+
+    def pin_key(self, request):
+        user_id = jwt_user_id(request)
+        return None if user_id is None else f"replica-pin:user:{user_id}"
+
+    def cookie_pinned(self, request):
+        try:
+            return float(request.COOKIES.get(self.cookie_name, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def pin(self, request, response):
+        until = time.time() + self.pin_seconds
+        response.set_cookie(
+            self.cookie_name, f"{until:.3f}", max_age=self.pin_seconds, httponly=True, samesite="Lax",
+            secure=request.is_secure(),
+        )
+        return until
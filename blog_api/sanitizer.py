@@ -0,0 +1,122 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+
+ALLOWED_TAGS = frozenset({
+    "p", "br", "strong", "em", "u", "h1", "h2", "h3", "h4", "h5", "h6",
+    "ul", "ol", "li", "blockquote", "code", "pre", "a", "img",
+})
+
+ALLOWED_ATTRIBUTES = {
+    "a": ["href", "title", "target"],
+    "img": ["src", "alt", "title", "width", "height"],
+}
+
+
+def content_hash(content):
+    return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+
+class HTMLSanitizer:
+    """Bleach-backed HTML sanitizer with a bounded LRU of cleaned bodies
+
+    The cache maps the hash of an input to its cleaned output, and the hash
+    of every output to itself, so re-saving content that is already clean
+    (unchanged edits, repeated comment texts) costs one hash and no parse.
+    bleach Cleaner instances are not thread-safe, so each thread compiles
+    its own once and reuses it.
+    """
+
+    def __init__(self, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, cache_size=None):
+        self.tags = tags
+        self.attributes = attributes
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def cache_size(self):
+        if self._cache_size is not None:
+            return self._cache_size
+        return getattr(settings, "SANITIZER_CACHE_SIZE", 2048)
+
+    @property
+    def cleaner(self):
+        cleaner = getattr(self._local, "cleaner", None)
+        if cleaner is None:
+            from bleach.sanitizer import Cleaner
+            cleaner = self._local.cleaner = Cleaner(tags=self.tags, attributes=self.attributes, strip=True)
+        return cleaner
+
+    def _lookup(self, key):
+        with self._lock:
+            cleaned = self._cache.get(key)
+            if cleaned is not None:
+                self._cache.move_to_end(key)
+            return cleaned
+
+    def _remember(self, key, cleaned):
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = cleaned
+            self._cache[content_hash(cleaned)] = cleaned
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def clean(self, content):
+        """Sanitized copy of ``content``"""
+        if not content:
+            return content
+        key = content_hash(content)
+        cleaned = self._lookup(key)
+        if cleaned is None:
+            cleaned = self.cleaner.clean(content)
+            self._remember(key, cleaned)
+        return cleaned
+
+    def clean_many(self, contents, processes=None, chunksize=64):
+        """Sanitize a batch of bodies, returned in input order
+
+        Duplicates are cleaned once. With ``processes`` > 1 the cache misses
+        are spread over a process pool, which pays off for large imports.
+        """
+        contents = list(contents)
+        keys = [content_hash(content) if content else None for content in contents]
+        results = {}
+        misses = {}
+        for key, content in zip(keys, contents):
+            if key is None or key in results or key in misses:
+                continue
+            cleaned = self._lookup(key)
+            if cleaned is None:
+                misses[key] = content
+            else:
+                results[key] = cleaned
+
+        if misses:
+            if processes and processes > 1 and len(misses) > chunksize:
+                with ProcessPoolExecutor(max_workers=processes) as pool:
+                    cleaned = list(pool.map(_clean, misses.values(), chunksize=chunksize))
+            else:
+                cleaned = [self.cleaner.clean(content) for content in misses.values()]
+            for key, value in zip(misses, cleaned):
+                results[key] = value
+                self._remember(key, value)
+
+        return [content if key is None else results[key] for key, content in zip(keys, contents)]
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+sanitizer = HTMLSanitizer()
+
+
+def _clean(content):
+    # Runs in pool workers, which build their own module-level sanitizer
+    return sanitizer.cleaner.clean(content)
@@ -0,0 +1,7 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class JWTSubclassScheme(SimpleJWTScheme):
+    """Document JWTAuthentication subclasses with the stock simplejwt security scheme"""
+    match_subclasses = True
+    priority = -1
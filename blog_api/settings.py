@@ -18,8 +18,10 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
     "django_filters",
     "corsheaders",
     "drf_spectacular",
@@ -28,6 +30,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "blog_api.instrumentation.InstrumentationMiddleware",
+    "blog_api.replicas.ReplicaRoutingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -73,6 +77,48 @@ DATABASES = {
     }
 }
 
+# Per-process connection pool instead of one persistent connection per thread
+if os.getenv("DB_POOL_ENABLED", "False") == "True":
+    DATABASES["default"]["ENGINE"] = "blog_api.db.backends.postgresql_pool"
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+        # Seconds to wait for a free connection before the query fails
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+        "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", 1800)),
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", 300)),
+        # Connections idle longer than this are pinged before hand-off
+        "check_after": float(os.getenv("DB_POOL_CHECK_AFTER", 1)),
+    }
+
+# Read replicas: comma-separated host[:port] list with optional matching weights
+DB_REPLICA_HOSTS = [h.strip() for h in os.getenv("DB_REPLICA_HOSTS", "").split(",") if h.strip()]
+DB_REPLICA_WEIGHTS = [int(w) for w in os.getenv("DB_REPLICA_WEIGHTS", "").split(",") if w.strip()]
+for index, replica_host in enumerate(DB_REPLICA_HOSTS, start=1):
+    host, _, port = replica_host.partition(":")
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+READ_REPLICAS = {
+    "ALIASES": {
+        f"replica_{index}": DB_REPLICA_WEIGHTS[index - 1] if index <= len(DB_REPLICA_WEIGHTS) else 1
+        for index in range(1, len(DB_REPLICA_HOSTS) + 1)
+    },
+    # Seconds a client reads from the primary after writing
+    "PIN_SECONDS": int(os.getenv("DB_REPLICA_PIN_SECONDS", 5)),
+    "HEALTH_CHECK_INTERVAL": int(os.getenv("DB_REPLICA_HEALTH_CHECK_INTERVAL", 5)),
+    # PostgreSQL replay lag beyond which a replica is skipped (0 disables the check)
+    "MAX_LAG_SECONDS": float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", 0)),
+    "COOKIE_NAME": "primary_pin",
+}
+
+DATABASE_ROUTERS = ["blog_api.replicas.ReplicaRouter"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator", "OPTIONS": {"min_length": 8}},
@@ -90,11 +136,29 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "blog-api"),
+    }
+}
+
+# Anonymous read responses are cached pre-rendered and gzip-compressed
+RESPONSE_CACHE = {
+    "ENABLED": os.getenv("RESPONSE_CACHE_ENABLED", "True") == "True",
+    "ALIAS": "default",
+    "TIMEOUT": int(os.getenv("RESPONSE_CACHE_TIMEOUT", 300)),
+}
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "blog_api.instrumentation.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.AllowAny",
@@ -120,8 +184,66 @@ SIMPLE_JWT = {
     "SIGNING_KEY": SECRET_KEY,
     "AUTH_HEADER_TYPES": ("Bearer",),
     "AUTH_HEADER_NAME": "HTTP_AUTHORIZATION",
+    # last_login goes through the coalescing buffer instead of a save per login
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.LoginSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.RotatingTokenRefreshSerializer",
 }
 
+# Seconds before a user's stored last_login is moved forward again, and between batched writes
+LAST_LOGIN_UPDATE_INTERVAL = int(os.getenv("LAST_LOGIN_UPDATE_INTERVAL", 300))
+LAST_LOGIN_FLUSH_INTERVAL = int(os.getenv("LAST_LOGIN_FLUSH_INTERVAL", 5))
+
+# Seconds between background deletions of expired refresh tokens (0 disables)
+TOKEN_PRUNE_INTERVAL = int(os.getenv("TOKEN_PRUNE_INTERVAL", 3600))
+TOKEN_PRUNE_BATCH_SIZE = int(os.getenv("TOKEN_PRUNE_BATCH_SIZE", 1000))
+
+# Users resolved by JWT authentication, cached per user version (PROFILE also caches user.profile)
+AUTH_USER_CACHE = {
+    "ENABLED": os.getenv("AUTH_USER_CACHE_ENABLED", "True") == "True",
+    "ALIAS": "default",
+    "TIMEOUT": int(os.getenv("AUTH_USER_CACHE_TIMEOUT", 60)),
+    "PROFILE": True,
+}
+
+# Text search configuration used for the article search vector
+SEARCH_CONFIG = os.getenv("SEARCH_CONFIG", "english")
+
+# Seconds between write-behind flushes of article view counts (0 writes every view immediately)
+VIEW_COUNT_FLUSH_INTERVAL = int(os.getenv("VIEW_COUNT_FLUSH_INTERVAL", 5))
+VIEW_COUNT_MAX_PENDING = int(os.getenv("VIEW_COUNT_MAX_PENDING", 1000))
+
+# Cleaned HTML bodies kept in the per-process sanitizer LRU
+SANITIZER_CACHE_SIZE = int(os.getenv("SANITIZER_CACHE_SIZE", 2048))
+
+# Records validated and written per batch by bulk article imports
+ARTICLE_IMPORT_CHUNK_SIZE = int(os.getenv("ARTICLE_IMPORT_CHUNK_SIZE", 500))
+
+# Process-local tag name -> id cache: entries kept, and seconds before a reload
+TAG_CACHE_SIZE = int(os.getenv("TAG_CACHE_SIZE", 5000))
+TAG_CACHE_TTL = int(os.getenv("TAG_CACHE_TTL", 60))
+
+# Responsive renditions of featured images and avatars: name -> max width in pixels, per format
+IMAGE_RENDITIONS = {"thumb": 160, "card": 640, "hero": 1600}
+IMAGE_RENDITION_FORMATS = ("webp", "jpeg")
+IMAGE_RENDITION_QUALITY = int(os.getenv("IMAGE_RENDITION_QUALITY", 80))
+# Threads resizing uploads after commit (0 generates only on first request); seconds a request waits
+IMAGE_RENDITION_WORKERS = int(os.getenv("IMAGE_RENDITION_WORKERS", 2))
+IMAGE_RENDITION_TIMEOUT = int(os.getenv("IMAGE_RENDITION_TIMEOUT", 30))
+# Seconds an image's content hash is remembered; a remembered hash also lets its renditions be served
+IMAGE_DIGEST_TTL = int(os.getenv("IMAGE_DIGEST_TTL", 86400))
+
+# Per-request SQL/auth/render timings (Server-Timing headers and /api/metrics/)
+INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "False") == "True"
+
+# Serve hot anonymous reads from async views (for ASGI deployments)
+ASYNC_READ_VIEWS_ENABLED = os.getenv("ASYNC_READ_VIEWS_ENABLED", "False") == "True"
+
+# Replies embedded under each top-level comment in an article's comment thread
+COMMENT_THREAD_REPLIES = int(os.getenv("COMMENT_THREAD_REPLIES", 3))
+
+# Leaderboard windows: name -> decay time constant in seconds (None never decays)
+LEADERBOARD_WINDOWS = {"day": 86400, "week": 604800, "all": None}
+
 CORS_ALLOWED_ORIGINS = [o.strip() for o in os.getenv("CORS_ALLOWED_ORIGINS", "").split(",") if o.strip()]
 CORS_ALLOW_CREDENTIALS = True
 
@@ -0,0 +1,24 @@
+"""Settings for the test suite: SQLite instead of PostgreSQL, plus a replica alias
+
+Run with ``python manage.py test --settings=blog_api.test_settings``.
+"""
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "test_db.sqlite3"},
+    # Stands in for a read replica: same test database, separate connection
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "test_db.sqlite3",
+        "TEST": {"MIRROR": "default"},
+    },
+}
+# Replica routing stays off unless a test enables it with override_settings(READ_REPLICAS=...)
+READ_REPLICAS = {**READ_REPLICAS, "ALIASES": {}}
+
+# Hashing speed is not under test
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# Write through immediately so tests see their own counters and logins
+VIEW_COUNT_FLUSH_INTERVAL = 0
+LAST_LOGIN_FLUSH_INTERVAL = 0
@@ -0,0 +1,97 @@
+import io
+import shutil
+import tempfile
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from PIL import Image
+from articles.models import Article
+from blog_api.images import image_pipeline
+
+
+def png(width=400, height=300):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "teal").save(buffer, "PNG")
+    return ContentFile(buffer.getvalue())
+
+
+class ImageRenditionViewTests(TestCase):
+    """Renditions are only made from stored featured images and avatars"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(MEDIA_ROOT=media_root, IMAGE_RENDITION_WORKERS=0)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        cache.clear()
+
+        self.user = User.objects.create_user("painter", password="Painter-pass-0!")
+        self.user.profile.avatar = default_storage.save("avatars/painter.png", png())
+        self.user.profile.save()
+
+    def get(self, name, rendition="thumb", fmt="webp"):
+        return self.client.get(f"/api/images/{rendition}.{fmt}/{name}", secure=True)
+
+    def assertNotServed(self, name, **kwargs):
+        with self.assertLogs("django.request", "WARNING"):
+            self.assertEqual(self.get(name, **kwargs).status_code, 404)
+
+    def test_serves_renditions_of_stored_avatars(self):
+        response = self.get(self.user.profile.avatar.name)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/webp")
+        with Image.open(io.BytesIO(b"".join(response.streaming_content))) as image:
+            self.assertEqual(image.width, 160)
+
+    def test_unreferenced_media_files_are_not_resized(self):
+        stray = default_storage.save("avatars/stray.png", png())
+
+        self.assertNotServed(stray)
+        self.assertFalse(default_storage.exists("renditions"))
+
+    def test_renditions_are_not_resized_again(self):
+        name = self.user.profile.avatar.name
+        self.assertEqual(self.get(name, rendition="card").status_code, 200)
+        card = image_pipeline.path(image_pipeline.digest(name), "card", "webp")
+        self.assertTrue(default_storage.exists(card))
+
+        self.assertNotServed(card)
+
+    @override_settings(IMAGE_RENDITION_WORKERS=1)
+    def test_unreadable_images_log_a_warning_without_traceback(self):
+        self.user.profile.avatar = default_storage.save("avatars/broken.png", ContentFile(b"not an image"))
+        self.user.profile.save()
+
+        with self.assertLogs("blog_api.images", "WARNING") as logs:
+            self.assertNotServed(self.user.profile.avatar.name)
+
+        self.assertEqual([record.levelname for record in logs.records], ["WARNING"])
+        self.assertIsNone(logs.records[0].exc_info)
+
+    def test_replaced_avatars_are_no_longer_served(self):
+        old = self.user.profile.avatar.name
+        self.assertEqual(self.get(old).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile.avatar = default_storage.save("avatars/painter-new.png", png())
+            self.user.profile.save()
+
+        self.assertNotServed(old)
+        self.assertEqual(self.get(self.user.profile.avatar.name).status_code, 200)
+
+    def test_deleted_articles_images_are_no_longer_served(self):
+        article = Article.objects.create(
+            title="Illustrated", content="With a picture", author=self.user,
+            featured_image=default_storage.save("articles/picture.png", png()),
+        )
+        name = article.featured_image.name
+        self.assertEqual(self.get(name).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.get(pk=article.pk).delete()
+
+        self.assertNotServed(name)
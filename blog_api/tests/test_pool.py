@@ -0,0 +1,164 @@
+import uuid
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from blog_api.db import pool as pool_module
+from blog_api.db.backends.postgresql_pool.base import DatabaseWrapper
+from blog_api.db.pool import ConnectionPool, get_pool
+
+
+class FakeCursor:
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql):
+        self.connection.executed.append(sql)
+
+
+class FakeConnection:
+    """Stand-in for a psycopg2 connection: just the attributes the pool and backend touch"""
+
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = True
+        self.executed = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+def settings_dict(name):
+    return {
+        "ENGINE": "blog_api.db.backends.postgresql_pool",
+        "NAME": name,
+        "USER": "",
+        "PASSWORD": "",
+        "HOST": "",
+        "PORT": "",
+        "OPTIONS": {},
+        "CONN_MAX_AGE": 0,
+        "CONN_HEALTH_CHECKS": False,
+        "AUTOCOMMIT": True,
+        "ATOMIC_REQUESTS": False,
+        "TIME_ZONE": None,
+        "TEST": {},
+    }
+
+
+class PooledBackendTests(SimpleTestCase):
+    """The pooled PostgreSQL backend against fake connections; no server needed"""
+
+    def setUp(self):
+        self.opened = []
+
+    def connect(self):
+        connection = FakeConnection()
+        self.opened.append(connection)
+        return connection
+
+    def unique_name(self):
+        return f"pool-test-{uuid.uuid4().hex}"
+
+    def register(self, key):
+        """Drop the process-wide pool registered under ``key`` when the test ends"""
+
+        def unregister():
+            pool = pool_module._pools.pop(key, None)
+            if pool is not None:
+                pool.close()
+
+        self.addCleanup(unregister)
+
+    def wrapper(self, alias="pooltest", name=None, **options):
+        """A backend wrapper whose pool hands out fake connections"""
+        wrapper = DatabaseWrapper(settings_dict(name or self.unique_name()), alias)
+        key = (alias, wrapper.settings_dict["NAME"])
+        self.register(key)
+        get_pool(key, lambda: ConnectionPool(
+            alias, connect=self.connect, check=DatabaseWrapper.check_connection,
+            reset=DatabaseWrapper.reset_connection, **options,
+        ))
+        return wrapper
+
+    def test_close_releases_the_connection_to_the_pool(self):
+        wrapper = self.wrapper()
+        wrapper.connection = wrapper.pool.acquire()
+        wrapper.connection.autocommit = False
+
+        wrapper._close()
+
+        connection = self.opened[0]
+        self.assertFalse(connection.closed)
+        self.assertEqual(connection.rollbacks, 1)
+        self.assertTrue(connection.autocommit)
+        self.assertEqual(wrapper.pool.stats()["idle"], 1)
+        self.assertIs(wrapper.pool.acquire(), connection)
+
+    def test_close_inside_an_atomic_block_discards_the_connection(self):
+        wrapper = self.wrapper()
+        wrapper.connection = wrapper.pool.acquire()
+        wrapper.in_atomic_block = True
+
+        wrapper._close()
+
+        self.assertTrue(self.opened[0].closed)
+        stats = wrapper.pool.stats()
+        self.assertEqual((stats["idle"], stats["in_use"], stats["closed"]), (0, 0, 1))
+
+    def test_recently_released_connections_skip_the_health_check(self):
+        pool = self.wrapper(check_after=60).pool
+        pool.release(pool.acquire())
+
+        self.assertIs(pool.acquire(), self.opened[0])
+        self.assertEqual(self.opened[0].executed, [])
+
+    def test_health_check_runs_before_hand_off(self):
+        pool = self.wrapper(check_after=0).pool
+        pool.release(pool.acquire())
+
+        self.assertIs(pool.acquire(), self.opened[0])
+        self.assertEqual(self.opened[0].executed, ["SELECT 1"])
+
+    def test_failed_health_check_replaces_the_connection(self):
+        pool = self.wrapper(check_after=0).pool
+        pool.release(pool.acquire())
+        # The server dropped the idle connection
+        self.opened[0].closed = 2
+
+        with self.assertLogs("blog_api.db.pool", "WARNING"):
+            connection = pool.acquire()
+
+        self.assertIsNot(connection, self.opened[0])
+        self.assertEqual(len(self.opened), 2)
+        self.assertEqual(pool.stats()["failed_checks"], 1)
+
+    def test_pools_are_per_alias_and_database_name(self):
+        name = self.unique_name()
+        for key in (("left", name), ("right", name), ("left", f"{name}-other")):
+            self.register(key)
+        left = DatabaseWrapper(settings_dict(name), "left")
+
+        self.assertIs(left.pool, DatabaseWrapper(settings_dict(name), "left").pool)
+        self.assertIsNot(left.pool, DatabaseWrapper(settings_dict(name), "right").pool)
+        self.assertIsNot(left.pool, DatabaseWrapper(settings_dict(f"{name}-other"), "left").pool)
+
+    def test_pooled_connections_require_conn_max_age_zero(self):
+        name = self.unique_name()
+        self.register(("pooltest", name))
+        wrapper = DatabaseWrapper({**settings_dict(name), "CONN_MAX_AGE": 60}, "pooltest")
+
+        with self.assertRaises(ImproperlyConfigured):
+            wrapper.pool
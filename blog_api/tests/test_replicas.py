@@ -0,0 +1,93 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from articles.models import Article, ArticleLike
+from blog_api.replicas import replicas
+
+READ_REPLICAS = {
+    "ALIASES": {"replica": 1},
+    "PIN_SECONDS": 60,
+    "HEALTH_CHECK_INTERVAL": 60,
+    "MAX_LAG_SECONDS": 0,
+    "COOKIE_NAME": "primary_pin",
+}
+
+
+@override_settings(READ_REPLICAS=READ_REPLICAS)
+class ReplicaRoutingTests(TransactionTestCase):
+    """Safe requests read from the replica; writes, and clients that just wrote, use the primary
+
+    TransactionTestCase commits the fixtures, so the replica connection to
+    the mirrored test database sees them.
+    """
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        replicas.reset()
+        self.assertTrue(replicas.is_healthy("replica"))
+        self.writer = User.objects.create_user("writer", password="Writer-pass-0!")
+        self.reader = User.objects.create_user("reader", password="Reader-pass-0!")
+        self.article = Article.objects.create(title="Routed article", content="Body of the routed article",
+                                              author=self.writer)
+
+    def tearDown(self):
+        replicas.reset()
+
+    def bearer(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        return client
+
+    def send(self, client, method, path):
+        """Response plus the number of queries it ran on the primary and on the replica
+
+        Responses are cached per viewer, so each test reads a URL once per
+        viewer; clearing the cache here would also drop server-side pins.
+        """
+        with CaptureQueriesContext(connections["default"]) as primary:
+            with CaptureQueriesContext(connections["replica"]) as replica:
+                response = getattr(client, method)(path, secure=True)
+        return response, len(primary), len(replica)
+
+    def like(self, client):
+        response, primary, replica = self.send(client, "post", f"/api/articles/{self.article.pk}/like/")
+        self.assertEqual(response.status_code, 201)
+        return primary, replica
+
+    def test_safe_reads_go_to_the_replica(self):
+        response, primary, replica = self.send(APIClient(), "get", "/api/articles/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_writes_go_to_the_primary(self):
+        primary, replica = self.like(self.bearer(self.reader))
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+        self.assertTrue(ArticleLike.objects.filter(article=self.article, user=self.reader).exists())
+
+    def test_cookie_pins_reads_to_the_primary_after_a_write(self):
+        client = self.bearer(self.reader)
+        self.like(client)
+        self.assertIn("primary_pin", client.cookies)
+        # Only the cookie is left to pin the client
+        client.credentials()
+        _, primary, replica = self.send(client, "get", "/api/articles/")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_jwt_user_pins_reads_to_the_primary_after_a_write(self):
+        self.like(self.bearer(self.reader))
+        # A fresh client carries no cookie: the pin follows the token's user
+        _, primary, replica = self.send(self.bearer(self.reader), "get", "/api/articles/")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+        _, primary, replica = self.send(self.bearer(self.writer), "get", "/api/articles/")
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
@@ -4,6 +4,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from . import schema  # noqa: F401  (registers OpenAPI extensions)
+from .views import ImageRenditionView, MetricsView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -11,6 +13,8 @@ urlpatterns = [
     path("api/", include("articles.urls")),
     path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
+    path("api/images/<str:rendition>.<str:fmt>/<path:name>", ImageRenditionView.as_view(), name="image_rendition"),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
 ]
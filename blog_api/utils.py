@@ -4,6 +4,11 @@ from rest_framework import status
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 import logging
+import re
+from html import unescape
+from django.utils.html import strip_tags
+from .instrumentation import timed
+from .sanitizer import sanitizer
 
 logger = logging.getLogger(__name__)
 
@@ -42,13 +47,12 @@ def custom_exception_handler(exc, context):
 
 def sanitize_html(content):
     """Sanitize HTML content to prevent XSS attacks"""
-    import bleach
-    allowed_tags = [
-        'p', 'br', 'strong', 'em', 'u', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
-        'ul', 'ol', 'li', 'blockquote', 'code', 'pre', 'a', 'img'
-    ]
-    allowed_attributes = {
-        'a': ['href', 'title', 'target'],
-        'img': ['src', 'alt', 'title', 'width', 'height']
-    }
-    return bleach.clean(content, tags=allowed_tags, attributes=allowed_attributes, strip=True)
\ No newline at end of file
+    with timed("sanitize"):
+        return sanitizer.clean(content)
+
+
+def html_to_text(content):
+    """Plain text rendition of (sanitized) HTML with whitespace collapsed"""
+    # Keep block boundaries from gluing adjacent words together
+    spaced = re.sub(r"<(br|/p|/h[1-6]|/li|/blockquote|/pre)\b[^>]*>", " ", content, flags=re.IGNORECASE)
+    return " ".join(unescape(strip_tags(spaced)).split())
@@ -0,0 +1,60 @@
+from concurrent.futures import TimeoutError
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.views import View
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .db.pool import render_metrics as render_pool_metrics
+from .images import CONTENT_TYPES, image_pipeline
+from .instrumentation import registry
+
+
+class PrometheusRenderer(BaseRenderer):
+    media_type = "text/plain"
+    format = "txt"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data.encode(self.charset) if isinstance(data, str) else JSONRenderer().render(data)
+
+
+class MetricsView(APIView):
+    """Prometheus text exposition of this process's request and connection pool aggregates (staff only)"""
+    permission_classes = [IsAdminUser]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request):
+        return Response(registry.render() + render_pool_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+class ImageRenditionView(View):
+    """Serve one rendition of an uploaded image, generating it on first request
+
+    A plain Django view: image requests skip DRF authentication and content
+    negotiation entirely. Only stored featured images and avatars are served.
+    """
+
+    def get(self, request, rendition, fmt, name):
+        if rendition not in image_pipeline.renditions or fmt not in image_pipeline.formats:
+            raise Http404
+        try:
+            path = image_pipeline.ensure(name, rendition, fmt)
+        except TimeoutError:
+            response = HttpResponse("Rendition is still being generated", status=503, content_type="text/plain")
+            response["Retry-After"] = "1"
+            return response
+        except (OSError, SuspiciousFileOperation):
+            # Not a stored featured image or avatar, or not an image (TimeoutError is caught first)
+            raise Http404
+
+        etag = f'"{path.rsplit("/", 2)[-2]}-{rendition}.{fmt}"'
+        if request.headers.get("If-None-Match") == etag:
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(default_storage.open(path), content_type=CONTENT_TYPES[fmt])
+        response["ETag"] = etag
+        response["Cache-Control"] = "public, max-age=86400"
+        return response
@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 import { useParams, Link, useNavigate } from 'react-router-dom';
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import api from '../services/api';
 import { useAuth } from '../context/AuthContext';
 import {
@@ -26,6 +26,8 @@ const ArticleDetail = () => {
     const queryClient = useQueryClient();
     const [commentContent, setCommentContent] = useState('');
     const [replyTo, setReplyTo] = useState(null);
+    // Replies loaded past the first few of each thread: { [commentId]: { results, next } }
+    const [moreReplies, setMoreReplies] = useState({});
 
     const { data: article, isLoading } = useQuery({
         queryKey: ['article', slug],
@@ -35,14 +37,39 @@ const ArticleDetail = () => {
         },
     });
 
-    const { data: comments } = useQuery({
+    const {
+        data: commentPages,
+        fetchNextPage: fetchMoreComments,
+        hasNextPage: hasMoreComments,
+        isFetchingNextPage: isFetchingMoreComments,
+    } = useInfiniteQuery({
         queryKey: ['comments', article?.id],
-        queryFn: async () => {
-            const response = await api.get(`/api/articles/${article.id}/comments/`);
+        queryFn: async ({ pageParam }) => {
+            // Follow the cursor links the API returns instead of building page URLs
+            const response = await api.get(pageParam || `/api/articles/${article.id}/comments/`);
             return response.data;
         },
+        initialPageParam: null,
+        getNextPageParam: (lastPage) => lastPage.next,
         enabled: !!article?.id,
     });
+    const comments = commentPages?.pages.flatMap((page) => page.results);
+
+    const loadMoreReplies = async (comment) => {
+        const loaded = moreReplies[comment.id];
+        try {
+            const response = await api.get(loaded ? loaded.next : comment.replies_next);
+            setMoreReplies((current) => ({
+                ...current,
+                [comment.id]: {
+                    results: [...(current[comment.id]?.results || []), ...response.data.results],
+                    next: response.data.next,
+                },
+            }));
+        } catch (error) {
+            toast.error('Could not load more replies');
+        }
+    };
 
     const likeMutation = useMutation({
         mutationFn: async () => {
@@ -71,6 +98,7 @@ const ArticleDetail = () => {
         onSuccess: () => {
             queryClient.invalidateQueries(['comments', article.id]);
             queryClient.invalidateQueries(['article', slug]);
+            setMoreReplies({});
             setCommentContent('');
             setReplyTo(null);
             toast.success('Comment added!');
@@ -84,6 +112,7 @@ const ArticleDetail = () => {
         onSuccess: () => {
             queryClient.invalidateQueries(['comments', article.id]);
             queryClient.invalidateQueries(['article', slug]);
+            setMoreReplies({});
             toast.success('Comment deleted');
         },
     });
@@ -312,7 +341,7 @@ const ArticleDetail = () => {
 
                             {comment.replies && comment.replies.length > 0 && (
                                 <div className="replies">
-                                    {comment.replies.map((reply) => (
+                                    {[...comment.replies, ...(moreReplies[comment.id]?.results || [])].map((reply) => (
                                         <div key={reply.id} className="comment reply">
                                             <div className="comment-header">
                                                 <div className="comment-author">
@@ -337,6 +366,15 @@ const ArticleDetail = () => {
                                             <p className="comment-content">{reply.content}</p>
                                         </div>
                                     ))}
+
+                                    {(moreReplies[comment.id] ? moreReplies[comment.id].next : comment.replies_next) && (
+                                        <button
+                                            onClick={() => loadMoreReplies(comment)}
+                                            className="btn-reply"
+                                        >
+                                            Load more replies
+                                        </button>
+                                    )}
                                 </div>
                             )}
                         </div>
@@ -345,6 +383,16 @@ const ArticleDetail = () => {
                     {comments?.length === 0 && (
                         <p className="no-comments">No comments yet. Be the first to comment!</p>
                     )}
+
+                    {hasMoreComments && (
+                        <button
+                            onClick={() => fetchMoreComments()}
+                            className="btn btn-secondary btn-load-more"
+                            disabled={isFetchingMoreComments}
+                        >
+                            {isFetchingMoreComments ? 'Loading...' : 'Load more comments'}
+                        </button>
+                    )}
                 </div>
             </section>
         </div>